@@ -33,8 +33,8 @@ def liststreams(paths):
     result.sort(lambda a,b:cmp(a[1],b[1]))
     print('\n'.join('%d : %s'%(v,repr(k)) for k,v in result))
 
-def dumpstreams(stream, paths, out):
-    from office.OleFileIO_PL import OleFileIO
+def dumpstreams(stream, paths, out, chunksize=0x100000):
+    import ptypes, office.storage as storage
 
     stream = stream.split('/')
 
@@ -47,26 +47,46 @@ def dumpstreams(stream, paths, out):
             log('%s : file not found',filename)
             continue
 
+        # check the signature from the header before loading the rest of the file
         try:
-            ole = OleFileIO(filename)
-        except IOError as msg:
+            source = ptypes.prov.file(filename, mode='rb')
+            if not storage.Header(source=source).l['abSig'].valid():
+                raise IOError('invalid signature')
+            store = storage.File(source=source).l
+            directory = store.Directory(extents=True)
+        except (IOError, ptypes.error.LoadError, ptypes.error.ProviderError) as msg:
             log('%s : not an ole file : %s',filename,msg)
             continue
 
-        if stream not in ole.listdir():
+        # walk through each storage in the path to find the entry for the stream
+        try:
+            entry = None
+            for name in stream:
+                entry = directory.byname(entry, name)
+        except KeyError:
 #            log('%s : stream "%s" not found'%(filename, repr(stream)))
             continue
 
         name = '%s.stream'%(os.path.basename(filename))
         path = '%s%s'%(out,name)
         log('%s : writing stream "%s"'%(filename, path))
-        try:
-            stm = ole.openstream(stream)
-        except IOError as msg:
-            log('%s : stream %s error : %s', filename,stream,msg)
-            continue
 
-        file(path,'wb').write(stm.read())
+        # copy the stream directly from the extents of the file that contain it
+        source, size = entry.Source(), entry.Size()
+        with open(path, 'wb') as outfile:
+            for offset in range(0, size, chunksize):
+                source.seek(offset)
+                try:
+                    data = source.consume(min(chunksize, size - offset))
+                except ptypes.error.ConsumeError as msg:
+                    log('%s : stream %s error : %s', filename,stream,msg)
+                    break
+                outfile.write(data)
+                if len(data) < min(chunksize, size - offset):
+                    log('%s : stream %s truncated at offset %#x', filename,stream,offset + len(data))
+                    break
+            continue
+        continue
     return
 
 if __name__ == '__main__':
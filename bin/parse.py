@@ -1,4 +1,4 @@
-import time,sys,os.path,inspect,traceback,importlib
+import time,sys,os.path,inspect,traceback,importlib,signal,functools,hashlib,pickle
 
 __file__ = os.path.abspath(inspect.getfile(inspect.currentframe()))
 sys.path.append('%s/lib'% os.path.dirname(__file__))
@@ -14,44 +14,200 @@ def getparser(path):
     module = importlib.import_module(path)
     return module.File
 
-def iterfiles(parser, paths):
+def parsefile(parser, filename, index=0):
     parser_name = '%s.%s'% (parser.__module__, parser.__name__)
+    source = ptypes.prov.file(filename,mode='r')
+    p = parser(source=source)
+    log(': %d : %s : %s : parsing...',index+1,parser_name,filename)
+    t1 = time.time()
+    try:
+        p = p.l
+    except Exception:
+        t2 = time.time()
+        exception = traceback.format_exc()
+
+        log(': %d : %s : %s : failure while parsing : %f : %s',index+1,parser_name,filename,t2-t1,exception)
+        return p
+
+    t2 = time.time()
+    if p.initializedQ():
+        log(': %d : %s : %s : completed : %f',index+1,parser_name,filename,t2-t1)
+    else:
+        log(': %d : %s : %s : completed partially: %f',index+1,parser_name,filename,t2-t1)
+    return p
+
+def iterfiles(parser, paths):
     for i,filename in enumerate(paths):
-        source = ptypes.file(filename,mode='r')
-        p = parser(source=source)
-        log(': %d : %s : %s : parsing...',i+1,parser_name,filename)
-        t1 = time.time()
-        try:
-            p = p.l
-        except Exception:
-            t2 = time.time()
-            exception = traceback.format_exc()
-
-            log(': %d : %s : %s : failure while parsing : %f : %s',i+1,parser_name,filename,t2-t1,exception)
-            yield filename,p
+        yield filename,parsefile(parser, filename, i)
+    return
+
+class Timeout(BaseException):
+    '''Raised within a worker when a file takes longer than its timeout to parse.'''
+
+def alarm(signum, frame):
+    raise Timeout
+
+def work(task):
+    '''Parse a single file within a worker and return (filename, method(instance)) or (filename, None) if it timed out.'''
+    name, method, index, filename, timeout = task
+    parser = getparser(name)
+
+    # the timer interrupts the parser by raising an exception that isn't caught by
+    # parsefile, so this is only available on platforms that have setitimer.
+    interval = timeout if timeout and hasattr(signal, 'setitimer') else 0
+    if interval:
+        signal.signal(signal.SIGALRM, alarm)
+        signal.setitimer(signal.ITIMER_REAL, interval)
+
+    try:
+        return filename, method(parsefile(parser, filename, index))
+
+    except Timeout:
+        log(': %d : %s : %s : timed out while parsing : %f',index+1,name,filename,interval)
+
+    finally:
+        if interval:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return filename, None
+
+def scanfiles(name, paths, method, jobs, chunksize=1, timeout=None):
+    '''Yield (filename, method(instance)) for each file in paths using a pool of processes. The results are in the same order as paths.'''
+    import multiprocessing
+    tasks = ((name, method, i, filename, timeout) for i, filename in enumerate(paths))
+    pool = multiprocessing.Pool(jobs)
+    try:
+        for filename, result in pool.imap(work, tasks, chunksize):
+            yield filename, result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+    return
+
+class cache(object):
+    '''
+    An on-disk cache of the results for each file using sqlite.
+
+    Each result is keyed by the hash of the file's contents, the kind of
+    result, and a hash of the source code for both ptypes and the package
+    containing the parser. When the total size of the results exceeds limit,
+    the least recently used results are evicted.
+    '''
+    def __init__(self, path, name, limit):
+        import sqlite3
+        self.connection, self.limit = sqlite3.connect(path), limit
+        self.connection.execute('create table if not exists results (key text primary key, size integer, used real, data blob)')
+        self.connection.execute('create index if not exists results_used on results(used)')
+        self.total, = self.connection.execute('select coalesce(sum(size), 0) from results').fetchone()
+        self.version = self.__version(name)
+
+    @staticmethod
+    def __version(name):
+        res = hashlib.sha1()
+        for module in map(importlib.import_module, ['ptypes', name.split('.', 1)[0]]):
+            root = os.path.dirname(module.__file__)
+            for directory, _, files in sorted(os.walk(root)):
+                for filename in sorted(item for item in files if item.endswith('.py')):
+                    path = os.path.join(directory, filename)
+                    res.update(os.path.relpath(path, root).encode('utf-8'))
+                    with open(path, 'rb') as infile:
+                        res.update(infile.read())
+                continue
             continue
+        return res.hexdigest()
 
-        t2 = time.time()
-        if p.initializedQ():
-            log(': %d : %s : %s : completed : %f',i+1,parser_name,filename,t2-t1)
-        else:
-            log(': %d : %s : %s : completed partially: %f',i+1,parser_name,filename,t2-t1)
-        yield filename,p
+    def key(self, filename, kind):
+        res = hashlib.sha1()
+        with open(filename, 'rb') as infile:
+            for chunk in iter(functools.partial(infile.read, 0x100000), b''):
+                res.update(chunk)
+        return '.'.join([self.version, kind, res.hexdigest()])
+
+    def get(self, key):
+        with self.connection:
+            row = self.connection.execute('select data from results where key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute('update results set used = ? where key = ?', (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.connection:
+            row = self.connection.execute('select size from results where key = ?', (key,)).fetchone()
+            self.connection.execute('insert or replace into results values (?, ?, ?, ?)', (key, len(data), time.time(), data))
+            self.total += len(data) - (row[0] if row else 0)
+
+            # the total is tracked as results are added, so we only need to
+            # touch the table when there's actually something to evict.
+            if self.limit and self.total > self.limit:
+                self.total = self.evict(self.limit)
+        return value
+
+    def evict(self, limit, count=0x100):
+        '''Remove the least recently used results until their total size is less than limit.'''
+        total, = self.connection.execute('select coalesce(sum(size), 0) from results').fetchone()
+
+        # walk the oldest results in batches of count so that we only read
+        # the rows that are going to be removed, using the index on used.
+        while total > limit:
+            rows = self.connection.execute('select key, size from results order by used limit ?', (count,)).fetchall()
+            if not rows:
+                break
+
+            keys = []
+            for key, size in rows:
+                if total <= limit:
+                    break
+                keys.append(key)
+                total -= size
+            self.connection.execute('delete from results where key in (%s)'% ', '.join('?' * len(keys)), keys)
+        return total
+
+def results(parser, paths, kind, method, **options):
+    '''Yield (filename, method(instance)) for each file in paths using the cache and number of jobs from options.'''
+    store, jobs, name, timeout = options.get('cache', None), options.get('jobs', 1), options.get('name', None), options.get('timeout', None)
+    keys = [store.key(filename, kind) for filename in paths] if store else [None for filename in paths]
+    hits = {i : res for i, res in enumerate(map(store.get, keys) if store else []) if res is not None}
+
+    # only the files that weren't found in the cache need to be parsed
+    missing = [filename for i, filename in enumerate(paths) if i not in hits]
+    if jobs > 1:
+        iterable = scanfiles(name, missing, method, jobs, options.get('chunksize', 1), timeout)
+
+    # without any workers, the timer for each file is armed within the current process.
+    elif timeout:
+        iterable = map(work, ((name, method, i, filename, timeout) for i, filename in enumerate(missing)))
+    else:
+        iterable = ((filename, method(p)) for filename, p in iterfiles(parser, missing))
+
+    for i, filename in enumerate(paths):
+        if i in hits:
+            yield filename, hits[i]
+            continue
+        filename, res = next(iterable)
+        if store and res is not None:
+            store.put(keys[i], res)
+        yield filename, res
     return
 
-def reprfiles(*args):
+def reprfile(p):
+    rows = [ptypes.utils.indent(p.repr())]
+    if isinstance(p, ptypes.parray.type):
+        rows.append(ptypes.utils.indent('\n'.join('%s %s'%(x.initializedQ(),x.repr()) for x in p),tabsize=8))
+    return '\n'.join(rows)
+
+def reprfiles(parser, paths, **options):
     print('--- parsing %d paths'% len(paths))
-    for i,(filename,p) in enumerate(iterfiles(*args)):
+    i = 0
+    for i,(filename,res) in enumerate(results(parser, paths, 'repr', reprfile, **options)):
         w = 79
         a = '-- {} '.format(i+1)
         b = '{:->%ds}'%(w-len(a))
         c = a+b.format(' %s'%(filename))
         print(c)
 
-        print(ptypes.utils.indent(p.repr()))
-        if isinstance(p, ptypes.parray.type):
-            rows = ('%s %s'%(x.initializedQ(),x.repr()) for x in p)
-            print(ptypes.utils.indent('\n'.join(rows),tabsize=8))
+        print('timed out' if res is None else res)
         print('='*79)
         continue
     print('--- completed parsing of %d files'% i)
@@ -64,24 +220,33 @@ def histogram_parser(parser,state={}):
             result[name] = 0
         result[name] += 1
 
-        if name not in state:
+        if state is None:
+            continue
+        elif name not in state:
             state[name] = []
         state[name].append(n)
     return result
 
-def histogram(*args):
+def histogram_merge(result, hist):
+    '''Add the counts from the histogram hist into result. Merging them in the order of the files keeps the results deterministic.'''
+    for k, v in hist.items():
+        if k in result:
+            result[k] += hist[k]
+        else:
+            result[k] = hist[k]
+        continue
+    return result
+
+def histogram(parser, paths, **options):
     global result,state
     result = {}
     state = {}
-    for i,(filename,p) in enumerate(iterfiles(*args)):
-        hist = histogram_parser(p,state)
-        for k, v in hist.items():
-            if k in result:
-                result[k] += hist[k]
-            else:
-                result[k] = hist[k]
-            continue
-        continue
+
+    # the instances can't be sent back from the workers or the cache, so the state
+    # only gets populated when the files are being parsed by the current process.
+    method = functools.partial(histogram_parser, state=None) if options.get('jobs', 1) > 1 else lambda p: histogram_parser(p, state)
+    for i,(filename,hist) in enumerate(results(parser, paths, 'hist', method, **options)):
+        histogram_merge(result, hist or {})
 
     result = [item for item in result.items()]
     result.sort(key=lambda item: item[1])
@@ -96,6 +261,11 @@ if __name__ == '__main__':
     argh = argparse.ArgumentParser(description='run the provided parser over a list of files')
     argh.add_argument('file', nargs='*')
     argh.add_argument('-name', metavar='PARSER', required=1, action='store', nargs=1, help='specify the parser to use')
+    argh.add_argument('-jobs', metavar='COUNT', type=int, default=1, help='specify the number of processes to parse the files with (0 for all cores)')
+    argh.add_argument('-chunksize', metavar='COUNT', type=int, default=1, help='specify the number of files to hand to a process at a time')
+    argh.add_argument('-timeout', metavar='SECONDS', type=float, default=None, help='specify the number of seconds that may be spent parsing a file')
+    argh.add_argument('-cache', metavar='PATH', action='store', default=None, help='specify a database to cache the results for each file in')
+    argh.add_argument('-cachesize', metavar='MEGABYTES', type=int, default=1024, help='specify the maximum size of the results in the cache (0 for unbounded)')
     m = argh.add_mutually_exclusive_group(required=True)
     m.add_argument('-repr', action='store_true', default=None, help='print a repr of all files')
     m.add_argument('-hist', action='store_true', default=None, help='print a histogram of all typed records in files')
@@ -108,10 +278,13 @@ if __name__ == '__main__':
 
     parser = getparser(_.name[0])
 
+    import multiprocessing
+    options = dict(name=_.name[0], jobs=_.jobs or multiprocessing.cpu_count(), chunksize=max(1, _.chunksize), timeout=_.timeout)
+    if _.cache:
+        options['cache'] = cache(_.cache, _.name[0], _.cachesize * 0x100000)
     if _.repr:
-        reprfiles(parser, paths)
+        reprfiles(parser, paths, **options)
     elif _.hist:
-        histogram(parser, paths)
+        histogram(parser, paths, **options)
     else:
         assert False
-
@@ -498,7 +498,11 @@ class File(pstruct.type, base.ElfXX_File):
             Fsegment_summary = lambda item: "{:s} ({:s}) {:#0{:d}x}..{:#0{:d}x} flags:{:s}".format(item.__class__.__name__, item['p_type'].str(), item['p_vaddr'].int(), 2+6, item['p_vaddr'].int() + item.getloadsize(), 2+6, ''.join(name for name in item['p_flags'] if item['p_flags'][name]))
             Fsection_summary = lambda item: "{:s} ({:s}) {:#0{:d}x}..{:#0{:d}x} name:{!r} flags:{:s}".format(item.__class__.__name__, item['sh_type'].str(), item['sh_offset'].int(), 2+6, item['sh_offset'].int() + item.getloadsize(), 2+6, ' '.join(name for name in item['sh_flags'] if item['sh_flags'][name] and not isinstance(item['sh_flags'][name], pstruct.pbinary.flags)))
             Fsection_offset, Fsegment_offset = map(operator.itemgetter, ['sh_addr', 'p_vaddr'])
-            Fsection_size = Fsegment_size = operator.methodcaller('getloadsize')
+
+            # A segment is only mapped up to the end of the page containing its
+            # last byte, and the space between segments is left unmapped. So,
+            # we size the segments by their pages and skip over anything else.
+            Fsection_size, Fsegment_size, pad_t = operator.methodcaller('getloadsize'), operator.methodcaller('getmappedsize'), segment.UnmappedSegmentData
 
         else:
             section_t, segment_t, block_t = section.MixedSectionData, segment.MixedSegmentData, ptype.block
@@ -506,6 +510,7 @@ class File(pstruct.type, base.ElfXX_File):
             Fsection_summary = lambda item: "{:s} ({:s}) {:#0{:d}x}..{:#0{:d}x} name:{!r} flags:{:s}".format(item.__class__.__name__, item['sh_type'].str(), item['sh_offset'].int(), 2+6, item['sh_offset'].int() + item.getreadsize(), 2+6, item['sh_name'].str(), ' '.join(name for name in item['sh_flags'] if item['sh_flags'][name] and not isinstance(item['sh_flags'][name], pstruct.pbinary.flags)))
             Fsection_offset, Fsegment_offset = map(operator.itemgetter, ['sh_offset', 'p_offset'])
             Fsection_size = Fsegment_size = operator.methodcaller('getreadsize')
+            pad_t = block_t
 
         # For the purpose of debugging, we create a function that use the type of
         # its parameter to summarize a section, segment, or external type (others).
@@ -601,9 +606,9 @@ class File(pstruct.type, base.ElfXX_File):
             # First thing to do is to pad our current position until
             # we got to the starting offset for the current header.
             if position < left:
-                res = position, left - position, block_t
+                res = position, left - position, pad_t
                 result.append(res)
-                Flogging_debug("(pad)    {:#010x} goal:{:#010x} {:#04x}{:+#04x} : {:s}".format(base + position, base + boundary, base + position, boundary - position, block_t.typename()))
+                Flogging_debug("(pad)    {:#010x} goal:{:#010x} {:#04x}{:+#04x} : {:s}".format(base + position, base + boundary, base + position, boundary - position, pad_t.typename()))
                 position = left
 
             # Now we iterate through every entry for the current header, and
@@ -829,6 +834,26 @@ class File(pstruct.type, base.ElfXX_File):
         (ptype.block, 'e_trailer'),
     ]
 
+    def mapping(self, base=0):
+        '''Return a provider that maps each loadable segment from the source to its virtual address relative to the specified `base`.
+
+        Like the loader, the space between the segments is left unmapped. The
+        result can be decoded by a File at `base` if the image is position-independent,
+        as the addresses in an ET_EXEC are absolute and are not rebased.
+        '''
+        data, pagesize = self['e_data'].li, 0x1000
+
+        # Each segment is mapped from the beginning of the page that contains
+        # it, and whatever is left of its last page is filled with zeroes.
+        regions = []
+        for phdr in data['e_phoff'].d.li:
+            if not phdr['p_type']['LOAD']:
+                continue
+            address, offset, delta = phdr['p_vaddr'].int(), phdr['p_offset'].int(), phdr['p_vaddr'].int() % pagesize
+            size = (delta + phdr['p_memsz'].int() + pagesize - 1) // pagesize * pagesize
+            regions.append((base + address - delta, size, self.getoffset() + max(0, offset - delta), delta + phdr['p_filesz'].int()))
+        return ptypes.provider.mapped(self.source, regions)
+
 ### recursion for python2
 from . import header
 
@@ -195,8 +195,11 @@ class ELFCLASS32(object):
             return res.read(self.get())
         d = property(dereference)
         def str(self):
-            res = self.dereference()
-            return res.str()
+            from .segment import ELFCLASSXX
+            p = self.getparent(ELFCLASSXX.PT_DYNAMIC)
+            dt_strtab = p.by_tag('DT_STRTAB')
+            res = dt_strtab.stringtable()
+            return res.string(self.get())
 
     ## dynamic entry type for d_un
     @DT_.define
@@ -218,7 +221,7 @@ class ELFCLASS32(object):
             dt_jmprel = p.by_tag('DT_JMPREL')
             return dyn.array(Elf32_VAddr, 3 + len(dt_jmprel.d.li))
     @DT_.define
-    class DT_HASH(d_ptr):
+    class DT_HASH(d_rtptr):
         type = 4
         def _object_(self):
             from .section import ELFCLASS32
@@ -233,6 +236,15 @@ class ELFCLASS32(object):
 
             from .section import ELFCLASS32
             return dyn.clone(ELFCLASS32.SHT_STRTAB, blocksize=dt_strsz.int)
+
+        # the string table that we dereferenced, keyed by our value
+        __table = None
+
+        def stringtable(self):
+            if self.__table is None or self.__table[0] is not self.value:
+                self.__table = self.value, self.d
+            _, res = self.__table
+            return res
     @DT_.define
     class DT_SYMTAB(d_rtptr):
         type = 6
@@ -536,8 +548,11 @@ class ELFCLASS64(object):
             return res.read(self.get())
         d = property(dereference)
         def str(self):
-            res = self.dereference()
-            return res.str()
+            from .segment import ELFCLASSXX
+            p = self.getparent(ELFCLASSXX.PT_DYNAMIC)
+            dt_strtab = p.by_tag('DT_STRTAB')
+            res = dt_strtab.stringtable()
+            return res.string(self.get())
 
     ## dynamic entry type for d_un
     @DT_.define
@@ -559,7 +574,7 @@ class ELFCLASS64(object):
             dt_jmprel = p.by_tag('DT_JMPREL')
             return dyn.array(Elf64_VAddr, 3 + len(dt_jmprel.d.li))
     @DT_.define
-    class DT_HASH(d_ptr):
+    class DT_HASH(d_rtptr):
         type = 4
         def _object_(self):
             from .section import ELFCLASS64
@@ -574,6 +589,15 @@ class ELFCLASS64(object):
 
             from .section import ELFCLASS64
             return dyn.clone(ELFCLASS64.SHT_STRTAB, blocksize=dt_strsz.int)
+
+        # the string table that we dereferenced, keyed by our value
+        __table = None
+
+        def stringtable(self):
+            if self.__table is None or self.__table[0] is not self.value:
+                self.__table = self.value, self.d
+            _, res = self.__table
+            return res
     @DT_.define
     class DT_SYMTAB(d_rtptr):
         type = 6
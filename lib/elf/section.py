@@ -24,7 +24,7 @@ class _sh_name(pint.type):
         table = header.stringtable()
         if isinstance(table, ELFCLASSXX.SHT_STRTAB):
             offset = self.int()
-            return table.read(offset).str()
+            return table.string(offset)
         raise ptypes.error.TypeError(self, 'str')
 
 class SHT_(pint.enum):
@@ -177,7 +177,7 @@ class _st_name(pint.type):
 
         # Backtrack to the pointer for our symbol so that we can
         # get to its array. The parent of that is likely a section.
-        pointer = symbol.getparent(parray.type).parent
+        pointer = symbol.parent.parent
         if isinstance(pointer.parent, ElfXX_Shdr):
             section = self.__section_index__(pointer.parent)
             return section['sh_offset']
@@ -199,15 +199,19 @@ class _st_name(pint.type):
             section = self.__section_index__(self.parent)
             table = section['sh_offset'].d.li
 
-        # If our parent wasn't a section, then we need to get
-        # the name out of a symbol table of some sort.
+        # If our parent wasn't a section, then we need to get the name
+        # out of a symbol table of some sort. The symbol table keeps
+        # the string table that it resolved so that we only do this once.
+        elif isinstance(self.parent, ElfXX_Sym) and isinstance(self.parent.parent, (ELFCLASSXX.SHT_DYNSYM, ELFCLASSXX.SHT_SYMTAB)):
+            table = self.parent.parent.__stringtable__()
+
         else:
             ptr = self.__symbol_index__()
             table = ptr.d.li
 
         # Verify the type of table we got is a string table.
         if isinstance(table, ELFCLASSXX.SHT_STRTAB):
-            return table.read(self.int()).str()
+            return table.string(self.int())
 
         # Anything else is an unresolveable error.
         raise ptypes.error.TypeError(self, 'str')
@@ -710,7 +714,31 @@ class ELFCLASSXX(object):
     class __SYMTAB(parray.type):
         _object_ = None
 
+        # the string table containing the name of each symbol
+        __strings = None
+
+        def __stringtable__(self):
+            if self.__strings is not None:
+                return self.__strings
+            elif not len(self):
+                raise ptypes.error.ItemNotFoundError(self, '__stringtable__')
+
+            # use the name of the first symbol to find the string table
+            # since it knows how to get there from either a section or
+            # the dynamic segment.
+            name = self[0]['st_name']
+            ptr = name.__symbol_index__()
+            self.__strings = res = ptr.d
+            return res
+
+        def stringtable(self):
+            return self.__stringtable__().li
+
         def enumerate(self, **match):
+            iterable = (match.pop(key) for key in ['st_name', 'name'] if key in match)
+            F_check = lambda st_name: (lambda item: True) if st_name is None else (lambda item: item['st_name'].str() == st_name) if isinstance(st_name, str) else (lambda item: item['st_name'].int() == st_name)
+            F_check_name = F_check(next(iterable, None))
+
             iterable = (match.pop(key) for key in ['st_other', 'other'] if key in match)
             F_check = lambda st_other: (lambda item: True) if st_other is None else (lambda item: item['st_other'][st_other])
             F_check_other = F_check(next(iterable, None))
@@ -727,7 +755,7 @@ class ELFCLASSXX(object):
             F_check = lambda st_shndx: (lambda item: True) if st_shndx is None else (lambda item: not(item['st_shndx'][0]) == st_shndx) if isinstance(st_shndx, bool) else (lambda item: item['st_shndx'][st_shndx])
             F_check_index = F_check(next(iterable, None))
 
-            all_checks = [F_check_other, F_check_bind, F_check_type, F_check_index]
+            all_checks = [F_check_other, F_check_bind, F_check_type, F_check_index, F_check_name]
             for index, item in enumerate(self):
                 if all(F(item) for F in all_checks):
                     yield index, item
@@ -740,6 +768,60 @@ class ELFCLASSXX(object):
             return
         by = iterable
 
+        # the hash tables for the symbols, and the index of each name for
+        # when there aren't any, keyed by the value they were built from.
+        __hashes = __names = None
+
+        def __hashtables__(self):
+            pointer = self.parent
+            if pointer is None:
+                return []
+
+            # if we belong to a section, then the hash tables are the
+            # sections that link to us. we prefer the gnu hash table.
+            elif isinstance(pointer.parent, ElfXX_Shdr):
+                section = pointer.parent
+                sections = section.parent
+                index = next((index for index, item in enumerate(sections) if item is section), None)
+                iterable = (item for type in ['GNU_HASH', 'HASH'] for item in sections if item['sh_type'][type] and item['sh_link'].int() == index)
+                return [item['sh_offset'].d.li for item in iterable]
+
+            # otherwise, we need to get them from the dynamic segment.
+            from . import segment
+            try:
+                dynamic = pointer.getparent(segment.ELFCLASSXX.PT_DYNAMIC)
+            except ptypes.error.ItemNotFoundError:
+                return []
+            iterable = (item for tag in ['DT_GNU_HASH', 'DT_HASH'] for item in dynamic.filter_tag(tag))
+            return [item.d.li for item in iterable]
+
+        def __names__(self):
+            if self.__names is None or self.__names[0] is not self.value:
+                res = {}
+                for index, item in enumerate(self):
+                    res.setdefault(item['st_name'].str(), index)
+                self.__names = self.value, res
+            _, res = self.__names
+            return res
+
+        def lookup(self, name):
+            '''Return the symbol with the specified name using the hash tables that belong to the symbols.'''
+            if self.__hashes is None or self.__hashes[0] is not self.value:
+                self.__hashes = self.value, self.__hashtables__()
+            _, tables = self.__hashes
+
+            # the hash tables only contain the symbols that are exported, and
+            # if there aren't any then we fall back to an index of each name.
+            if tables:
+                table, = tables[:1]
+                index = table.lookup(self, name)
+            else:
+                index = self.__names__().get(name, None)
+
+            if index is None:
+                raise ptypes.error.ItemNotFoundError(self, 'lookup', "Unable to find a symbol with the name {!r}.".format(name))
+            return self[index]
+
     class SHT_SYMTAB(parray.block, __SYMTAB):
         type = 2
 
@@ -747,11 +829,69 @@ class ELFCLASSXX(object):
         type = 3
         _object_ = pstr.szstring
 
+        # the contents of the table along with the strings that have been
+        # decoded from it, keyed by the value that the contents came from.
+        __cache = None
+
         def read(self, offset):
             source = ptypes.provider.proxy(self)
             return self.new(self._object_, source=source, offset=offset).l
+
+        def __strings(self):
+            if self.__cache is not None and self.__cache[0] is self.value:
+                return self.__cache
+
+            # if we haven't been loaded, then read our contents directly
+            # from the source to avoid decoding each string as an object.
+            if self.value is None:
+                res = self.new(dyn.block(self.blocksize()), offset=self.getoffset())
+                data = res.l.serialize()
+            else:
+                data = self.serialize()
+
+            # we can only search the buffer for terminators if each
+            # character is a single byte, so use None to avoid it.
+            encoding = self.new(self._object_).encoding
+            terminator = encoding.encode('\0')[0]
+            self.__cache = res = self.value, data, encoding if len(terminator) == 1 else None, {}
+            return res
+
+        def string(self, offset):
+            '''Return the string at the specified `offset` using a cache of the contents of the table.'''
+            _, data, encoding, cache = self.__strings()
+            if offset in cache:
+                return cache[offset]
+
+            # if the string isn't terminated within our buffer, then fall
+            # back to reading it so that it is treated the same as before.
+            index = data.find(b'\0', offset) if encoding and 0 <= offset < len(data) else -1
+            if index < 0:
+                return self.read(offset).str()
+
+            try:
+                res, _ = encoding.decode(data[offset : index])
+            except UnicodeDecodeError:
+                res, _ = encoding.decode(data[offset : index], 'replace')
+            cache[offset] = res
+            return res
+
+        def strings(self):
+            '''Yield the offset and string for each string within the table.'''
+            _, data, encoding, _ = self.__strings()
+            if encoding is None:
+                for item in self:
+                    yield item.getoffset() - self.getoffset(), item.str()
+                return
+
+            offset = 0
+            while offset < len(data):
+                index = data.find(b'\0', offset)
+                yield offset, self.string(offset)
+                offset = len(data) if index < 0 else 1 + index
+            return
+
         def summary(self):
-            res = (res.str() for res in self)
+            res = (res for _, res in self.strings())
             res = map("{!r}".format, res)
             return "{:s} : [ {:s} ]".format(self.__element__(), ', '.join(res))
         def details(self):
@@ -779,6 +919,31 @@ class ELFCLASSXX(object):
                 continue
             return h & 0xffffffff
 
+        # the encoding of the names, and the buckets and chains decoded into integers
+        __table = None
+
+        def lookup(self, symbols, name):
+            '''Return the index of the symbol in `symbols` with the specified name or None if it was not found.'''
+            if self.__table is None or self.__table[0] is not self.value:
+                bucket, chain = ([item.int() for item in self[fld]] for fld in ['bucket', 'chain'])
+                table = symbols.__stringtable__()
+                self.__table = self.value, table.new(table._object_).encoding, bucket, chain
+            _, encoding, bucket, chain = self.__table
+            if not bucket:
+                return None
+
+            data, _ = encoding.encode(name)
+            h = self.hash_of_bytes(data)
+
+            # walk through the chain for the bucket until we get to the end.
+            index, visited = bucket[h % len(bucket)], set()
+            while index and index < len(chain) and index not in visited:
+                if index < len(symbols) and symbols[index]['st_name'].str() == name:
+                    return index
+                visited.add(index)
+                index = chain[index]
+            return None
+
     from .segment import ELFCLASSXX
     class SHT_DYNAMIC(ELFCLASSXX.PT_DYNAMIC):
         '''This is a placeholder and needs to be manually defined.'''
@@ -867,6 +1032,41 @@ class ELFCLASSXX(object):
                 h = (h << 5) + h + c
             return h & 0xffffffff
 
+        # the encoding of the names, and the fields decoded into integers
+        __table = None
+
+        def lookup(self, symbols, name):
+            '''Return the index of the symbol in `symbols` with the specified name or None if it was not found.'''
+            if self.__table is None or self.__table[0] is not self.value:
+                mask, buckets = ([item.int() for item in self[fld]] for fld in ['mask', 'buckets'])
+                chains = [item.int() for chain in self['hashbuckets'] for item in chain]
+                bits = 8 * self['mask'].blocksize() // len(mask) if mask else 0
+                table, shift2, symindx = symbols.__stringtable__(), self['shift2'].int(), self['symindx'].int()
+                self.__table = self.value, table.new(table._object_).encoding, (bits, shift2, symindx), mask, buckets, chains
+            _, encoding, (bits, shift2, symindx), mask, buckets, chains = self.__table
+            if not buckets:
+                return None
+
+            data, _ = encoding.encode(name)
+            h = self.hash_of_bytes(data)
+
+            # check the bloom filter to see if the symbol is definitely missing.
+            if mask:
+                word = mask[(h // bits) % len(mask)]
+                if not (word >> (h % bits)) & (word >> ((h >> shift2) % bits)) & 1:
+                    return None
+
+            # then we can walk the chain for the bucket until the end is marked.
+            index = buckets[h % len(buckets)]
+            while symindx <= index < symindx + len(chains):
+                item = chains[index - symindx]
+                if item | 1 == h | 1 and index < len(symbols) and symbols[index]['st_name'].str() == name:
+                    return index
+                elif item & 1:
+                    break
+                index += 1
+            return None
+
     class SHT_GNU_verdef(parray.block):
         type = 0x6ffffffd
         _object_ = None
@@ -85,6 +85,11 @@ class ElfXX_Phdr(ElfXX_Header):
             return count * alignment.int()
         return size.int()
 
+    def getmappedsize(self, pagesize=0x1000):
+        '''Return the number of bytes from p_vaddr that are mapped when the segment is loaded in pages of the specified size.'''
+        address, size = (self[fld].li.int() for fld in ['p_vaddr', 'p_memsz'])
+        return min(self.getloadsize(), (address + size + pagesize - 1) // pagesize * pagesize - address)
+
     def containsaddress(self, va):
         res = self['p_vaddr']
         return res.int() <= va < res.int() + self.getloadsize()
@@ -197,6 +202,17 @@ class ELFCLASSXX(object):
             return next(iterable)
         by = bytag = by_tag
 
+        # the symbol table that DT_SYMTAB points to, keyed by the value it was resolved from
+        __symbols = None
+
+        def lookup(self, name):
+            '''Return the dynamic symbol with the specified name using the hash tables from the segment.'''
+            if self.__symbols is None or self.__symbols[0] is not self.value:
+                dt_symtab = self.by_tag('DT_SYMTAB')
+                self.__symbols = self.value, dt_symtab.d.li
+            _, symbols = self.__symbols
+            return symbols.lookup(name)
+
         def details(self):
             res = []
             for item in self:
@@ -425,3 +441,10 @@ class MixedSegmentData(ptype.block):
     pass
 class UndefinedSegmentData(ptype.undefined):
     pass
+class UnmappedSegmentData(ptype.undefined):
+    '''The space between the pages of two loadable segments which is never read because it is not mapped.'''
+    def load(self, **attrs):
+        with ptypes.utils.assign(self, **attrs):
+            self.value = b''
+            self.source.seek(self.getoffset() + self.blocksize())
+        return self
@@ -5,7 +5,7 @@ from . import optable,decoder,modrm
 # XXX: figure out how to add these explicit imports to the doc output
 #      for this module. (without having to use __all__)
 
-from .decoder import isprefix,consume,decodeInteger,encodeInteger
+from .decoder import isprefix,consume,sweep,decodeInteger,encodeInteger
 lookup = optable.LookupTableValue
 
 # equivalent to decoder.consume(iter(string)) ->
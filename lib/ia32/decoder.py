@@ -1,4 +1,5 @@
 #instruction = (prefix( opcode, modrm, sib, disp, immediate))
+import array
 from itertools import islice
 from ptypes import bitmap
 from . import optable, typesize
@@ -21,18 +22,18 @@ def extractsib(byte):
     '''Return (scale,index,byte)'''
     return extractmodrm(byte)
 def getsiblength(modrm, sib, prefixes):
-    by, = bytearray([modrm])
+    by, = bytearray(modrm)
     mod, reg, rm = extractmodrm(by)
     assert rm == 4
 
-    by, = bytearray([sib])
+    by, = bytearray(sib)
     scale, index, base = extractsib(by)
     if base == 5:
         return [typesize.word, typesize.byte, typesize.word, 0][mod]
     return 0
 
 def getdisp16length(modrm, prefixes):
-    by, = bytearray([modrm])
+    by, = bytearray(modrm)
     return [0, typesize.byte, typesize.halfword, 0][(by & 0xc0) >> 6]
 def getdisp32length(modrm, prefixes):
     by, = bytearray(modrm)
@@ -139,6 +140,90 @@ def consume(iterable):
     ## done
     return (prefixes, instruction, modrm, sib, disp, imm)
 
+## tables indexed by opcode (0x0f-prefixed opcodes are offset by 0x100) for sweep
+sweep_prefixes = frozenset(bytearray(prefix_string))
+sweep_lookup = bytearray(optable.OperandLookupTable)[:0x200]
+sweep_modrm = [optable.HasModrm(item) for item in sweep_lookup]
+sweep_immediate = [[optable.GetImmediateLength(item, prefixes) if optable.HasImmediate(item) else None for item in sweep_lookup] for prefixes in [b'', b'\x66']]
+
+## tables indexed by the modrm byte for the displacement length (with and without 0x67), and whether there's a sib
+sweep_displacement = [[(typesize.word if (by & 0xc7) == 0x05 else [0, typesize.byte, size, 0][by >> 6]) for by in range(0x100)] for size in [typesize.word, typesize.halfword]]
+sweep_sib = [(by >> 6) < 3 and (by & 7) == 4 for by in range(0x100)]
+
+def sweep(data, offset=0, stop=None):
+    '''
+    Decode each instruction in the buffer `data` from `offset` up to `stop`.
+
+    Returns a tuple of (offsets, lengths, fields) where offsets and lengths are
+    arrays with the offset and length of each instruction. The fields are six
+    arrays with the length of the prefixes, opcode, modrm, sib, displacement,
+    and immediate of each instruction in the same order as consume. Each
+    field's span starts where the previous one stopped. An instruction that
+    is truncated at the end of the region is not included.
+    '''
+    buffer = data if isinstance(data, bytes) else bytes(data)
+    stop = len(buffer) if stop is None else min(stop, len(buffer))
+
+    records, position = [], offset
+    while position < stop:
+
+        ## prefixes
+        index, opsize, addrsize = position, 0, 0
+        while index < stop and buffer[index] in sweep_prefixes and index - position < 4:
+            opsize, addrsize = opsize or buffer[index] == 0x66, addrsize or buffer[index] == 0x67
+            index += 1
+        prefix = index - position
+
+        ## opcode
+        if index >= stop:
+            break
+        opcode = buffer[index]
+        if opcode == 0x0f:
+            if index + 1 >= stop:
+                break
+            opcode, index = 0x100 + buffer[index + 1], index + 2
+        else:
+            index += 1
+        oplength = index - position - prefix
+
+        ## modrm, sib, and displacement
+        modrm = sib = displength = 0
+        if sweep_modrm[opcode]:
+            if index >= stop:
+                break
+            modrm, by = 1, buffer[index]
+            if sweep_sib[by]:
+                if index + 1 >= stop:
+                    break
+                sib, displength = 1, sweep_displacement[0][by]
+                if not displength and buffer[index + 1] & 7 == 5:
+                    displength = typesize.word
+                pass
+            else:
+                displength = sweep_displacement[addrsize][by]
+            pass
+
+        ## immediates
+        immlength = sweep_immediate[opsize][opcode]
+        if immlength is None:
+            immlength = 0
+        elif opcode in {0xf6, 0xf7} and (by & 0x38) >> 3 not in {0, 1}:
+            immlength = 0
+        elif opcode in {0xa0, 0xa1, 0xa2, 0xa3}:
+            immlength = 4
+
+        length = index + modrm + sib + displength + immlength - position
+        if position + length > stop:
+            break
+
+        records.append((position, length, prefix, oplength, modrm, sib, displength, immlength))
+        position += length
+
+    columns = [column for column in zip(*records)] if records else [()] * 8
+    offsets, lengths = (array.array('L', column) for column in columns[:2])
+    fields = tuple(array.array('B', column) for column in columns[2:])
+    return offsets, lengths, fields
+
 if __name__ == '__main__':
     '''
     804876b:       55                      push   %ebp
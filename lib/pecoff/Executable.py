@@ -280,6 +280,81 @@ class IMAGE_NT_HEADERS(pstruct.type, Header):
     def is64(self):
         return self['OptionalHeader'].li.is64()
 
+    def mapping(self, base=None):
+        '''Return a provider that maps the headers and each section from the source to their virtual addresses at the specified `base`.
+
+        The relocations are not applied to the result, so use `map` to get a copy of the image that has been rebased.
+        '''
+        p, optional = self.getparent(File), self['OptionalHeader']
+
+        # If we're already mapped into memory, then there's nothing to do
+        # unless we were asked to present the image at a different address.
+        if isinstance(self.source, ptypes.provider.memorybase):
+            base, size = p.getoffset() if base is None else base, optional['SizeOfImage'].int()
+            return self.source if base == p.getoffset() else ptypes.provider.mapped(self.source, [(base, size, p.getoffset(), size)])
+        base = optional['ImageBase'].int() if base is None else base
+
+        # The size of each region is aligned to the SectionAlignment, and
+        # whatever is left after the data from the file is zero-filled.
+        alignment = optional['SectionAlignment'].int() or 1
+        Falign = lambda size: (size + alignment - 1) // alignment * alignment
+
+        regions = [(base, Falign(optional['SizeOfHeaders'].int()), p.getoffset(), optional['SizeOfHeaders'].int())]
+        for section in self['Sections']:
+            address, length = section['VirtualAddress'].int(), section['SizeOfRawData'].int()
+            size = section['VirtualSize'].int() or length
+            regions.append((base + address, Falign(size), p.getoffset() + section['PointerToRawData'].int(), min(length, size)))
+
+        # Anything between the sections (or after the last one) is still part
+        # of the image, so we grow each region up to the one that follows it
+        # and the last one up to the SizeOfImage so that it gets zero-filled.
+        regions.sort()
+        iterable = zip(regions, regions[1:] + [(base + optional['SizeOfImage'].int(), 0, 0, 0)])
+        regions = [(address, max(size, following - address), offset, length) for (address, size, offset, length), (following, _, _, _) in iterable]
+        return ptypes.provider.mapped(self.source, regions)
+
+    def map(self, base=None):
+        '''Return a bytearray containing the image as it would be loaded at the specified `base` with its relocations applied.'''
+        p, optional = self.getparent(File), self['OptionalHeader']
+        imagebase, size = optional['ImageBase'].int(), optional['SizeOfImage'].int()
+        base = imagebase if base is None else base
+
+        # If we're already mapped into memory, then we only need to read it.
+        if isinstance(self.source, ptypes.provider.memorybase):
+            res = p.new(dyn.block(size), offset=p.getoffset())
+            data = bytearray(res.l.serialize())
+
+        # Otherwise we need to copy the headers and each section into place.
+        else:
+            data = bytearray(size)
+            res = p.new(dyn.block(min(size, optional['SizeOfHeaders'].int())), offset=p.getoffset())
+            header = res.l.serialize()
+            data[: len(header)] = header
+
+            for section in self['Sections']:
+                address, length = section['VirtualAddress'].int(), section['SizeOfRawData'].int()
+                length = min(length, section['VirtualSize'].int() or length, max(0, size - address))
+                res = p.new(dyn.block(length), offset=p.getoffset() + section['PointerToRawData'].int())
+                data[address : address + length] = res.l.serialize()
+            pass
+
+        # Now we can apply the relocations and update the ImageBase in the header. If
+        # there aren't any relocations, then the image can only be loaded at its ImageBase.
+        delta, directory = base - imagebase, self['DataDirectory']
+        if delta and self['FileHeader']['Characteristics']['RELOCS_STRIPPED']:
+            raise ptypes.error.InputError(self, 'map', message="Unable to map the image at {:#x} as its relocations have been stripped (IMAGE_FILE_RELOCS_STRIPPED).".format(base))
+        elif delta and not(len(directory) > 5 and directory[5]['Address'].int()):
+            raise ptypes.error.InputError(self, 'map', message="Unable to map the image at {:#x} as it does not have a base relocation directory.".format(base))
+        elif delta:
+            relocations = directory[5]['Address'].d.li
+            relocations.apply(data, delta)
+
+        field = optional['ImageBase']
+        offset = field.getoffset() - p.getoffset()
+        if delta and offset + field.size() <= len(data):
+            data[offset : offset + field.size()] = (base & (pow(2, 8 * field.size()) - 1)).to_bytes(field.size(), 'little')
+        return data
+
     def checksum(self):
         p = self.getparent(File)
         res = self['OptionalHeader']['Checksum']
@@ -334,11 +409,25 @@ class MemorySegmentEntry(SegmentEntry):
         p = self.getparent(Next)
         header = p.Header()
         optionalheader = header['OptionalHeader'].li
+
+        # If there's a gap between the previous segment and the address of
+        # this one, then skip over it so that the segment lands at its address.
+        address = self.getparent(File).getoffset() + self.Section['VirtualAddress'].int()
+        if address > self.getoffset():
+            return dyn.clone(ptype.undefined, length=address - self.getoffset())
         return dyn.align(optionalheader['SectionAlignment'].int(), undefined=True)
 
+    def __Data(self):
+        p = self.getparent(Next)
+        header = p.Header()
+        optionalheader = header['OptionalHeader'].li
+        alignment = optionalheader['SectionAlignment'].int() or 1
+        size = self.Section['VirtualSize'].int()
+        return dyn.block((size + alignment - 1) // alignment * alignment)
+
     _fields_ = [
         (__Alignment, 'Alignment'),
-        (lambda self: dyn.block(self.Section.getloadedsize()), 'Data'),
+        (__Data, 'Data'),
     ]
 
 class FileSegmentEntry(SegmentEntry):
@@ -378,8 +467,9 @@ class IMAGE_NT_DATA(pstruct.type, Header):
 
     def __Padding(self):
         if isinstance(self.source, ptypes.provider.memorybase):
-            alignment = 0x1000
-            res = (alignment - self.getoffset() % alignment) & (alignment - 1)
+            header = self.p.Header()
+            alignment = header['OptionalHeader'].li['SectionAlignment'].int() or 1
+            res = (alignment - self.getoffset() % alignment) % alignment
             return dyn.block(res)
         return dyn.block(0)
 
@@ -192,6 +192,11 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
         va = aof.d.li[hint]
         return va.d.li.str() if ExportDirectory.containsaddress(va.int()) else None
 
+    def __table(self, pointer, size):
+        '''Return the bytes of the table referenced by /pointer/ without decoding each of its elements'''
+        res = pointer.d
+        return res.new(ptype.block, length=size, offset=res.getoffset(), source=res.source).l.serialize()
+
     def iterate(self):
         """For each export, yields (rva offset, hint, name, ordinalname, entrypoint, forwardedrva)"""
         cls = self.__class__
@@ -211,8 +216,8 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
             cache.setdefault(section.getoffset(), (section['VirtualAddress'].int(), bytearray(section.data().l.serialize())))
 
             # convert the aof into an array that's wikiwiki
-            data = aof.d.l.cast(dyn.array(dword, len(aof.d)))
-            eat = array.array('L' if len(array.array('I', 4 * b'\0')) > 1 else 'I', data.serialize())
+            data = self.__table(aof, 4 * self['NumberOfFunctions'].int())
+            eat = array.array('L' if len(array.array('I', 4 * b'\0')) > 1 else 'I', data)
 
             # check that the aof is within the bounds of the section, warn the user despite supporting it anyways
             if any(not section.containsaddress(ea) for ea in (aof.int(), aof.int() + 4*self['NumberOfFunctions'].int())):
@@ -228,8 +233,8 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
             cache.setdefault(section.getoffset(), (section['VirtualAddress'].int(), bytearray(section.data().l.serialize())))
 
             # convert the aono into an array that's also quick
-            data = aono.d.l.cast(dyn.array(word, len(aono.d)))
-            no = array.array('I' if len(array.array('I', 4 * b'\0')) > 1 else 'H', data.l.serialize())
+            data = self.__table(aono, 2 * self['NumberOfNames'].int())
+            no = array.array('I' if len(array.array('I', 4 * b'\0')) > 1 else 'H', data)
 
             # check that the aono is within the bounds of the section, warn the user despite supporting it anyways
             if any(not section.containsaddress(ea) for ea in (aono.int(), aono.int() + 2*self['NumberOfNames'].int())):
@@ -243,7 +248,8 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
             logging.warning("{:s} : No Export Name Table in IMAGE_EXPORT_DIRECTORY. ({:s})".format('.'.join((cls.__module__, cls.__name__)), aon.summary()))
             nt = []
         else:
-            nt = aon.d.l
+            data = self.__table(aon, 4 * self['NumberOfNames'].int())
+            nt = array.array('L' if len(array.array('I', 4 * b'\0')) > 1 else 'I', data)
 
         # now we can start returning things to the user
         va = CalculateRelativeOffset(self, aof.int())
@@ -253,9 +259,9 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
             if nameva is None:
                 name = None
             else:
-                section = sections.getsectionbyaddress(nameva.int())
+                section = sections.getsectionbyaddress(nameva)
                 sectionva, data = cache[section.getoffset()] if section.getoffset() in cache else cache.setdefault(section.getoffset(), (section['VirtualAddress'].int(), bytearray(section.data().l.serialize())))
-                name_offset = nameva.int() - sectionva
+                name_offset = nameva - sectionva
                 name = bytes(bytearray(itertools.takewhile(lambda by: by > 0, data[name_offset:]))).decode('utf-8', 'replace')
 
             # grab the ordinal if we can
@@ -285,13 +291,44 @@ class IMAGE_EXPORT_DIRECTORY(pstruct.type):
             va += 4
         return
 
+    # the index of the exports is keyed by the list backing the directory so
+    # that it will be discarded whenever the directory is loaded again.
+    __index = None
+
+    def __build(self):
+        keys, names, addresses, forwards = {}, {}, {}, {}
+        for offset, ordinal, name, ordinalstring, value, forwardedrva in self.iterate():
+            [keys.setdefault(key, ordinal) for key in (ordinal, name, ordinalstring, forwardedrva)]
+            names.setdefault(name, ordinal)
+            if ordinal is None:
+                continue
+            elif forwardedrva is None:
+                addresses.setdefault(ordinal, value)
+            else:
+                forwards.setdefault(ordinal, forwardedrva)
+            continue
+        names.pop(None, None)
+        self.__index = self.value, keys, (names, addresses, forwards)
+        return self.__index
+
+    def __cached(self):
+        if self.__index is None or self.__index[0] is not self.value:
+            return self.__build()
+        return self.__index
+
+    def GetIndex(self):
+        """Returns ({name: hint}, {hint: entrypoint}, {hint: forwardedrva}) for each export using a cached index"""
+        _, _, res = self.__cached()
+        return res
+
     def search(self, key):
         '''Search the export list for an export that matches key.
 
         Return its index/hint.
         '''
-        for offset, ordinal, name, ordinalstring, value, forwardedrva in self.iterate():
-            if key == ordinal or key == name or key == ordinalstring or key == forwardedrva:
-                return ordinal
-            continue
+        _, keys, _ = self.__cached()
+        try:
+            return keys[key]
+        except (KeyError, TypeError):
+            pass
         raise KeyError(key)
@@ -1,4 +1,4 @@
-import logging,ptypes
+import logging,bisect,ptypes
 from ptypes import pstruct,parray,ptype,dyn,pstr,pint,pbinary
 from ..headers import *
 
@@ -162,9 +162,72 @@ SectionTable = IMAGE_SECTION_HEADER
 class SectionTableArray(parray.type):
     _object_ = IMAGE_SECTION_HEADER
 
+    # the section index is keyed by the list backing the array and its length
+    # so that re-loading or re-allocating the table will discard it. editing the
+    # fields of a section is caught when a lookup validates its results.
+    __index = None
+
+    @staticmethod
+    def __segments(intervals):
+        """Split the (start, stop, index) tuples in /intervals/ into elementary segments returning the sorted boundaries and the indices covering each one"""
+        boundaries = sorted({point for start, stop, _ in intervals if start < stop for point in (start, stop)})
+        covering = [[] for _ in boundaries]
+        for start, stop, index in intervals:
+            if start < stop:
+                for segment in range(bisect.bisect_left(boundaries, start), bisect.bisect_left(boundaries, stop)):
+                    covering[segment].append(index)
+            continue
+        [item.sort() for item in covering]
+        return boundaries, covering
+
+    def __build(self):
+        addresses, offsets, names = [], [], {}
+        for index, section in enumerate(self.value):
+            va, pointer = section['VirtualAddress'].int(), section['PointerToRawData'].int()
+            addresses.append((va, va + section.getloadedsize(), index))
+            offsets.append((pointer, pointer + section.getreadsize(), index))
+            names.setdefault(section['Name'].str(), []).append(index)
+        self.__index = self.value, len(self.value), self.__segments(addresses), self.__segments(offsets), names
+        return self.__index
+
+    def __cached(self):
+        if self.__index is None:
+            return self.__build()
+        value, length, _, _, _ = self.__index
+        if value is not self.value or length != len(self.value):
+            return self.__build()
+        return self.__index
+
+    def __candidates(self, segments, point):
+        boundaries, covering = segments
+        segment = bisect.bisect_right(boundaries, point) - 1
+        return covering[segment] if 0 <= segment < len(covering) else []
+
+    def __search(self, field, point, contains):
+        """Return the sections for /point/ using the /field/ of the index, rebuilding it if any of them are stale"""
+        index = self.__cached()
+        sections = [self.value[i] for i in self.__candidates(index[field], point)]
+        if sections and all(contains(section, point) for section in sections):
+            return sections
+
+        # if nothing was found, then confirm that the point is really outside
+        # every section to avoid paying for a rebuild when it's not needed.
+        elif not sections and not any(contains(section, point) for section in self.value):
+            return sections
+
+        # the index is stale due to a section being modified, so rebuild it
+        # and then search the new one for the point.
+        index = self.__build()
+        return [self.value[i] for i in self.__candidates(index[field], point)]
+
+    def invalidate(self):
+        """Discard the cached index of the sections so that it will be rebuilt upon the next lookup"""
+        self.__index = None
+        return self
+
     def getsectionbyaddress(self, address):
         """Identify the `IMAGE_SECTION_HEADER` by the va specified in /address/"""
-        sections = [n for n in self if n.containsaddress(address)]
+        sections = self.__search(2, address, IMAGE_SECTION_HEADER.containsaddress)
         if len(sections) > 1:
             cls = self.__class__
             logging.warning("{:s} : More than one section was returned for address {:x} ({:s})".format('.'.join((cls.__module__, cls.__name__)), address, ', '.join(s['Name'].str() for s in sections)))
@@ -174,13 +237,39 @@ class SectionTableArray(parray.type):
 
     def getsectionbyoffset(self, offset):
         """Identify the `IMAGE_SECTION_HEADER` by the file-offset specified in /offset/"""
-        sections = [n for n in self if n.containsoffset(offset)]
+        sections = self.__search(3, offset, IMAGE_SECTION_HEADER.containsoffset)
         if len(sections) > 1:
-            logging.warning("{:s} : More than one section was returned for offset {:x} ({:s})".format('.'.join((cls.__module__, cls.__name__)), address, ', '.join(s['Name'].str() for s in sections)))
+            cls = self.__class__
+            logging.warning("{:s} : More than one section was returned for offset {:x} ({:s})".format('.'.join((cls.__module__, cls.__name__)), offset, ', '.join(s['Name'].str() for s in sections)))
         if len(sections):
             return sections[0]
         raise KeyError('Offset %x not in a known section'% (offset))
 
+    def translate_many(self, addresses):
+        """Return a list of the file-offsets for each va in /addresses/ leaving any address that is not within a section as-is"""
+        addresses, index = [address for address in addresses], self.__cached()
+
+        # figure out the delta for each segment that is referenced by the
+        # addresses so that each section only needs to be validated once.
+        for rebuild in (False, True):
+            boundaries, covering = self.__build()[2] if rebuild else index[2]
+            segments = [bisect.bisect_right(boundaries, address) - 1 for address in addresses]
+            deltas = {}
+            for segment in set(segments):
+                sections = [self.value[i] for i in covering[segment]] if 0 <= segment < len(covering) else []
+                if not all(section.containsaddress(boundaries[segment]) for section in sections):
+                    break
+                deltas[segment] = sections[0]['PointerToRawData'].int() - sections[0]['VirtualAddress'].int() if sections else 0
+
+            # addresses outside the index still need to be checked against
+            # each section in case the index is stale.
+            else:
+                outside = (address for address, segment in zip(addresses, segments) if not (0 <= segment < len(covering) and covering[segment]))
+                if not any(section.containsaddress(address) for address in outside for section in self.value):
+                    break
+            continue
+        return [address + deltas[segment] for address, segment in zip(addresses, segments)]
+
     def getstringbyoffset(self, offset):
         """Fetch the string in the section specified by /offset/"""
         return self.new(pstr.szstring, __name__='string[%x]'% offset, offset=offset + self.getparent(Header).getoffset()).load().serialize()
@@ -192,8 +281,13 @@ class SectionTableArray(parray.type):
 
     def getsectionbyname(self, name):
         """Return the `IMAGE_SECTION_HEADER` specified by /name/"""
-        sections = [n for n in self if n['Name'].str() == name]
+        _, _, _, _, names = self.__cached()
+        sections = [self.value[i] for i in names.get(name, [])]
+        if not sections or any(n['Name'].str() != name for n in sections):
+            _, _, _, _, names = self.__build()
+            sections = [self.value[i] for i in names.get(name, [])]
         if len(sections) > 1:
+            cls = self.__class__
             logging.warning("{:s} : More than one section was returned for name {!r}".format('.'.join((cls.__module__, cls.__name__)), name))
         if len(sections):
             return sections[0]
@@ -210,15 +210,28 @@ class IMAGE_IMPORT_DIRECTORY(parray.terminated):
             yield entry
         return
 
+    # the index of the descriptors is keyed by the list backing the directory
+    # and its length so that re-loading the directory will discard it.
+    __index = None
+
+    def __cached(self):
+        if self.__index is None or self.__index[0] is not self.value or self.__index[1] != len(self.value):
+            names = {}
+            for entry in self.iterate():
+                names.setdefault(entry['Name'].d.li.str(), entry)
+            self.__index = self.value, len(self.value), names
+        return self.__index
+
     def search(self, key):
         '''
         search the import list for an import dll that matches key
         return the rva
         '''
-        for entry in self.iterate():
-            if key == entry['Name'].d.li.str():
-                return entry
-            continue
+        _, _, names = self.__cached()
+        try:
+            return names[key]
+        except (KeyError, TypeError):
+            pass
         raise KeyError(key)
 
 class IMAGE_DELAYLOAD_DIRECTORY_ENTRY(pstruct.type):
@@ -1,4 +1,4 @@
-import sys,array,importlib,ptypes,functools
+import sys,array,struct,importlib,ptypes,functools
 from ptypes import ptype,pstruct,pbinary,dyn,parray,bitmap,pint
 from ..headers import *
 
@@ -177,6 +177,27 @@ class IMAGE_REL_AMD64(pint.enum, uint16):
 class RelocationType(ptype.definition):
     cache = {}
 
+def fixup(data, offsets, format, adjust):
+    '''Use the callable `adjust` to update the integer with the specified struct `format` at each of the `offsets` within the bytearray `data`.'''
+    size = struct.calcsize(format)
+    typecode = next((code for code in 'BHILQ' if struct.calcsize(code) == size), None)
+
+    # if the integers are all aligned, then we can treat the data as an array
+    # of them as long as the platform uses the same byteorder as the format.
+    if sys.byteorder == 'little' and format[:1] == '<' and typecode and len(data) % size == 0 and all(offset % size == 0 for offset in offsets):
+        items = memoryview(data).cast(typecode)
+        for index in (offset // size for offset in offsets):
+            items[index] = adjust(items[index])
+        items.release()
+        return data
+
+    # otherwise, we just need to pack and unpack each one individually.
+    codec = struct.Struct(format)
+    for offset in offsets:
+        integer, = codec.unpack_from(data, offset)
+        codec.pack_into(data, offset, adjust(integer))
+    return data
+
 class RelocationTypeBase(pbinary.integer):
     def blockbits(self):
         return 12
@@ -203,6 +224,11 @@ class RelocationType1(RelocationTypeBase):
         res = address + (delta & 0xffff0000) // 0x10000
         return super(RelocationType1, self).write(res, 2)
 
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        high = (delta & 0xffff0000) // 0x10000
+        return fixup(data, offsets, '<H', lambda integer: (integer + high) & 0xffff)
+
 @RelocationType.define(type=2)
 class RelocationType2(RelocationTypeBase):
     def read(self, data, offset):
@@ -212,6 +238,11 @@ class RelocationType2(RelocationTypeBase):
         res = address + (delta & 0x0000ffff)
         return super(RelocationType2, self).write(res, 2)
 
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        low = delta & 0x0000ffff
+        return fixup(data, offsets, '<H', lambda integer: (integer + low) & 0xffff)
+
 @RelocationType.define(type=3)
 class RelocationType3(RelocationTypeBase):
     def read(self, data, offset):
@@ -221,6 +252,60 @@ class RelocationType3(RelocationTypeBase):
         res = (address + delta) & 0xffffffff
         return super(RelocationType3, self).write(res, 4)
 
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        return fixup(data, offsets, '<L', lambda integer: (integer + delta) & 0xffffffff)
+
+@RelocationType.define(type=5)
+class RelocationType5(RelocationTypeBase):
+    '''IMAGE_REL_BASED_ARM_MOV32 (a MOVW/MOVT instruction pair)'''
+    @staticmethod
+    def decode(instruction):
+        return (instruction & 0x000f0000) // 0x10 | instruction & 0x00000fff
+
+    @staticmethod
+    def encode(instruction, imm16):
+        return instruction & 0xfff0f000 | (imm16 & 0xf000) * 0x10 | imm16 & 0x0fff
+
+    def read(self, data, offset):
+        movw, movt = (super(RelocationType5, self).read(data, offset + index, 4) for index in [0, 4])
+        return self.decode(movt) * 0x10000 + self.decode(movw)
+
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        codec = struct.Struct('<LL')
+        for offset in offsets:
+            movw, movt = codec.unpack_from(data, offset)
+            res = (cls.decode(movt) * 0x10000 + cls.decode(movw) + delta) & 0xffffffff
+            codec.pack_into(data, offset, cls.encode(movw, res & 0xffff), cls.encode(movt, res // 0x10000))
+        return data
+
+@RelocationType.define(type=7)
+class RelocationType7(RelocationTypeBase):
+    '''IMAGE_REL_BASED_THUMB_MOV32 (a MOVW/MOVT instruction pair in thumb mode)'''
+    @staticmethod
+    def decode(hw1, hw2):
+        return (hw1 & 0x000f) * 0x1000 | (hw1 & 0x0400) * 2 | (hw2 & 0x7000) // 0x10 | hw2 & 0x00ff
+
+    @staticmethod
+    def encode(hw1, hw2, imm16):
+        hw1 = hw1 & 0xfbf0 | (imm16 & 0xf000) // 0x1000 | (imm16 & 0x0800) // 2
+        hw2 = hw2 & 0x8f00 | (imm16 & 0x0700) * 0x10 | imm16 & 0x00ff
+        return hw1, hw2
+
+    def read(self, data, offset):
+        movw, movt = ([super(RelocationType7, self).read(data, offset + index, 2) for index in [position, position + 2]] for position in [0, 4])
+        return self.decode(*movt) * 0x10000 + self.decode(*movw)
+
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        codec = struct.Struct('<HHHH')
+        for offset in offsets:
+            hw1w, hw2w, hw1t, hw2t = codec.unpack_from(data, offset)
+            res = (cls.decode(hw1t, hw2t) * 0x10000 + cls.decode(hw1w, hw2w) + delta) & 0xffffffff
+            codec.pack_into(data, offset, *cls.encode(hw1w, hw2w, res & 0xffff) + cls.encode(hw1t, hw2t, res // 0x10000))
+        return data
+
 @RelocationType.define(type=10)
 class RelocationType10(RelocationTypeBase):
     def read(self, data, offset):
@@ -230,6 +315,10 @@ class RelocationType10(RelocationTypeBase):
         res = address + (delta & 0xffffffffffffffff)
         return super(RelocationType10, self).write(res, 8)
 
+    @classmethod
+    def apply(cls, data, offsets, delta):
+        return fixup(data, offsets, '<Q', lambda integer: (integer + delta) & 0xffffffffffffffff)
+
 class BaseRelocationEntry_(pbinary.struct):
     def __Offset(self):
         res = self['Type']
@@ -328,6 +417,22 @@ class IMAGE_BASE_RELOCATION(pstruct.type):
             yield type, pageoffset + offset
         return
 
+    def group(self):
+        '''Return a dictionary of the offsets relative to the page for each relocation type contained within this entry.'''
+        res = {}
+        [ res.setdefault(type, []).append(offset) for type, offset in self.extract() if type != 0 ]
+        return res
+
+    def apply(self, data, delta):
+        '''Apply the relocations in this entry to the bytearray `data` containing the loaded image by adding `delta` to each one.'''
+        page = self['VirtualAddress'].int()
+        for type, offsets in self.group().items():
+            res = RelocationType.lookup(type, None)
+            if res is None:
+                raise NotImplementedError("Relocations of type {:d} are not implemented".format(type))
+            res.apply(data, [page + offset for offset in offsets], delta)
+        return data
+
 class IMAGE_BASERELOC_DIRECTORY(parray.block):
     _object_ = IMAGE_BASE_RELOCATION
     def filter(self, section):
@@ -339,6 +444,12 @@ class IMAGE_BASERELOC_DIRECTORY(parray.block):
             continue
         return
 
+    def apply(self, data, delta):
+        '''Apply each of the relocations to the bytearray `data` containing the loaded image by adding `delta` to them.'''
+        for entry in self:
+            entry.apply(data, delta)
+        return data
+
     def relocate(self, data, section, namespace):
         if not isinstance(data, bytearray):
             raise AssertionError("Type of argument `data` must be an instance of {!s} : not isinstance({!s}, {!s})".format(bytearray, data.__class__, bytearray))
@@ -350,14 +461,14 @@ class IMAGE_BASERELOC_DIRECTORY(parray.block):
         sectionarray = section.parent
         sectionvaLookup = {s['Name'].str() : s['VirtualAddress'].int() for s in sectionarray}
 
-        # relocation type 3
-        res = RelocationType.lookup(3)
-        R = res()
+        # relocation types 3 and 10 are the only ones that contain a complete address
+        types = {type : RelocationType.lookup(type)() for type in [3, 10]}
 
         for entry in self.filter(section):
             for type, offset in entry.getrelocations(section):
-                if type != 3:
-                    raise NotImplementedError("Relocations other than type 3 aren't implemented because I couldn't find any to test with")
+                if type not in types:
+                    raise NotImplementedError("Relocations of type {:d} can not be applied to a section by itself".format(type))
+                R = types[type]
                 currentva = sectionvaLookup[sectionname] + offset
 
                 targetrva = R.read(data, offset)
@@ -42,6 +42,46 @@ def setbyteorder(order):
         return setbyteorder(config.byteorder.littleendian)
     raise ValueError("An unknown byteorder was specified ({:s}) for ptypes.".format(order))
 
+## changing the ptype provider or byte order for only the current thread
+class context(object):
+    '''
+    Use the specified ``source`` and ``byteorder`` as the defaults for the current
+    thread (or asynchronous task) until the context is exited. Other threads
+    continue to use the defaults that were set with `setsource` and `setbyteorder`.
+
+    The byteorder only applies to types that resolve it when they're used (such as
+    the value of a pointer_t), as integer types have theirs assigned when they're
+    defined.
+    '''
+    def __init__(self, source=None, byteorder=None):
+        import builtins
+        if source is not None:
+            source.seek, source.consume, source.store
+
+        if byteorder is None or byteorder in (config.byteorder.bigendian, config.byteorder.littleendian):
+            order = byteorder
+        elif builtins.isinstance(byteorder, utils.string_types) and byteorder.startswith(('big', 'little')):
+            order = config.byteorder.bigendian if byteorder.startswith('big') else config.byteorder.littleendian
+        else:
+            raise ValueError("An unknown byteorder was specified ({!s}) for ptypes.".format(byteorder))
+
+        self.source, self.byteorder = source, order
+        self.tokens = []
+
+    def __enter__(self):
+        descriptor, tokens = type(Config.integer).__dict__['order'], []
+        if self.source is not None:
+            tokens.append((ptype.__contextsource__, ptype.__contextsource__.set(self.source)))
+        if self.byteorder is not None:
+            tokens.append((descriptor.context, descriptor.scope(self.byteorder)))
+        self.tokens.append(tokens)
+        return self.source
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        tokens = self.tokens.pop()
+        [variable.reset(token) for variable, token in tokens[::-1]]
+        return
+
 ## some things people people might find useful
 from .ptype import istype, iscontainer, isinstance, undefined, clone
 from .utils import hexdump
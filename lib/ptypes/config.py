@@ -1,4 +1,4 @@
-import sys, math, logging, codecs
+import sys, math, logging, codecs, contextvars
 
 __all__ = 'defaults,byteorder,partial'.split(',')
 
@@ -47,6 +47,19 @@ class field:
             res = self.__getattribute__('get')
             return res.im_func() if sys.version_info[0] < 3 else res.__func__()
 
+    class __context_descriptor(__enum_descriptor):
+        def __init__(self):
+            field.descriptor.__init__(self)
+            self.context = contextvars.ContextVar(type(self).__name__)
+        def __get__(self, instance, type=None):
+            res = field.descriptor.__get__(self, instance, type)
+            return self.context.get(res)
+        def scope(self, value):
+            '''Override the value for the current thread or task and return a token that restores it.'''
+            if value in self.__option__:
+                return self.context.set(value)
+            raise ValueError("{!r} is not a member of {!r}".format(value, self.__option__))
+
     class __bool_descriptor(descriptor):
         def __set__(self, instance, value):
             if not isinstance(value, bool):
@@ -64,6 +77,14 @@ class field:
         cons = type(name, (base,), attrs)
         return cons()
     @classmethod
+    def context(cls, name, options=(), documentation=''):
+        base = cls.__context_descriptor
+        attrs = dict(base.__dict__)
+        attrs['__option__'] = set(options)
+        attrs['__doc__'] = documentation
+        cons = type(name, (base,), attrs)
+        return cons()
+    @classmethod
     def option(cls, name, documentation=''):
         base = field.option_t
         return type(name, (base,), {'__doc__': documentation})
@@ -266,7 +287,7 @@ class defaults:
 
     class integer:
         size = field.type('integersize', integer_types, 'The word-size of the architecture.')
-        order = field.enum('byteorder', (byteorder.bigendian, byteorder.littleendian), 'The byteorder to use for new integers and pointers.')
+        order = field.context('byteorder', (byteorder.bigendian, byteorder.littleendian), 'The byteorder to use for new integers and pointers.')
 
     class ptype:
         clone_name = field.type('clone_name', string_types, 'The formatspec to use when mangling the name during the cloning a type (will only affect newly cloned).')
@@ -275,6 +296,7 @@ class defaults:
     class pint:
         bigendian_name = field.type('bigendian_name', string_types, 'The formatspec to use when mangling the names for integers that are big-endian.')
         littleendian_name = field.type('littleendian_name', string_types, 'The formatspec to use when mangling the names for integers that are little-endian.')
+        cache = field.bool('cache', 'Keep the value that was decoded from an integer until it is loaded or assigned again.')
 
     class pstr:
         encoding = field.type('encoding', (string_types, codecs.CodecInfo), 'The default encoding to use for character strings.')
@@ -283,9 +305,15 @@ class defaults:
     class parray:
         break_on_max_count = field.bool('break_on_max_count', 'If a dynamic array is larger than max_count, then raise an exception.')
         max_count = field.type('max_count', integer_types, 'Notify via a warning (exception if \'break_on_max_count\') when length is larger than max_count.')
+        lazy = field.bool('lazy', 'Decode arrays of fixed-size integral elements as a single block and only instantiate an element when it is accessed.')
+
+    class dynamic:
+        intern = field.bool('intern', 'Return the same type from the dynamic factories (block, blockarray, array, clone) when they are called again with identical parameters.')
 
     class pstruct:
         use_offset_on_duplicate = field.bool('use_offset_on_duplicate', 'If a name is duplicated, suffix it with the field offset (otherwise its index).')
+        compiled = field.bool('compiled', 'Compile structures whose fields are all a static size into a layout that is decoded as a single block.')
+        lazy = field.bool('lazy', 'Only instantiate the fields of a structure that are a static size when they are accessed.')
 
     class display:
         show_module_name = field.bool('show_module_name', 'Include the full module name when displaying a summary.')
@@ -310,10 +338,11 @@ class defaults:
 
         bigendian_name = field.type('bigendian_name', string_types, 'The formatspec to use for elements which are read most-significant to least-significant.')
         littleendian_name = field.type('littleendian_name', string_types, 'The formatspec to use for elements which are read least-significant to most-significant.')
+        compiled = field.bool('compiled', 'Decode binary structures whose fields all have a static width as a single integer and only instantiate a field when it is accessed.')
 
     def __getsource():
         import ptypes.ptype
-        return ptypes.ptype.source
+        return ptypes.ptype.__contextsource__.get(ptypes.ptype.source)
     def __setsource(value):
         import ptypes.ptype
         if all(hasattr(value, method) for method in ('seek','store','consume')) or isinstance(value, provider.base):
@@ -353,9 +382,15 @@ defaults.display.mangle_with_attributes = False
 # array types
 defaults.parray.break_on_max_count = False
 defaults.parray.max_count = sys.maxsize
+defaults.parray.lazy = True
+
+# dynamic types
+defaults.dynamic.intern = True
 
 # structures
 defaults.pstruct.use_offset_on_duplicate = True
+defaults.pstruct.compiled = True
+defaults.pstruct.lazy = True
 
 # root types
 defaults.ptype.noncontiguous = False
@@ -367,6 +402,7 @@ defaults.ptype.clone_name = 'c({})'
 # integer types
 defaults.pint.bigendian_name = 'be({})' if sys.byteorder.startswith('little') else '{}'
 defaults.pint.littleendian_name = 'le({})' if sys.byteorder.startswith('big') else '{}'
+defaults.pint.cache = True
 
 # string encoding
 defaults.pstr.encoding = 'latin1'
@@ -377,6 +413,7 @@ defaults.pstr.wide_encoding = 'utf-16-le' if sys.byteorder == 'little' else 'utf
 defaults.pbinary.offset = partial.hex
 defaults.pbinary.bigendian_name = 'pb({})'
 defaults.pbinary.littleendian_name = 'pble({})'
+defaults.pbinary.compiled = True
 
 if __name__ == '__main__':
     @namespace
@@ -80,7 +80,7 @@ Example usage:
             (dyn.clone(pstr.wstring, length=8), 'widestring'),
         ]
 """
-import itertools, traceback
+import itertools, traceback, types, weakref
 from . import ptype, parray, pstruct, error, utils, bitmap, provider, pint
 
 __all__ = 'block,blockarray,align,array,clone,pointer,rpointer,opointer,union'.split(',')
@@ -93,6 +93,73 @@ Log = config.logging.getLogger('.'.join([Config.log.name, 'dynamic']))
 __izip_longest__ = utils.izip_longest
 integer_types, string_types = bitmap.integer_types, utils.string_types
 
+# Weak-valued table of the types that were returned by the dynamic factories. Each
+# type is keyed by the factory and the parameters that it was created with so that
+# calling a factory with identical parameters will return the exact same type.
+__interned__ = weakref.WeakValueDictionary()
+__internstats__ = {'hits': 0, 'misses': 0, 'skipped': 0}
+__internable__ = (bool, float, bytes, type(None)) + tuple(integer_types) + tuple(string_types)
+
+def __internkey__(value):
+    '''Return a hashable key representing ``value`` if it can be interned, otherwise None.'''
+    if isinstance(value, __internable__):
+        return value.__class__, value
+
+    # types and functions are immutable enough to be keyed by their identity.
+    elif isinstance(value, type):
+        return value
+
+    # callables that carry a closure are opted out of interning entirely since
+    # they're typically recreated on every call and depend on their cells.
+    elif isinstance(value, types.FunctionType):
+        return None if value.__closure__ else value
+
+    elif isinstance(value, (classmethod, staticmethod)):
+        res = __internkey__(value.__func__)
+        return None if res is None else (value.__class__, res)
+
+    elif isinstance(value, tuple):
+        res = [__internkey__(item) for item in value]
+        return None if any(item is None for item in res) else (tuple, tuple(res))
+
+    # anything else (lists, dictionaries, instances) might be mutated later.
+    return None
+
+def __intern__(factory, parameters, attributes):
+    '''Return the key for the type created by ``factory`` with the given ``parameters`` and ``attributes``, or None if it can't be interned.'''
+    if not Config.dynamic.intern:
+        return None
+    res = __internkey__(tuple(parameters) + tuple(sorted(attributes.items())))
+    if res is None:
+        __internstats__['skipped'] += 1
+        return None
+    return factory, res
+
+def __interned_type__(key):
+    '''Return the interned type for the specified ``key`` if it is still alive.'''
+    if key is None:
+        return None
+    res = __interned__.get(key, None)
+    __internstats__['misses' if res is None else 'hits'] += 1
+    return res
+
+def __intern_type__(key, type):
+    '''Intern the specified ``type`` using ``key`` and return it.'''
+    if key is not None:
+        __interned__[key] = type
+    return type
+
+def internstats():
+    '''Return a dictionary containing the number of hits, misses, and skipped requests for the types interned by the dynamic factories, along with the number that are still alive.'''
+    res = dict(__internstats__)
+    res['alive'] = len(__interned__)
+    return res
+
+def internclear():
+    '''Discard every type that has been interned by the dynamic factories and reset their statistics.'''
+    __interned__.clear()
+    __internstats__.update({name : 0 for name in __internstats__})
+
 # Some candy to render types and callables in some printable format.
 def determine_name(target):
     if ptype.istype(target):
@@ -121,6 +188,11 @@ def block(size, **kwds):
         [Log.error("block : {:s} : {:s}".format(t.typename(), item.rstrip())) for item in itertools.chain(*stack)]
         size = 0
 
+    key = __intern__('block', [size], kwds)
+    res = __interned_type__(key)
+    if res is not None:
+        return res
+
     def typename(cls):
         return "dynamic.block({:d})".format(getattr(cls, 'length', size))
     kwds.setdefault('typename', classmethod(typename))
@@ -130,7 +202,7 @@ def block(size, **kwds):
 
     kwds.setdefault('__module__', __name__)
     kwds.setdefault('__name__', 'block')
-    return clone(ptype.block, length=size, **kwds)
+    return __intern_type__(key, ptype.clone(ptype.block, length=size, **kwds))
 
 def blockarray(type, size, **kwds):
     """Returns a parray.block with the specified ``size`` and ``type``"""
@@ -146,6 +218,11 @@ def blockarray(type, size, **kwds):
         [Log.error("blockarray : {:s} : {:s}".format(t.typename(), item.rstrip())) for item in itertools.chain(*stack)]
         size = 0
 
+    key = __intern__('blockarray', [type, size], {})
+    res = __interned_type__(key)
+    if res is not None:
+        return res
+
     getinitargs = lambda self: (type, size)
 
     class blockarray(parray.block):
@@ -164,7 +241,7 @@ def blockarray(type, size, **kwds):
     blockarray.__module__, blockarray.__name__ = __name__, 'blockarray'
     if hasattr(blockarray, '__qualname__'):
         blockarray.__qualname__ = 'blockarray({:d})'.format(size)
-    return blockarray
+    return __intern_type__(key, blockarray)
 
 def padding(size, **kwds):
     '''Return a block that will pad a container to a multiple of the specified number of bytes.'''
@@ -295,6 +372,11 @@ def array(type, count, **kwds):
             raise error.UserError(t, 'array', message="Requested array count={:d} is larger than configuration max_count={:d}".format(count, Config.parray.max_count))
         Log.warning("dynamic.array : {:s} : Requested argument count={:d} is larger than configuration max_count={:d}.".format(t.typename(), count, Config.parray.max_count))
 
+    key = __intern__('array', [type, count], kwds)
+    res = __interned_type__(key)
+    if res is not None:
+        return res
+
     def typename(cls):
         return "dynamic.array({:s}, {!s})".format(determine_name(type), getattr(cls, 'length', '???'))
 
@@ -308,14 +390,20 @@ def array(type, count, **kwds):
     kwds.setdefault('_object_', type)
     kwds.setdefault('__module__', __name__)
     kwds.setdefault('__name__', 'array')
-    return ptype.clone(parray.type, **kwds)
+    return __intern_type__(key, ptype.clone(parray.type, **kwds))
 
 def clone(cls, **newattrs):
     '''
     Will clone a class, and set its attributes to **newattrs
     Intended to aid with single-line coding.
+
+    If the same class and attributes were cloned before, then the same type is returned.
     '''
-    return ptype.clone(cls, **newattrs)
+    key = __intern__('clone', [cls], newattrs)
+    res = __interned_type__(key)
+    if res is not None:
+        return res
+    return __intern_type__(key, ptype.clone(cls, **newattrs))
 
 class __union_interface__(ptype.container):
     def __init__(self, *args, **kwds):
@@ -1085,6 +1173,50 @@ if __name__ == '__main__':
         if x.size() == 1:
             raise Success
 
+    @TestCase
+    def test_dynamic_intern_identical():
+        if dynamic.block(4) is dynamic.block(4) and dynamic.array(pint.uint16_t, 2) is dynamic.array(pint.uint16_t, 2) and dynamic.clone(pint.uint32_t, length=2) is dynamic.clone(pint.uint32_t, length=2):
+            if dynamic.block(4) is not dynamic.block(5) and dynamic.blockarray(pint.uint8_t, 4) is not dynamic.blockarray(pint.uint16_t, 4):
+                raise Success
+
+    @TestCase
+    def test_dynamic_intern_closure():
+        def closure(size):
+            return dynamic.clone(ptype.block, blocksize=lambda self: size)
+        stats = dynamic.internstats()
+        a, b = closure(4), closure(4)
+        if a is not b and a().a.size() == 4 and dynamic.internstats()['skipped'] == stats['skipped'] + 2:
+            raise Success
+
+    @TestCase
+    def test_dynamic_intern_mutable():
+        a, b = dynamic.clone(ptype.block, attributes=[]), dynamic.clone(ptype.block, attributes=[])
+        if a is not b:
+            raise Success
+
+    @TestCase
+    def test_dynamic_intern_disabled():
+        ptypes.config.defaults.dynamic.intern = False
+        try:
+            a, b = dynamic.block(8), dynamic.block(8)
+        finally:
+            ptypes.config.defaults.dynamic.intern = True
+        if a is not b and a().a.size() == b().a.size() == 8:
+            raise Success
+
+    @TestCase
+    def test_dynamic_intern_weak():
+        import gc
+        dynamic.internclear()
+        t = dynamic.block(0x1234)
+        if dynamic.internstats()['alive'] != 1:
+            raise Failure
+        del(t)
+        gc.collect()
+        stats = dynamic.internstats()
+        if stats['alive'] == 0 and stats['misses'] == 1:
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
@@ -82,8 +82,8 @@ Example usage:
     # print the length of the array
     print(len(instance))
 """
-import functools, operator, itertools
-from . import ptype, bitmap, utils, error, provider
+import sys, functools, operator, itertools, array as _array
+from . import ptype, pint, bitmap, utils, error, provider
 
 __all__ = 'type,terminated,infinite,block'.split(',')
 
@@ -92,6 +92,27 @@ Config = config.defaults
 Log = config.logging.getLogger('.'.join([Config.log.name, 'parray']))
 integer_types = bitmap.integer_types
 
+# map each (signed, size) pair to the typecode that decodes it with array.array
+__typecodes__ = {}
+for _ in 'bBhHiIlLqQ':
+    __typecodes__.setdefault((_.islower(), _array.array(_).itemsize), _)
+del(_)
+
+class __lazy_value__(ptype.__lazy_value__):
+    """The elements of an array that are all of the same type and size."""
+    def __init__(self, owner, object, count, size):
+        super(__lazy_value__, self).__init__(owner, count)
+        self.object, self.elementsize = object, size
+
+    def __stub__(self, index):
+        return self.object, str(index)
+    def __position__(self, index):
+        return min(index, self.count) * self.elementsize
+    def __length__(self, index):
+        return self.elementsize if index < self.count else 0
+    def __locate__(self, offset):
+        return offset // self.elementsize
+
 class __array_interface__(ptype.container):
     '''provides the generic features expected out of an array'''
     def __contains__(self, instance):
@@ -197,7 +218,7 @@ class __array_interface__(ptype.container):
             return self.new(t, offset=result[0].getoffset() if len(result) else self.getoffset(), value=result)
 
         idx = self.__getindex__(index)
-        ([None]*len(self))[idx]     # make python raise the correct exception if so..
+        range(len(self))[idx]       # make python raise the correct exception if so..
         return super(__array_interface__, self).__getitem__(idx)
 
     def __element__(self):
@@ -264,7 +285,15 @@ class type(__array_interface__):
 
     # load ourselves lazily
     def __load_block(self, **attrs):
-        offset = self.getoffset()
+        object, offset = self._object_, self.getoffset()
+
+        # if every element is a fixed-size integral, then we can decode all of
+        # them from a single block and only create them when they're accessed.
+        size = self.__lazy_elementsize__(object) if Config.parray.lazy and not attrs else 0
+        if size > 0:
+            self.value = __lazy_value__(self, object, self.length, size)
+            return self
+
         for index in range(self.length):
             item = self.new(self._object_, __name__=str(index), offset=offset, **attrs)
             self.value.append(item)
@@ -273,7 +302,15 @@ class type(__array_interface__):
 
     # load ourselves incrementally
     def __load_container(self, **attrs):
-        offset = self.getoffset()
+        object, offset = self._object_, self.getoffset()
+
+        # if every element is a structure with a compiled layout, then we can
+        # also decode all of them from a single block.
+        size = self.__lazy_elementsize__(object) if Config.parray.lazy and not attrs else 0
+        if size > 0:
+            self.value = __lazy_value__(self, object, self.length, size)
+            return self
+
         for index in range(self.length):
             item = self.new(self._object_, __name__=str(index), offset=offset, **attrs)
             self.value.append(item)
@@ -381,12 +418,89 @@ class type(__array_interface__):
             raise error.LoadError(self)
         raise error.AssertionError(self, 'type.load')
 
+    def __lazy_elementsize__(self, object):
+        '''Return the size of ``object`` if its elements can be decoded from a single block.'''
+        if not ptype.istype(object) or not isinstance(self.length, integer_types) or self.length <= 0:
+            return 0
+
+        # structures can only be decoded from a block if their fields were compiled into a layout.
+        elif ptype.iscontainer(object):
+            compiled = getattr(self.new(object), '__layout__', None)
+            layout = compiled() if callable(compiled) else None
+            return 0 if layout is None else layout.size
+
+        elif not issubclass(object, pint.type):
+            return 0
+        item = self.new(object)
+        return item.blocksize() if item.__blocksize_originalQ__() else 0
+
+    def __typecode__(self):
+        '''Return the typecode and whether to swap bytes when decoding the elements with an array.array.'''
+        item = self.new(self._object_)
+        if not isinstance(item, pint.type):
+            return None, False
+        cls, order = item.__class__, item.byteorder
+        signed = isinstance(item, pint.sinteger_t)
+        getvalue, setvalue = (pint.sinteger_t.__getvalue__, pint.sinteger_t.__setvalue__) if signed else (pint.type.__getvalue__, pint.type.__setvalue__)
+
+        # we can only use an array.array if the element hasn't changed how it's decoded
+        if cls.__getvalue__ is not getvalue or cls.int is not pint.type.int or cls.get is not pint.type.get:
+            return None, False
+        elif cls.__setvalue__ not in {setvalue, pint.enum.__setvalue__}:
+            return None, False
+        elif order not in {config.byteorder.bigendian, config.byteorder.littleendian}:
+            return None, False
+        native = config.byteorder.littleendian if sys.byteorder == 'little' else config.byteorder.bigendian
+        return __typecodes__.get((signed, item.blocksize()), None), order is not native
+
+    def __deserialize_block__(self, block):
+        object = self._object_
+
+        # if we're being decoded without being loaded (as a field), then use a
+        # block for our elements if they're all the same fixed size.
+        size = self.__lazy_elementsize__(object) if self.value is None and Config.parray.lazy else 0
+        if size > 0:
+            self.value = __lazy_value__(self, object, self.length, size)
+        return super(type, self).__deserialize_block__(block)
+
+    def __getvalue__(self):
+        if not(self.__bulkQ__() and self.value.loadedQ()) or self.value.dynamic:
+            return super(type, self).__getvalue__()
+
+        # if our elements are structures composed of integers, then unpack them all at once
+        if ptype.iscontainer(self._object_):
+            layout = self.new(self._object_).__layout__()
+            if layout is None or not layout.integral:
+                return super(type, self).__getvalue__()
+            return tuple(layout.struct.iter_unpack(self.value.serialize()))
+
+        # if we can use an array.array for our elements, then decode them all at once
+        typecode, swap = self.__typecode__()
+        if typecode is None:
+            return super(type, self).__getvalue__()
+        res = _array.array(typecode, self.value.serialize())
+        if swap:
+            res.byteswap()
+        return tuple(res)
+
     def __setvalue__(self, *values, **attrs):
         """Update self with the contents of the first argument in ``value``"""
         if not values:
             return self
 
         [value] = values
+
+        # if we're still decoding from a block and we were given integers, then encode them all at once
+        typecode, swap = self.__typecode__() if self.__bulkQ__() and self.value.loadedQ() and not self.value.dynamic and len(self) == len(value) else (None, False)
+        if typecode is not None and all(isinstance(item, integer_types) for item in value):
+            bits = 8 * self.value.elementsize
+            mask, sign = pow(2, bits) - 1, pow(2, bits - 1) if typecode.islower() else 0
+            res = _array.array(typecode, [((item & mask) ^ sign) - sign for item in value])
+            if swap:
+                res.byteswap()
+            self.value.deserialize(res.tobytes())
+            return self
+
         if self.initializedQ() and len(self) == len(value):
             return super(type, self).__setvalue__(*value)
         else:
@@ -1773,6 +1887,182 @@ if __name__ == '__main__':
         if len(x) == 2 and x.size() == 8 and x.blocksize() == 8:
             raise Success
 
+    @TestCase
+    def test_array_lazy_load():
+        class t(parray.type):
+            _object_, length = pint.uint16_t, 0x80
+
+        data = bytearray(itertools.chain(*([item, 0] for item in range(0x80))))
+        x = t(source=ptypes.prov.bytes(bytes(data))).l
+        if not x.value.bulkQ() or x.value.resident:
+            raise Failure
+
+        if x[5].int() == 5 and x[-1].int() == 0x7f and x.value.resident == {5, 0x7f}:
+            if x.size() == x.blocksize() == 0x100 and x.serialize() == data:
+                raise Success
+
+    @TestCase
+    def test_array_lazy_get():
+        class t(parray.type):
+            _object_, length = pint.bigendian(pint.sint32_t), 4
+
+        x = t(source=ptypes.prov.bytes(b'\xff\xff\xff\xfe\x00\x00\x00\x01\x80\x00\x00\x00\x7f\xff\xff\xff')).l
+        if x.get() == (-2, 1, -0x80000000, 0x7fffffff) and x.value.bulkQ() and not x.value.resident:
+            raise Success
+
+    @TestCase
+    def test_array_lazy_set():
+        class t(parray.type):
+            _object_, length = pint.sint16_t, 4
+
+        x = t(source=ptypes.prov.bytes(b'\0' * 8)).l
+        item = x[1]
+        x.set([1, -1, 0x10000, -0x8000])
+        if x.value.bulkQ() and item.int() == -1 and x.serialize() == b'\x01\x00\xff\xff\x00\x00\x00\x80':
+            raise Success
+
+    @TestCase
+    def test_array_lazy_element_set():
+        class t(parray.type):
+            _object_, length = pint.uint32_t, 4
+
+        x = t(source=ptypes.prov.bytes(b'\0' * 0x10)).l
+        x[2].set(0x41424344)
+        if x.value.bulkQ() and x.get() == (0, 0, 0x41424344, 0) and x.serialize() == b'\0' * 8 + b'DCBA' + b'\0' * 4:
+            raise Success
+
+    @TestCase
+    def test_array_lazy_commit():
+        class t(parray.type):
+            _object_, length = pint.uint8_t, 8
+
+        data = bytearray(b'ABCDEFGH')
+        source = ptypes.prov.bytes(data)
+        x = t(source=source).l
+        x[3].set(ord('d'))
+        x.commit()
+        if x.value.bulkQ() and data == bytearray(b'ABCdEFGH'):
+            raise Success
+
+    @TestCase
+    def test_array_lazy_at():
+        class t(parray.type):
+            _object_, length = pint.uint32_t, 8
+
+        x = t(offset=0x10, source=ptypes.prov.bytes(b'\0' * 0x40)).l
+        item = x.at(0x10 + 0x12)
+        if item is x[4] and item.getoffset() == 0x20 and x.value.resident == {4}:
+            raise Success
+
+    @TestCase
+    def test_array_lazy_setoffset():
+        class t(parray.type):
+            _object_, length = pint.uint32_t, 8
+
+        x = t(source=ptypes.prov.bytes(b'\0' * 0x20)).l
+        item = x[2]
+        x.setoffset(0x100, recurse=True)
+        if item.getoffset() == 0x108 and x[3].getoffset() == 0x10c:
+            raise Success
+
+    @TestCase
+    def test_array_lazy_replace():
+        class t(parray.type):
+            _object_, length = pint.uint16_t, 4
+
+        x = t(source=ptypes.prov.bytes(b'AABBCCDD')).l
+        x[1] = pint.uint32_t().set(0x31313131)
+        if x.blocksize() == 10 and x[2].getoffset() == 6 and x.serialize() == b'AA1111CCDD':
+            raise Success
+
+    @TestCase
+    def test_array_lazy_pop():
+        class t(parray.type):
+            _object_, length = pint.uint8_t, 4
+
+        x = t(source=ptypes.prov.bytes(b'ABCD')).l
+        item = x.pop(1)
+        if item.serialize() == b'B' and not x.value.bulkQ() and x.serialize() == b'ACD' and x[2].getoffset() == 2:
+            raise Success
+
+    @TestCase
+    def test_array_lazy_struct():
+        class t(parray.type):
+            _object_, length = pint.uint16_t, 3
+        class st(pstruct.type):
+            _fields_ = [(pint.uint8_t, 'a'), (t, 'b'), (pint.uint8_t, 'c')]
+
+        x = st(source=ptypes.prov.bytes(b'\x01\x02\x00\x03\x00\x04\x00\x05')).l
+        if x['b'].value.bulkQ() and x['b'].get() == (2, 3, 4) and x['c'].int() == 5 and x.serialize() == b'\x01\x02\x00\x03\x00\x04\x00\x05':
+            raise Success
+
+    @TestCase
+    def test_array_lazy_disabled():
+        class t(parray.type):
+            _object_, length = pint.uint16_t, 2
+
+        res, ptypes.config.defaults.parray.lazy = ptypes.config.defaults.parray.lazy, False
+        try:
+            x = t(source=ptypes.prov.bytes(b'\x01\x00\x02\x00')).l
+        finally:
+            ptypes.config.defaults.parray.lazy = res
+        if not isinstance(x.value, parray.__lazy_value__) and x.get() == (1, 2):
+            raise Success
+
+    @TestCase
+    def test_array_terminated_large():
+        class t(parray.terminated):
+            _object_ = pint.uint16_t
+            def isTerminator(self, value):
+                return value.int() == 0
+
+        data = b''.join(pint.uint16_t().set(1 + index).serialize() for index in range(0x1000)) + b'\0\0' + b'\xff' * 0x10
+        x = t(source=ptypes.prov.bytes(data)).l
+        if len(x) == 0x1001 and x[-1].int() == 0 and x[0x800].getoffset() == 0x1000 and x.source.offset == 0x2002:
+            raise Success
+
+    @TestCase
+    def test_array_terminated_previous():
+        class t(parray.terminated):
+            _object_ = pint.uint8_t
+            def isTerminator(self, value):
+                return len(self.value) >= 2 and [item.int() for item in self[-2:]] == [0x50, 0x4b]
+
+        class source(ptypes.prov.bytes):
+            consumed = 0
+            def consume(self, amount):
+                self.consumed += amount
+                return super(source, self).consume(amount)
+
+        x = t(source=source(b'\x01\x02PK\x03\x04' + b'\xff' * 0x10000)).l
+        if len(x) == 4 and x.serialize() == b'\x01\x02PK' and x.source.offset == 4 and x.source.consumed < 0x1000:
+            raise Success
+
+    @TestCase
+    def test_array_terminated_length():
+        class t(parray.terminated):
+            _object_, length = pint.uint32_t, 3
+            def isTerminator(self, value):
+                return value.int() == 0
+
+        x = t(source=ptypes.prov.bytes(b'\x01\x00\x00\x00' * 4)).l
+        if len(x) == 3 and x.get() == (1, 1, 1):
+            raise Success
+
+    @TestCase
+    def test_array_terminated_unterminated():
+        class t(parray.terminated):
+            _object_ = pint.uint32_t
+            def isTerminator(self, value):
+                return value.int() == 0
+
+        x = t(source=ptypes.prov.bytes(b'\x01\x00\x00\x00' * 3 + b'\x01\x00'))
+        try:
+            x.l
+        except ptypes.error.LoadError:
+            if not isinstance(x.value, parray.__lazy_value__) and len(x) == 4:
+                raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
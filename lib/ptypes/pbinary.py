@@ -189,6 +189,32 @@ else:
 def iscontainer(t):
     return istype(t) and issubclass(t, container)
 
+def staticbits(t):
+    """Return the number of bits occupied by the binary type ``t`` if it is always the same size, otherwise return None."""
+    if isinstance(t, integer_types):
+        return abs(t)
+    elif bitmap.isinstance(t):
+        return bitmap.size(t)
+    elif not istype(t):
+        return None
+
+    # Structures are static only if every one of their fields is.
+    if issubclass(t, struct) and utils.callable_eq(t, t.blockbits, struct, struct.blockbits):
+        res = [staticbits(field) for field, _ in t._fields_ or []]
+        return None if any(item is None for item in res) else sum(res)
+
+    # Arrays are static if their length is a number and their element is static.
+    elif issubclass(t, array) and utils.callable_eq(t, t.blockbits, array, array.blockbits) and isinstance(getattr(t, 'length', None), integer_types):
+        res = staticbits(t._object_)
+        return None if res is None else res * t.length
+
+    # Integers are static if their length was defined as part of their type.
+    elif issubclass(t, enum) and utils.callable_eq(t, t.blockbits, enum, enum.blockbits) and isinstance(getattr(t, 'length', None), integer_types):
+        return t.length
+    elif issubclass(t, integer) and utils.callable_eq(t, t.blockbits, integer, integer.blockbits) and isinstance(getattr(t, 'length', None), integer_types):
+        return t.length
+    return None
+
 def force(t, self, chain=[]):
     """Resolve type ``t`` into a pbinary.type for the provided object ``self``"""
     chain = chain[:]
@@ -611,29 +637,56 @@ class enum(integer):
         if not hasattr(self, '_values_'):
             self._values_ = []
 
+        # compile the enumeration's ._values_ so that they're validated
+        self.__compile__()
+
+    @classmethod
+    def __compile__(cls):
+        '''Internal method that returns the dictionaries used to look up the enumeration by value and name, and compiles them if ``_values_`` has changed.'''
+        values = getattr(cls, '_values_', ())
+
+        # if the compiled state belongs to this exact class and its list of
+        # values hasn't been replaced or resized, then we can just use it.
+        res = cls.__dict__.get('__compiled__', None)
+        if res is not None and res[0] is values and res[1] == len(values):
+            _, _, byvalue, byname = res
+            return byvalue, byname
+
         # check that enumeration's ._values_ are defined correctly
-        if any(not isinstance(name, string_types) or not isinstance(value, integer_types) for name, value in self._values_):
+        if any(not isinstance(name, string_types) or not isinstance(value, integer_types) for name, value in values):
             res = [item.__name__ for item in string_types]
             stringtypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
 
             res = [item.__name__ for item in integer_types]
             integraltypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
 
-            raise error.TypeError(self, 'enum.__init__', "The definition in `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([self.typename(), '_values_']), stringtypes, integraltypes))
+            raise error.TypeError(cls, 'enum.__init__', "The definition in `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([cls.typename(), '_values_']), stringtypes, integraltypes))
 
-        # collect duplicate values and give a warning if there are any found for a name
-        res = {}
-        for value, items in itertools.groupby(self._values_, utils.operator.itemgetter(0)):
-            res.setdefault(value, set()).update(map(utils.operator.itemgetter(1), items))
+        # build the lookup tables so that the first definition of each value
+        # and name wins, and collect the names that have duplicate values.
+        byvalue, byname, duplicates = {}, {}, {}
+        for name, value in values:
+            byvalue.setdefault(value, name)
+            byname.setdefault(name, value)
+            duplicates.setdefault(name, set()).add(value)
 
-        for value, items in res.items():
+        # give a warning for any name with duplicate values once per compile
+        for value, items in duplicates.items():
             if len(items) > 1:
-                Log.warning("{:s}.enum : {:s} : The definition for `{:s}` has more than one value ({!s}) defined for the enumeration \"{:s}\".".format(__name__, self.classname(), '.'.join([self.typename(), '_values_']), ', '.join(map("{!s}".format, items)), value))
+                Log.warning("{:s}.enum : {:s} : The definition for `{:s}` has more than one value ({!s}) defined for the enumeration \"{:s}\".".format(__name__, cls.typename(), '.'.join([cls.typename(), '_values_']), ', '.join(map("{!s}".format, sorted(items))), value))
             continue
 
         # XXX: we could constrain all the constants within ._values_ by validating that
         #      they're within the boundaries of our type
-        return
+        setattr(cls, '__compiled__', (values, len(values), byvalue, byname))
+        return byvalue, byname
+
+    @classmethod
+    def invalidate(cls):
+        '''Discard the compiled enumeration so that it is rebuilt from ``_values_`` after they have been modified in place.'''
+        if '__compiled__' in cls.__dict__:
+            delattr(cls, '__compiled__')
+        return cls
 
     def __blockbits_originalQ__(self):
         '''Return whether the instance's blockbits have been rewritten by a definition.'''
@@ -656,28 +709,24 @@ class enum(integer):
         '''Internal method to search the enumeration for the name representing the provided value.'''
         if len(default) > 1:
             raise error.TypeError(cls, 'enum.byvalue', "{:s}.byvalue expected at most 3 arguments, got {:d}".format(cls.typename(), 2 + len(default)))
-
-        iterable = (name for name, item in cls._values_ if item == value)
-        try:
-            res = utils.next(iterable, *default)
-
-        except StopIteration:
-            raise error.KeyError(cls, 'enum.byvalue', value)
-        return res
+        byvalue, _ = cls.__compile__()
+        if value in byvalue:
+            return byvalue[value]
+        elif default:
+            return default[0]
+        raise error.KeyError(cls, 'enum.byvalue', value)
 
     @classmethod
     def __byname__(cls, name, *default):
         '''Internal method to search the enumeration for the value corresponding to the provided name.'''
         if len(default) > 1:
             raise error.TypeError(cls, 'enum.byname', "{:s}.byname expected at most 3 arguments, got {:d}".format(cls.typename(), 2 + len(default)))
-
-        iterable = (value for item, value in cls._values_ if item == name)
-        try:
-            res = utils.next(iterable, *default)
-
-        except StopIteration:
-            raise error.KeyError(cls, 'enum.byname', name)
-        return res
+        _, byname = cls.__compile__()
+        if name in byname:
+            return byname[name]
+        elif default:
+            return default[0]
+        raise error.KeyError(cls, 'enum.byname', name)
 
     def __getattr__(self, name):
 
@@ -752,11 +801,8 @@ class enum(integer):
     @classmethod
     def has(cls, value):
         '''Return True if the given value is within the definition of the enumeration.'''
-        if isinstance(value, string_types):
-            iterable = (name == value for name, item in cls._values_)
-        else:
-            iterable = (item == value for name, item in cls._values_)
-        return any(iterable)
+        byvalue, byname = cls.__compile__()
+        return value in byname if isinstance(value, string_types) else value in byvalue
 
     def __contains__(self, value):
         return self.has(value)
@@ -857,6 +903,12 @@ class container(type):
             # that we're actually at for the very first member.
             current = utils.next(calculator)
 
+            # If our members are still being extracted from an integer, then
+            # avoid instantiating them by only recording their position.
+            if isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+                self.value.relocate(current, calculator, recurse)
+                return res
+
             # Iterate through all of our members using the calculator to
             # figure out the correct position they should be at.
             for item in self.value:
@@ -874,6 +926,8 @@ class container(type):
         return result
 
     def initializedQ(self):
+        if isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+            return self.value.initializedQ()
         return super(container, self).initializedQ() and all(isinstance(item, type) and item.initializedQ() for item in self.value)
 
     ### standard stuff
@@ -882,6 +936,8 @@ class container(type):
         return bitmap.value(res)
 
     def bits(self):
+        if isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+            return self.value.bits()
         return sum(item.bits() for item in self.value or [])
 
     def __blockbits_originalQ__(self):
@@ -891,6 +947,8 @@ class container(type):
     def blockbits(self):
         if self.value is None:
             raise error.InitializationError(self, 'container.blockbits')
+        elif isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+            return self.value.blockbits()
         return sum(item.blockbits() for item in self.value)
 
     def __getindex__(self, key):
@@ -918,11 +976,16 @@ class container(type):
     def bitmap(self):
         if self.value is None:
             raise error.InitializationError(self, 'container.bitmap')
+        elif isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+            return self.value.bitmap()
         iterable = map(utils.operator.methodcaller('bitmap'), self.value)
         filtered = (item for item in iterable if item)
         return functools.reduce(bitmap.push, filtered, bitmap.zero)
 
     def __getvalue__(self):
+        if isinstance(self.value, __lazy_value__) and self.value.bulkQ():
+            return self.value.bitmap()
+
         result = bitmap.zero
         for item in self.value or []:
             result = bitmap.push(result, item if bitmap.isinstance(item) else item.__getvalue__())
@@ -1687,6 +1750,126 @@ class array(__array_interface__):
     #    state, self._object_, self.length, = state
     #    super(array, self).__setstate__(state)
 
+class __layout__(object):
+    '''The layout of the fields for a structure with a static width that are extracted from a single integer.'''
+    def __init__(self, types, names, widths, blocks, length):
+        self.types, self.names, self.widths, self.blocks = types, names, widths, blocks
+        self.bits, self.blockbits, self.length = sum(map(abs, widths)), sum(blocks), length
+
+        # the index for each field keyed by its lowercase name. this is the same
+        # as the fastindex that the structure would've produced when loading.
+        self.index = {}
+        for index, name in enumerate(names):
+            self.index[name.lower()] = index
+
+        # the bit position, shift, and mask for each field. the position is
+        # relative to the most-significant bit and the shift to the least.
+        self.positions, self.shifts, self.masks = [], [], []
+        position = 0
+        for width in widths:
+            self.positions.append(position)
+            position += abs(width)
+            self.shifts.append(self.bits - position)
+            self.masks.append(pow(2, abs(width)) - 1)
+        return
+
+    @classmethod
+    def compile(cls, owner, fields):
+        '''Return the layout for the specified ``fields`` of ``owner`` if each one is an integer or structure with a static width.'''
+        types, names, widths, blocks, length = [], [], [], [], 0
+        for t, name in fields:
+            if isinstance(t, integer_types):
+                width, size = t, abs(t)
+            elif bitmap.isinstance(t):
+                width = size = t[1]
+            elif istype(t) and issubclass(t, integer) and staticbits(t) is not None and utils.callable_eq(t, t.__deserialize_consumer__, integer, integer.__deserialize_consumer__):
+                width = size = t.length
+
+            # structures are extracted as a single field if they can be compiled too.
+            elif istype(t) and issubclass(t, struct) and utils.callable_eq(t, t.__deserialize_consumer__, struct, struct.__deserialize_consumer__):
+                layout = owner.new(t).__layout__()
+                if layout is None:
+                    return None
+                types.append(t), names.append(name), widths.append(layout.bits), blocks.append(layout.blockbits)
+                length += layout.length
+                continue
+
+            else:
+                return None
+
+            # integers and bitmaps are converted to a type once for the whole layout.
+            types.append(force(t, owner)), names.append(name), widths.append(width), blocks.append(width)
+            length += size
+        return cls(types, names, widths, blocks, length)
+
+class __lazy_value__(ptype.__lazy_value__):
+    '''The fields of a structure that are extracted from the integer described by its layout.'''
+    def __init__(self, owner, layout, integer, position):
+        super(__lazy_value__, self).__init__(owner, len(layout.names))
+        self.layout, self.integer, self.position = layout, integer, position
+
+        # positions of the fields that were calculated before being instantiated.
+        self.located = {}
+
+    def __field__(self, index):
+        '''Return the bitmap for the field at ``index`` from the integer.'''
+        layout = self.layout
+        return bitmap.new((self.integer >> layout.shifts[index]) & layout.masks[index], layout.widths[index])
+
+    def __instance__(self, index):
+        layout, position = self.layout, self.position + self.layout.positions[index]
+        item = self.owner.new(layout.types[index], __name__=layout.names[index], position=(position // 8, position % 8))
+        item.parent, item.source = self.owner, None
+
+        # decode the field from its own bits exactly like a consumer would.
+        consumer = bitmap.consumer(position=position)
+        item.__deserialize_consumer__(consumer.push(self.__field__(index)))
+
+        # if we were relocated before the field existed, then apply it now.
+        if index in self.located:
+            location, recurse = self.located.pop(index)
+            item.setposition(location, recurse=recurse)
+
+        list.__setitem__(self, index, item)
+        self.resident.add(index)
+        self.pending -= 1
+        return item
+
+    def relocate(self, position, calculator, recurse):
+        '''Use the ``calculator`` to update the position of every field starting at ``position``.'''
+        for index in range(len(self)):
+            item = list.__getitem__(self, index)
+            if item is None:
+                self.located[index] = position, recurse
+                position = calculator.send(abs(self.layout.widths[index]))
+            else:
+                item.setposition(position, recurse=recurse)
+                position = calculator.send(item.bits() if item.initializedQ() else item.blockbits())
+            continue
+        return position
+
+    def initializedQ(self):
+        return all(isinstance(item, type) and item.initializedQ() for item in map(functools.partial(list.__getitem__, self), self.resident))
+
+    def bits(self):
+        layout, items = self.layout, ((index, list.__getitem__(self, index)) for index in self.resident)
+        return layout.bits + sum(item.bits() - abs(layout.widths[index]) if index < self.count else item.bits() for index, item in items)
+
+    def blockbits(self):
+        layout, items = self.layout, ((index, list.__getitem__(self, index)) for index in self.resident)
+        return layout.blockbits + sum(item.blockbits() - layout.blocks[index] if index < self.count else item.blockbits() for index, item in items)
+
+    def bitmap(self):
+        '''Return the bitmap for every field using the integer for the ones that have not been instantiated.'''
+        if not self.resident:
+            return self.integer, self.layout.bits
+
+        result = bitmap.zero
+        for index in range(len(self)):
+            item = list.__getitem__(self, index)
+            result = bitmap.push(result, self.__field__(index) if item is None else item.__getvalue__())
+        return result
+
 class struct(__structure_interface__):
     _fields_ = None
 
@@ -1695,6 +1878,22 @@ class struct(__structure_interface__):
         result._fields_ = self._fields_[:]
         return result
 
+    def __layout__(self):
+        '''Return the compiled layout of the structure if every one of its fields is an integer with a static width.'''
+        fields = self._fields_
+        if not (Config.pbinary.compiled and fields and self.__blockbits_originalQ__()):
+            return None
+
+        # if the fields are the same as the ones for the class, then we can
+        # reuse the layout that was compiled for it.
+        cls, key = self.__class__, tuple(fields)
+        cached = cls.__dict__.get('__compiled__', None)
+        if cached is None or cached[0] != key:
+            cached = key, __layout__.compile(self, fields)
+            setattr(cls, '__compiled__', cached)
+        _, layout = cached
+        return layout
+
     def __deserialize_consumer__(self, consumer):
         self.value = []
 
@@ -1702,6 +1901,23 @@ class struct(__structure_interface__):
         position = consumer.position
         self.__position__ = position // 8, position % 8
 
+        # If the structure has a static width, then consume all of its bits
+        # as a single integer and extract each member from it when accessed.
+        layout = self.__layout__()
+        if layout is not None:
+            try:
+                integer = consumer.consume(layout.bits)
+
+            # If we couldn't consume everything, then the bits that were read are
+            # still cached by the consumer and so we decode each member normally.
+            except StopIteration:
+                pass
+
+            else:
+                self.value = __lazy_value__(self, layout, integer, position)
+                self.__fastindex__.update(layout.index)
+                return self
+
         # Define a closure that's responsible for creating each member.
         def members(position):
             for t, name in self._fields_ or []:
@@ -1720,6 +1936,9 @@ class struct(__structure_interface__):
     def blockbits(self):
         if self.initializedQ():
             return super(struct, self).blockbits()
+        layout = self.__layout__()
+        if layout is not None:
+            return layout.length
         # FIXME: self.new(t) can potentially execute a function that it shouldn't
         #        when .blockbits() is called by .__load_littleendian
         return sum((abs(t) if isinstance(t, integer_types) else bitmap.size(t) if bitmap.isinstance(t) else self.new(t).blockbits()) for t, _ in self._fields_ or [])
@@ -1964,7 +2183,11 @@ class partial(ptype.container):
 
         # Figure out what kind of iterator we're being given,
         # because we can only process things that yield bytes.
-        if isinstance(iterator, (bytes, bytearray)):
+        if isinstance(iterator, memoryview):
+            iterable, size = iterator.tobytes(), len(iterator) if size is None else size
+            return self.__consumer__(iterable, size)
+
+        elif isinstance(iterator, (bytes, bytearray)):
             iterable, size = (iterator[index : index + 1] for index in range(len(iterator))), len(iterator) if size is None else size
         else:
             iterable, size = iterator, size
@@ -2013,9 +2236,21 @@ class partial(ptype.container):
             return bytes(result[:len(data)])
         return data
 
+    def __word__(self, data):
+        '''Return a consumer containing ``data`` decoded as a single integer using the byte order.'''
+        res = self.__transform__(bytes(data))
+        consumer = bitmap.consumer(position=8 * self.getoffset())
+        return consumer.push((int.from_bytes(res, 'big'), 8 * len(res)))
+
+    def __wordsize__(self):
+        '''Return the number of bytes to read as a single integer if the object is a structure with a static width.'''
+        object = self.object
+        layout = object.__layout__() if isinstance(object, struct) else None
+        return None if layout is None else (layout.bits + 7) // 8
+
     def __deserialize_block__(self, block):
         self.value = res = [self.__object__()]
-        bc = self.__consumer__(block, len(block))
+        bc = self.__word__(block) if len(block) == self.__wordsize__() else self.__consumer__(block, len(block))
         res = res[0].__deserialize_consumer__(bc)
         if res.parent is not self:
             raise error.AssertionError(self, 'partial.__deserialize_block__', message="parent for binary type {:s} is not {:s}".format(res[0].instance(), self.instance()))
@@ -2026,9 +2261,13 @@ class partial(ptype.container):
         try: bs = self.blocksize()
         except Exception: bs = None
 
-        # then we'll seek to the right position and generate a consumer
+        # then we'll seek to the right position and generate a consumer. if our
+        # object has a static width, then we can read the whole word at once.
         self.source.seek(offset)
-        bc = self.__consumer__(iterable) if bs is None else self.__consumer__(iterable, bs)
+        if bs is not None and bs == self.__wordsize__():
+            bc = self.__word__(self.source.consume(bs))
+        else:
+            bc = self.__consumer__(iterable) if bs is None else self.__consumer__(iterable, bs)
         return self.object.__deserialize_consumer__(bc)
 
     def load(self, **attrs):
@@ -2043,7 +2282,7 @@ class partial(ptype.container):
                 return self.a
 
             try:
-                object = self.__load_byteorder(offset, (source.consume(1) for index in itertools.count()))
+                object = self.__load_byteorder(offset, (bytes(source.consume(1)) for index in itertools.count()))
             except (StopIteration, error.ProviderError):
                 raise error.LoadError(self, consumed=0, offset=offset)     # FIXME: we should be able to track how many bits we've consumed
             finally:
@@ -4437,6 +4676,87 @@ if __name__ == '__main__':
         if a['a'] == 15 and a['b'] == 0:
             raise Success
 
+    @TestCase
+    def test_pbinary_staticbits():
+        class inner(pbinary.struct):
+            _fields_ = [(3, 'a'), (pbinary.integer, 'b')]
+        class member(pbinary.struct):
+            _fields_ = [(4, 'a'), (ptype.clone(pbinary.array, _object_=2, length=3), 'b'), (ptype.clone(pbinary.integer, length=6), 'c')]
+        class dynamicmember(pbinary.struct):
+            _fields_ = [(4, 'a'), (lambda self: 4, 'b')]
+
+        if pbinary.staticbits(member) == 16 and pbinary.staticbits(inner) is None and pbinary.staticbits(dynamicmember) is None:
+            raise Success
+
+    @TestCase
+    def test_pbinary_enum_compiled_invalidate():
+        class e(pbinary.enum):
+            length, _values_ = 8, [
+                ('aa', 0xaa),
+                ('bb', 0xaa),
+            ]
+        if e.byvalue(0xaa) != 'aa' or e.byname('bb') != 0xaa or e.has(0xcc):
+            raise Failure
+        e._values_.append(('cc', 0xcc))
+        if not e.has('cc'):
+            raise Failure
+        e._values_[0] = ('dd', 0xaa)
+        e.invalidate()
+        x = e().set(0xaa)
+        if x.str() == 'dd' and not e.has('aa'):
+            raise Success
+
+    @TestCase
+    def test_pbinary_compiled_lazy_fields():
+        class inner(pbinary.flags):
+            _fields_ = [(2, 'x'), (-2, 'y')]
+        class t(pbinary.flags):
+            _fields_ = [(1, 'a'), (inner, 'b'), (3, 'c'), (-4, 'd'), (4, 'e')]
+        x = pbinary.new(t, source=prov.bytes(b'\x9c\x41')).l
+        if not isinstance(x.object.value, pbinary.__lazy_value__) or x.object.value.resident:
+            raise Failure
+        if x.object.bits() != 16 or x.int() != 0x9c41 or x.serialize() != b'\x9c\x41':
+            raise Failure
+        if x['c'] == 4 and x['b']['x'] == 0 and x.object.value.resident == {1, 2} and x.field('b', 'y').getposition() == (0, 3):
+            raise Success
+
+    @TestCase
+    def test_pbinary_compiled_matches():
+        class t(pbinary.flags):
+            _fields_ = [(3, 'a'), (-5, 'b'), (ptype.clone(pbinary.integer, length=6), 'c'), (2, 'd')]
+        data = b'\xa5\x3c'
+        results = []
+        try:
+            for compiled in [True, False]:
+                ptypes.config.defaults.pbinary.compiled = compiled
+                for order in [pbinary.bigendian, pbinary.littleendian]:
+                    x = order(t)(source=prov.bytes(data)).l
+                    results.append((compiled, x.int(), [item.int() for item in x.object.value], [item.getposition() for item in x.object.value]))
+        finally:
+            ptypes.config.defaults.pbinary.compiled = True
+        compiled, uncompiled = results[:2], results[2:]
+        if isinstance(x.object.value, pbinary.__lazy_value__):
+            raise Failure
+        if [res[1:] for res in compiled] == [res[1:] for res in uncompiled]:
+            raise Success
+
+    @TestCase
+    def test_pbinary_compiled_dynamic():
+        class t(pbinary.struct):
+            _fields_ = [(4, 'a'), (lambda self: 4, 'b')]
+        x = pbinary.new(t, source=prov.bytes(b'\xab')).l
+        if x.object.__layout__() is None and not isinstance(x.object.value, pbinary.__lazy_value__) and x['b'] == 0xb:
+            raise Success
+
+    @TestCase
+    def test_pbinary_compiled_set():
+        class t(pbinary.flags):
+            _fields_ = [(4, 'a'), (4, 'b'), (8, 'c')]
+        x = pbinary.new(t, source=prov.bytes(b'\x12\x34')).l
+        x.object.field('b').set(0xf)
+        if x.serialize() == b'\x1f\x34' and x.object.value.pending == 2:
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
@@ -135,7 +135,7 @@ Example usage of pint.enum:
     # return the instance as a name or an integer in string form
     print(instance.str())
 """
-import sys, functools, itertools, math, builtins
+import sys, functools, itertools, math, builtins, struct
 from . import ptype, bitmap, error, utils
 
 from . import config
@@ -144,9 +144,36 @@ Log = config.logging.getLogger('.'.join([Config.log.name, 'pint']))
 
 # Setup some version-agnostic types that we can perform checks with
 integer_types, string_types, ordinal_types = bitmap.integer_types, utils.string_types, (utils.string_types, bytes)
-make_integers = (lambda integer: {integer, chr(integer) if 0 <= integer < 0x100 else unichr(integer) if 0 <= integer < 0x110000 else integer}) if sys.version_info.major < 3 else (lambda integer: {integer, chr(integer)} if 0 <= integer < 0x110000 else {integer})
 
 __state__ = {}
+
+# Functions for decoding and encoding integers are cached by their size, byteorder,
+# and signedness. The sizes with a struct format are decoded with the struct module,
+# and anything else is decoded with int.from_bytes.
+__codecs__, __formats__ = {}, {1: 'B', 2: 'H', 4: 'L', 8: 'Q'}
+def __codec__(size, order, signed=False):
+    '''Return a tuple of the functions that decode and encode an integer of ``size`` bytes with the given ``order`` and signedness.'''
+    key = size, order, signed
+    if key in __codecs__:
+        return __codecs__[key]
+
+    mask, little = pow(2, 8 * size) - 1, order is config.byteorder.littleendian
+    name = 'little' if little else 'big'
+    if size in __formats__:
+        format = __formats__[size]
+        decoder = struct.Struct(('<' if little else '>') + (format.lower() if signed else format))
+        encoder = struct.Struct(('<' if little else '>') + format)
+        unpack, pack = decoder.unpack, encoder.pack
+        decode = lambda data: unpack(data)[0]
+        encode = lambda integer: pack(integer & mask)
+
+    else:
+        decode = lambda data: builtins.int.from_bytes(data, name, signed=signed)
+        encode = lambda integer: (integer & mask).to_bytes(size, name)
+
+    res = __codecs__[key] = decode, encode
+    return res
+
 def setbyteorder(order):
     if order in {config.byteorder.bigendian, config.byteorder.littleendian}:
         transform = {config.byteorder.bigendian : bigendian, config.byteorder.littleendian : littleendian}[order]
@@ -283,13 +310,45 @@ class type(ptype.type):
             raise error.AssertionError(self, 'type.flip', message="An unexpected byteorder ({!s}) was returned by an internal function.".format(order))
         return self.cast(Finvert(self.__class__))
 
+    # whether the integer is signed, and the last value that was decoded
+    __signed__, __decoded__ = False, None
+
     def __getvalue__(self):
-        if not self.initializedQ():
+        value, order = self.value, self.byteorder
+
+        # if the value and byteorder are the same as when we last decoded
+        # the integer, then we can just return what we decoded.
+        decoded = self.__decoded__
+        if decoded is not None and decoded[0] is value and decoded[1] is order:
+            return decoded[2]
+
+        # if our value is exactly the size of the integer and we haven't changed
+        # how it gets serialized, then we can decode the value as-is.
+        size = self.blocksize()
+        if value is not None and len(value) == size and self.__class__.serialize is ptype.type.serialize:
+            decode, _ = __codecs__.get((size, order, self.__signed__), None) or __codec__(size, self.__generalize_byteorder(), self.__signed__)
+            result = decode(value)
+            if Config.pint.cache:
+                self.__decoded__ = value, order, result
+            return result
+
+        elif not self.initializedQ():
             raise error.InitializationError(self, 'int')
 
-        data, order = bytearray(self.serialize()), self.__generalize_byteorder()
-        ordered = data[:: -1 if order is config.byteorder.littleendian else +1]
-        return functools.reduce(lambda agg, item: agg << 8 | item, ordered, 0)
+        data = self.serialize()
+        decode, _ = __codec__(len(data), self.__generalize_byteorder(), self.__signed__ and len(data) == size)
+        result = decode(data)
+
+        # if there's more data than the size of a signed integer, then use
+        # the bit at its size to determine what the sign should be.
+        if self.__signed__ and len(data) != size:
+            signmask = math.trunc(pow(2, 8 * size - 1))
+            res = result & (signmask - 1)
+            result = (signmask - res) * -1 if result & signmask else res & (signmask - 1)
+
+        if Config.pint.cache:
+            self.__decoded__ = value, order, result
+        return result
 
     def __setvalue__(self, *values, **attrs):
         if not values:
@@ -303,17 +362,10 @@ class type(ptype.type):
         if isinstance(integer, (bytes, bytearray)):
             return super(type, self).__setvalue__(bytes(integer) if isinstance(integer, bytearray) else integer, **attrs)
 
-        mask = pow(2, 8 * self.blocksize()) - 1
-        integer &= mask
-
-        bc = bitmap.new(integer, 8 * self.blocksize())
-        res = []
-        while bc[1] > 0:
-            bc, x = bitmap.consume(bc, 8)
-            res.append(x)
-        res = res + [0] * (self.blocksize() - len(res))   # FIXME: use padding
-        ordered = res[:: +1 if self.__generalize_byteorder() is config.byteorder.littleendian else -1]
-        return super(type, self).__setvalue__(bytes(bytearray(ordered)), **attrs)
+        # Encoding will mask the integer to our size, which also takes care
+        # of converting a negative integer to its two's complement form.
+        _, encode = __codec__(self.blocksize(), self.__generalize_byteorder())
+        return super(type, self).__setvalue__(encode(integer), **attrs)
 
     def int(self):
         if self.value is None:
@@ -348,33 +400,14 @@ class uinteger_t(type):
 
 class sinteger_t(type):
     '''Provides signed integer support'''
+    __signed__ = True
+
     def summary(self):
         if len(self.value or b'') < self.blocksize():
             return super(uinteger_t, self).summary()
         res = self.int()
         return u"{:+#0{:d}x} ({:d})".format(res, 3 + self.blocksize() * 2, res)
 
-    def __getvalue__(self):
-        if not self.initializedQ():
-            raise error.InitializationError(self, 'int')
-        signmask = math.trunc(pow(2, 8 * self.blocksize() - 1))
-        num = super(sinteger_t, self).__getvalue__()
-        res = num & (signmask - 1)
-        if num & signmask:
-            return (signmask - res) * -1
-        return res & (signmask - 1)
-
-    def __setvalue__(self, *values, **attrs):
-        if not values:
-            return super(sinteger_t, self).__setvalue__(*values, **attrs)
-
-        integer, = values
-        signmask = math.trunc(pow(2, 8 * self.blocksize()))
-        res = integer & (signmask - 1)
-        if integer < 0:
-            res |= signmask
-        return super(sinteger_t, self).__setvalue__(res, **attrs)
-
 class uinteger(ptype.definition):
     attribute, cache = 'length', {}
 class sinteger(ptype.definition):
@@ -428,71 +461,94 @@ class enum(type):
         if not hasattr(self, '_values_'):
             self._values_ = []
 
+        # compile the enumeration's ._values_ so that they're validated
+        self.__compile__()
+
+    @classmethod
+    def __compile__(cls):
+        '''Internal method that returns the dictionaries used to look up the enumeration by value and name, and compiles them if ``_values_`` has changed.'''
+        values = getattr(cls, '_values_', ())
+
+        # if the compiled state belongs to this exact class and its list of
+        # values hasn't been replaced or resized, then we can just use it.
+        res = cls.__dict__.get('__compiled__', None)
+        if res is not None and res[0] is values and res[1] == len(values):
+            _, _, byvalue, byname = res
+            return byvalue, byname
+
         # check that enumeration's ._values_ are defined correctly and fix them if not.
-        for index, (name, value) in enumerate(self._values_[:]):
+        for index, (name, value) in enumerate(values[:]):
             if not isinstance(name, string_types):
                 res = [item.__name__ for item in string_types]
                 stringtypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
                 res = [item.__name__ for item in integer_types]
                 integraltypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
-                raise error.TypeError(self, 'enum.__init__', "The definition of `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([self.typename(), '_values_']), stringtypes, integraltypes))
+                raise error.TypeError(cls, 'enum.__init__', "The definition of `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([cls.typename(), '_values_']), stringtypes, integraltypes))
 
             if isinstance(value, integer_types):
                 continue
 
             elif isinstance(value, ordinal_types) and len(value) == 1:
                 value = ord(value)
-                self._values_[index] = name, value
+                values[index] = name, value
                 continue
 
             res = [item.__name__ for item in string_types]
             stringtypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
             res = [item.__name__ for item in integer_types]
             integraltypes = '({:s})'.format(','.join(res)) if len(res) > 1 else res[0]
-            raise error.TypeError(self, 'enum.__init__', "The definition of `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([self.typename(), '_values_']), stringtypes, integraltypes))
-
-        # collect duplicate values and give a warning if there are any found for a name
-        res = {}
-        for value, items in itertools.groupby(self._values_, utils.operator.itemgetter(0)):
-            iterable = ((ord(integer) if isinstance(integer, ordinal_types) and len(integer) == 1 else integer) for integer in items)
-            res.setdefault(value, set()).update(map(utils.operator.itemgetter(1), items))
-
-        for value, items in res.items():
+            raise error.TypeError(cls, 'enum.__init__', "The definition of `{:s}` is of an incorrect format and should be a list of tuples with the following types. : [({:s}, {:s}), ...]".format('.'.join([cls.typename(), '_values_']), stringtypes, integraltypes))
+
+        # build the lookup tables so that the first definition of each value
+        # and name wins, and collect the names that have duplicate values.
+        byvalue, byname, duplicates = {}, {}, {}
+        for name, value in values:
+            byvalue.setdefault(value, name)
+            byname.setdefault(name, value)
+            duplicates.setdefault(name, set()).add(value)
+
+        # give a warning for any name with duplicate values once per compile
+        for value, items in duplicates.items():
             if len(items) > 1:
-                Log.warning("{:s}.enum : {:s} : The definition for `{:s}` has more than one value ({!s}) defined for the enumeration \"{:s}\".".format(__name__, self.classname(), '.'.join([self.typename(), '_values_']), ', '.join(map("{!s}".format, items)), value))
+                Log.warning("{:s}.enum : {:s} : The definition for `{:s}` has more than one value ({!s}) defined for the enumeration \"{:s}\".".format(__name__, cls.typename(), '.'.join([cls.typename(), '_values_']), ', '.join(map("{!s}".format, sorted(items))), value))
             continue
 
         # XXX: we could constrain all the constants within ._values_ by validating that
         #      they're within the boundaries of our type
-        return
+        setattr(cls, '__compiled__', (values, len(values), byvalue, byname))
+        return byvalue, byname
+
+    @classmethod
+    def invalidate(cls):
+        '''Discard the compiled enumeration so that it is rebuilt from ``_values_`` after they have been modified in place.'''
+        if '__compiled__' in cls.__dict__:
+            delattr(cls, '__compiled__')
+        return cls
 
     @classmethod
     def __byvalue__(cls, value, *default):
         '''Internal method to search the enumeration for the name representing the provided value.'''
         if len(default) > 1:
             raise error.TypeError(cls, 'enum.byvalue', "{:s}.byvalue expected at most 3 arguments, got {:d}".format(cls.typename(), 2 + len(default)))
-        values = make_integers(ord(value)) if isinstance(value, ordinal_types) and len(value) == 1 else make_integers(value)
-        iterable = (name for name, item in cls._values_ if item in values)
-        try:
-            res = utils.next(iterable, *default)
-
-        except StopIteration:
-            raise error.KeyError(cls, 'enum.byvalue', value)
-        return res
+        byvalue, _ = cls.__compile__()
+        integer = ord(value) if isinstance(value, ordinal_types) and len(value) == 1 else value
+        if integer in byvalue:
+            return byvalue[integer]
+        elif default:
+            return default[0]
+        raise error.KeyError(cls, 'enum.byvalue', value)
 
     @classmethod
     def __byname__(cls, name, *default):
         '''Internal method to search the enumeration for the value corresponding to the provided name.'''
         if len(default) > 1:
             raise error.TypeError(cls, 'enum.byname', "{:s}.byname expected at most 3 arguments, got {:d}".format(cls.typename(), 2 + len(default)))
-
-        iterable = (value for item, value in cls._values_ if item == name)
-        try:
-            res = utils.next(iterable, *default)
-
-        except StopIteration:
-            raise error.KeyError(cls, 'enum.byname', name)
-        return res
+        _, byname = cls.__compile__()
+        if name in byname:
+            return byname[name]
+        elif default:
+            return default[0]
+        raise error.KeyError(cls, 'enum.byname', name)
 
     def __contains__(self, name):
         return self.has(name)
@@ -572,12 +628,11 @@ class enum(type):
     @classmethod
     def has(cls, value):
         '''Return True if the given value is within the definition of the enumeration.'''
+        byvalue, byname = cls.__compile__()
         if isinstance(value, string_types):
-            iterable = (name == value for name, item in cls._values_)
-        else:
-            values = make_integers(value)
-            iterable = (item in values for name, item in cls._values_)
-        return any(iterable)
+            return value in byname
+        integer = ord(value) if isinstance(value, ordinal_types) and len(value) == 1 else value
+        return integer in byvalue
 
     def __format__(self, spec):
         if self.value is None or not spec:
@@ -1048,6 +1103,58 @@ if __name__ == '__main__':
         except KeyError:
             raise Success
 
+    @TestCase
+    def test_int_codec_sizes():
+        class s24(pint.sint_t): length = 3
+        class u24(pint.uint_t): length = 3
+        data = b'\xfe\xff\xff'
+        a, b = pint.littleendian(s24)(source=ptypes.prov.bytes(data)).l, pint.bigendian(u24)(source=ptypes.prov.bytes(data)).l
+        c, d = pint.bigendian(pint.sint128_t)().set(-2), pint.littleendian(pint.uint16_t)().set(0x12345)
+        if a.int() == -2 and b.int() == 0xfeffff and c.serialize() == b'\xff' * 15 + b'\xfe' and c.int() == -2 and d.serialize() == b'\x45\x23':
+            raise Success
+
+    @TestCase
+    def test_int_cached_reset():
+        a = pint.uint32_t(source=ptypes.prov.bytes(b'\x01\x00\x00\x00\x02\x00\x00\x00')).l
+        if a.int() != 1:
+            raise Failure
+        a.set(5)
+        if a.int() != 5:
+            raise Failure
+        a.load(offset=4)
+        if a.int() != 2:
+            raise Failure
+        a.byteorder = ptypes.config.byteorder.bigendian
+        if a.int() == 0x2000000:
+            raise Success
+
+    @TestCase
+    def test_enum_compiled_first_definition():
+        class e(pint.enum, pint.uint8_t):
+            _values_ = [
+                ('aa', 0xaa),
+                ('bb', 0xaa),
+                ('aa', 0xbb),
+            ]
+        if e.byvalue(0xaa) == 'aa' and e.byname('aa') == 0xaa and e.byname('bb') == 0xaa and e.has('bb') and not e.has(0xbb + 1):
+            raise Success
+
+    @TestCase
+    def test_enum_compiled_invalidate():
+        class e(pint.enum, pint.uint8_t):
+            _values_ = [
+                ('aa', 0xaa),
+            ]
+        if e.byvalue(0xbb, None) is not None:
+            raise Failure
+        e._values_.append(('bb', 0xbb))
+        if e.byvalue(0xbb) != 'bb':
+            raise Failure
+        e._values_[0] = ('cc', 0xaa)
+        e.invalidate()
+        if e.byvalue(0xaa) == 'cc' and not e.has('aa'):
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
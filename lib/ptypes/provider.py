@@ -16,6 +16,12 @@ The interface for a provider must look like the following:
 It is up to the implementor to maintain the current offset, and update them when
 the .store or .consume methods are called.
 
+As each provider keeps track of its own offset, a provider instance should not be
+shared between threads. Providers that wrap another one (such as `cached` or
+`proxy`) will modify the offset of the provider that they wrap, and the default
+source is a single instance that is shared by every thread unless it has been
+overridden for the current thread with `ptypes.context`.
+
 Example usage:
 # define a type
     type = ...
@@ -49,9 +55,18 @@ Example usage:
     instance = type()
     instance.commit(source=ptypes.provider.name(...))
     print( repr(instance) )
+
+# parse independent files from a pool of threads with a provider for each file
+    import ptypes, concurrent.futures
+    def parse(filename):
+        with ptypes.context(source=ptypes.provider.file(filename, 'rb')):
+            return type().load()
+
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        instances = list(executor.map(parse, filenames))
 """
 import sys, os, builtins, itertools, functools, operator
-import abc, bisect, random as _random
+import abc, bisect, collections, errno, time, random as _random
 
 from . import config, utils, error
 Config = config.defaults
@@ -79,6 +94,49 @@ class base(object if sys.version_info.major < 3 else abc.ABC):
         '''Write some number of bytes to the current offset. If nothing was able to be written, raise an exception.'''
         raise error.ImplementationError(self, 'store', message='User forgot to implement this method')
 
+def chunks(source, offset, minimum=1, maximum=0x10000):
+    '''Yield the contents of the provider ``source`` starting at ``offset`` in chunks that grow up to ``maximum`` bytes.
+
+    If the provider refuses to return a chunk, then its size is halved until
+    it is smaller than ``minimum``. Iteration stops when the provider refuses
+    or returns less than what was requested. The position of the provider is
+    left wherever the last chunk was read from.
+
+    If the provider is reading memory without any boundaries, then a chunk
+    will never cross a page so that nothing is read from a page that the
+    caller would not have read from if it consumed one element at a time.
+    '''
+    pagesize = 0x1000 if isinstance(source, memorybase) and not isinstance(source, bounded) else 0
+    amount = max(minimum, min(0x100, maximum))
+    while amount >= minimum:
+        size = max(minimum, min(amount, pagesize - offset % pagesize)) if pagesize else amount
+        source.seek(offset)
+        try:
+            data = source.consume(size)
+
+        # if the provider couldn't give us the data, then try again with less
+        except error.ProviderError:
+            amount //= 2
+            continue
+
+        if data:
+            yield data
+        if len(data) < size:
+            break
+        offset, amount = offset + len(data), min(2 * amount, maximum)
+    return
+
+def release(source, offset):
+    '''Discard anything that the sequential provider ``source`` has cached before ``offset``.
+
+    The cache of a ``stream`` can't be emptied entirely, so the caller should
+    release up to the beginning of whatever was last read from it. Any other
+    kind of provider is left untouched.
+    '''
+    if isinstance(source, stream) and source.data_ofs < offset < source.data_ofs + len(source.data):
+        source.remove(offset - source.data_ofs)
+    return
+
 class memorybase(base):
     '''Base provider class for reading/writing with a memory-type backing. Intended to be inherited from.'''
 
@@ -942,6 +1000,279 @@ class iterable(stream):
         Log.info("iter._write : Tried to write {:+x} bytes to an iterator".format(len(data)))
         return len(data)
 
+class cached(bounded):
+    """Provider that caches the data read from a bounded provider as page-aligned blocks.
+
+    Reads are satisfied from blocks that are already resident, and any missing
+    blocks are read from the backing provider in a single request that includes
+    an additional ``readahead`` number of blocks. The number of resident blocks
+    is bounded by ``limit`` with the least-recently used blocks being evicted
+    first. Storing data is written through to the backing provider and any
+    cached blocks that overlap the written data are invalidated.
+    """
+    def __init__(self, source, blocksize=0x1000, readahead=0, limit=0x400):
+        if not isinstance(source, bounded):
+            raise error.UserError(self, '__init__', message="The backing provider ({!s}) is required to be bounded.".format(source))
+        elif blocksize <= 0 or readahead < 0 or limit <= readahead:
+            raise error.UserError(self, '__init__', message="Invalid parameters were specified for the cache (blocksize={:#x}, readahead={:d}, limit={:d}).".format(blocksize, readahead, limit))
+
+        self.source, self.offset = source, 0
+        self.blocksize, self.readahead, self.limit = blocksize, readahead, limit
+        self.__cache__, self.__size__ = collections.OrderedDict(), None
+        self.reset()
+
+    @property
+    def backing(self):
+        return self.source
+
+    def reset(self):
+        '''Reset the counters that track the usage of the cache.'''
+        self.hits = self.misses = self.evictions = 0
+        self.read = self.written = 0
+
+    def statistics(self):
+        '''Return a dictionary containing the counters that track the usage of the cache.'''
+        return {
+            'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+            'read': self.read, 'written': self.written,
+            'resident': len(self.__cache__), 'bytes': sum(map(len, self.__cache__.values())),
+        }
+
+    def invalidate(self, offset=None, amount=None):
+        '''Discard the cached blocks that overlap with the specified range or all of them if one was not given.'''
+        cache, size = self.__cache__, self.blocksize
+        if offset is None:
+            cache.clear()
+
+        else:
+            left, right = offset // size, (offset + max(1, amount or 0) - 1) // size
+            [cache.pop(index) for index in range(left, right + 1) if index in cache]
+        self.__size__ = None
+
+    def size(self):
+        if self.__size__ is None:
+            self.__size__ = self.source.size()
+        return self.__size__
+
+    def seek(self, offset):
+        '''Seek to the specified ``offset``. Returns the last offset before it was modified.'''
+        res, self.offset = self.offset, offset
+        return res
+
+    def __fetch__(self, left, right):
+        '''Read the blocks from ``left`` to ``right`` from the backing provider, add them to the cache, and return them.'''
+        cache, size = self.__cache__, self.blocksize
+
+        # Clamp the number of blocks that we read ahead to the size of
+        # the backing provider so that we don't read past its end.
+        total = self.size()
+        right = min(right + self.readahead, (total + size - 1) // size)
+        offset, amount = left * size, min(right * size, total) - left * size
+
+        self.source.seek(offset)
+        data = self.source.consume(amount)
+        self.read, self.misses = self.read + len(data), self.misses + 1
+
+        # Slice the data that was read into the blocks that we will cache, and
+        # then evict any of the least-recently used ones that are over our limit.
+        result = []
+        for index, position in enumerate(range(0, len(data), size)):
+            block = cache[left + index] = builtins.bytes(data[position : position + size])
+            cache.move_to_end(left + index)
+            result.append(block)
+
+        while len(cache) > self.limit:
+            cache.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    @utils.mapexception(any=error.ProviderError, ignored=(error.ConsumeError, error.UserError))
+    def consume(self, amount):
+        '''Consume ``amount`` bytes from the provider.'''
+        offset, total = self.offset, self.size()
+        if amount < 0:
+            raise error.UserError(self, 'consume', message="tried to consume a negative number of bytes ({:x}:{:+x}) from {!s}".format(offset, amount, self))
+        elif amount == 0:
+            return b''
+        elif not(0 <= offset < total):
+            raise error.ConsumeError(self, offset, amount, 0)
+
+        # Figure out the blocks that we need, and then fetch each contiguous
+        # range of them that are missing from the cache with a single read.
+        cache, size = self.__cache__, self.blocksize
+        right = min(offset + amount, total)
+        first, last = offset // size, (right - 1) // size
+
+        index, blocks = first, []
+        while index <= last:
+            if index in cache:
+                cache.move_to_end(index)
+                blocks.append(cache[index])
+                self.hits, index = self.hits + 1, index + 1
+                continue
+
+            # If the backing provider gave us less than we asked for, then
+            # we stop here and return only what was available.
+            stop = next((item for item in range(index, last + 1) if item in cache), last + 1)
+            fetched = self.__fetch__(index, stop)[:stop - index]
+            blocks.extend(fetched)
+            if not fetched or len(fetched) < stop - index or len(fetched[-1]) < size:
+                break
+            index = stop
+
+        # Now we can just join the blocks together and trim the result.
+        data = blocks[0] if len(blocks) == 1 else builtins.bytes().join(blocks)
+        result = data[offset - first * size : right - first * size]
+        if not result:
+            raise error.ConsumeError(self, offset, amount, 0)
+
+        # If we were unable to read everything, then we leave the offset alone.
+        if len(result) == amount:
+            self.offset += amount
+        return result
+
+    @utils.mapexception(any=error.ProviderError, ignored=(error.StoreError,))
+    def store(self, data):
+        '''Store ``data`` at the current offset. Returns the number of bytes successfully written.'''
+        offset = self.offset
+
+        # Write the data directly through to the backing provider, and then
+        # invalidate any of the blocks that have been made stale.
+        self.source.seek(offset)
+        try:
+            result = self.source.store(data)
+        finally:
+            self.invalidate(offset, len(data))
+        self.offset, self.written = offset + result, self.written + result
+        return result
+
+    def close(self):
+        self.invalidate()
+        return self.source.close() if hasattr(self.source, 'close') else None
+
+    def __repr__(self):
+        '''x.__repr__() <=> repr(x)'''
+        return "{:s} -> {!r}".format(super(cached, self).__repr__(), self.source)
+
+class mapped(memorybase, bounded):
+    """Provider that presents the contents of another provider at the addresses they are mapped to.
+
+    Each region is a tuple of ``(address, size, offset, length)`` that maps
+    ``length`` bytes from ``offset`` of the backing provider to ``address``.
+    Whatever remains of the region's ``size`` is filled with zeroes, and any
+    address that is not within a region is treated as unmapped. If a region
+    overlaps the one that follows it, then it is truncated at the address of
+    the following region. Storing data is written through to the backing
+    provider and is only permitted within the part of a region that is backed.
+    """
+    def __init__(self, source, regions):
+        self.source, self.offset = source, 0
+
+        # Sort the regions by their address and truncate any that overlap so
+        # that we can use bisection to find the region for a given address.
+        items = sorted((address, size, offset, length) for address, size, offset, length in regions if size > 0)
+        self.regions = []
+        for index, (address, size, offset, length) in enumerate(items):
+            limit = items[index + 1][0] - address if index + 1 < len(items) else size
+            self.regions.append((address, min(size, limit), offset, max(0, min(length, size, limit))))
+        self.__addresses__ = [address for address, _, _, _ in self.regions]
+
+    @property
+    def backing(self):
+        return self.source
+
+    def size(self):
+        return max([address + size for address, size, _, _ in self.regions] or [0])
+
+    def seek(self, offset):
+        '''Seek to the specified ``offset``. Returns the last offset before it was modified.'''
+        res, self.offset = self.offset, offset
+        return res
+
+    def region(self, address):
+        '''Return the ``(address, size, offset, length)`` of the region containing the specified ``address`` or None if it is unmapped.'''
+        index = bisect.bisect_right(self.__addresses__, address) - 1
+        if index < 0:
+            return None
+        res = self.regions[index]
+        start, size, _, _ = res
+        return res if start <= address < start + size else None
+
+    def __traverse__(self, left, right):
+        '''Yield the ``(address, amount, offset)`` of each contiguous piece from ``left`` to ``right`` where the offset is None if it is zero-filled.'''
+        address = left
+        while address < right:
+            res = self.region(address)
+            if res is None:
+                break
+            start, size, offset, length = res
+            delta, stop = address - start, min(right, start + size)
+            if delta < length:
+                amount = min(stop, start + length) - address
+                yield address, amount, offset + delta
+            else:
+                amount = stop - address
+                yield address, amount, None
+            address += amount
+        return
+
+    @utils.mapexception(any=error.ProviderError, ignored=(error.ConsumeError, error.UserError))
+    def consume(self, amount):
+        '''Consume ``amount`` bytes from the provider.'''
+        offset = self.offset
+        if amount < 0:
+            raise error.UserError(self, 'consume', message="tried to consume a negative number of bytes ({:x}:{:+x}) from {!s}".format(offset, amount, self))
+        elif amount == 0:
+            return b''
+
+        # Gather each piece that is mapped, and stop at the first one that
+        # is unmapped or the backing provider was unable to give us.
+        result = []
+        for _, size, position in self.__traverse__(offset, offset + amount):
+            if position is None:
+                result.append(b'\0' * size)
+                continue
+
+            self.source.seek(position)
+            try:
+                data = self.source.consume(size)
+            except error.ConsumeError:
+                break
+            result.append(data)
+            if len(data) < size:
+                break
+
+        data = builtins.bytes().join(result)
+        if not data:
+            raise error.ConsumeError(self, offset, amount, 0)
+
+        # If we were unable to read everything, then we leave the offset alone.
+        if len(data) == amount:
+            self.offset += amount
+        return data
+
+    @utils.mapexception(any=error.ProviderError, ignored=(error.StoreError,))
+    def store(self, data):
+        '''Store ``data`` at the current offset. Returns the number of bytes successfully written.'''
+        offset, result = self.offset, 0
+        for _, size, position in self.__traverse__(offset, offset + len(data)):
+            if position is None:
+                break
+            self.source.seek(position)
+            written = self.source.store(data[result : result + size])
+            result += written
+            if written < size:
+                break
+
+        if len(data) and not result:
+            raise error.StoreError(self, offset, len(data), 0)
+        self.offset += result
+        return result
+
+    def __repr__(self):
+        '''x.__repr__() <=> repr(x)'''
+        return "{:s} -> {!r}".format(super(mapped, self).__repr__(), self.source)
+
 class posixfile(fileobj):
     '''Basic posix file provider.'''
     def __init__(self, *args, **kwds):
@@ -1060,6 +1391,91 @@ try:
 except ImportError:
     Log.info("{:s} : Unable to import the 'tempfile' module. Failed to define the `filecopy` provider.".format(__name__))
 
+try:
+    import mmap as __mmap__
+
+    class mmap(backed):
+        """A provider that memory-maps the specified file and returns memoryviews of the mapping when consumed.
+
+        As the data returned by .consume is a slice of the mapping, no copy is made until a leaf type stores it as its value.
+        The mode can be 'r' for read-only, 'rw' for writing directly to the file, or 'c' for copy-on-write.
+        """
+        def __init__(self, filename, mode='r'):
+            self.file, self.map, self.mode = None, None, mode
+            view = self.open(filename, mode)
+            super(mmap, self).__init__(0, view)
+
+        @utils.mapexception(any=error.ProviderError, ignored=(ValueError,))
+        def open(self, filename, mode='r'):
+            usermode = {item.lower() for item in mode} - {'b'}
+            if 'c' in usermode:
+                access, fmode, straccess = __mmap__.ACCESS_COPY, 'rb', 'copy-on-write'
+            elif usermode & {'w', '+'}:
+                access, fmode, straccess = __mmap__.ACCESS_WRITE, 'r+b', 'read/write'
+            elif 'r' in usermode:
+                access, fmode, straccess = __mmap__.ACCESS_READ, 'rb', 'read-only'
+            else:
+                raise ValueError("invalid mode: {!r}".format(mode))
+
+            Log.info("{:s}({!r}, {!r}) : Mapping file for {:s}".format(type(self).__name__, filename, mode, straccess))
+            self.file = builtins.open(filename, fmode, 0)
+
+            # A file that is empty can't be mapped, so we use an empty view for it.
+            if not os.fstat(self.file.fileno()).st_size:
+                self.map = None
+                return builtins.memoryview(b'' if access == __mmap__.ACCESS_READ else bytearray())
+
+            self.map = __mmap__.mmap(self.file.fileno(), 0, access=access)
+            return builtins.memoryview(self.map)
+
+        @property
+        def value(self):
+            return self.backing.tobytes()
+
+        def readonlyQ(self):
+            '''Return whether the mapping was opened as read-only.'''
+            return self.backing.readonly
+
+        @utils.mapexception(any=error.ProviderError, ignored=(error.StoreError,))
+        def store(self, data):
+            '''Store ``data`` at the current offset. Returns the number of bytes successfully written.'''
+            left, right = self.offset, self.offset + len(data)
+            if self.backing.readonly or right > self.size():
+                raise error.StoreError(self, left, len(data))
+
+            self.backing[left : right] = data
+            self.seek(right)
+            return len(data)
+
+        @utils.mapexception(any=error.ProviderError)
+        def flush(self):
+            '''Flush any modifications back to the file if it was opened for writing.'''
+            if self.map is not None and not self.backing.readonly and 'c' not in self.mode:
+                self.map.flush()
+            return
+
+        @utils.mapexception(any=error.ProviderError)
+        def close(self):
+            # If a memoryview that we've returned is still referenced, then the
+            # map can't be closed and so we leave it for the garbage collector.
+            try:
+                self.backing.release()
+                self.map is None or self.map.close()
+            except BufferError:
+                Log.info("{:s}.close : Unable to close the mapping for {!r} due to it still being referenced.".format(type(self).__name__, self.file))
+            return self.file.close()
+
+        def __repr__(self):
+            '''x.__repr__() <=> repr(x)'''
+            return "{:s} -> {!r}".format(super(mmap, self).__repr__(), self.file)
+
+        def __del__(self):
+            try: self.close()
+            except Exception: pass
+
+except ImportError:
+    Log.info("{:s} : Unable to import the 'mmap' module. Failed to define the `mmap` provider.".format(__name__))
+
 ## platform-specific providers
 DEFAULT = []
 try:
@@ -1094,8 +1510,219 @@ try:
             '''x.__repr__() <=> repr(x)'''
             return "{:s} -> pid:{:#x} ({:d})".format(super(memorybase, self).__repr__(), self._pid, self._pid)
 
+    try:
+        import ctypes
+
+        class LINUX(object):
+            '''Namespace containing the system calls and types used for accessing the memory of another process.'''
+            class iovec(ctypes.Structure):
+                _fields_ = [('iov_base', ctypes.c_void_p), ('iov_len', ctypes.c_size_t)]
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            IOV_MAX = 0x400
+
+            process_vm_readv = libc.process_vm_readv
+            process_vm_readv.restype = ctypes.c_ssize_t
+            process_vm_readv.argtypes = [ctypes.c_int, ctypes.POINTER(iovec), ctypes.c_ulong, ctypes.POINTER(iovec), ctypes.c_ulong, ctypes.c_ulong]
+
+            process_vm_writev = libc.process_vm_writev
+            process_vm_writev.restype = ctypes.c_ssize_t
+            process_vm_writev.argtypes = [ctypes.c_int, ctypes.POINTER(iovec), ctypes.c_ulong, ctypes.POINTER(iovec), ctypes.c_ulong, ctypes.c_ulong]
+
+        class LinuxProcess(memorybase):
+            """Provider that reads and writes the memory of a linux process using scatter-gather requests.
+
+            The regions of the process are parsed from "/proc/<pid>/maps", and
+            any address that is not within one of them (or that could not be
+            read) is zero-filled if ``fill`` is true. Otherwise, the read stops
+            at that address. Reads are cached as pages with the missing pages
+            being gathered into as few ``process_vm_readv`` requests as
+            possible. As the process is still running, both the pages and the
+            regions expire after ``lifetime`` seconds, and the number of pages
+            is bounded by ``limit``. Storing data invalidates any of the pages
+            that were written to.
+            """
+            def __init__(self, pid, fill=False, pagesize=None, limit=0x100, lifetime=0.25):
+                self._pid, self.fill, self.limit, self.lifetime = pid, fill, limit, lifetime
+                self.pagesize = pagesize or os.sysconf('SC_PAGE_SIZE')
+                self.offset, self.__cache__, self.__maps__ = 0, collections.OrderedDict(), None
+
+            @staticmethod
+            def _open(pid, path="/proc/{:d}/maps"):
+                return open(path.format(pid), 'rt')
+
+            def refresh(self):
+                '''Parse the regions from the "maps" of the process and return them.'''
+                result = []
+                with self._open(self._pid) as infile:
+                    for line in infile:
+                        items = line.split(None, 5)
+                        start, stop = (int(item, 16) for item in items[0].split('-', 1))
+                        path = items[5].strip() if len(items) > 5 else ''
+                        result.append((start, stop, items[1], int(items[2], 16), path))
+                    pass
+                self.__maps__ = time.time(), [start for start, _, _, _, _ in result], result
+                return result
+
+            def maps(self):
+                '''Return a list of each ``(start, stop, permissions, offset, path)`` that is mapped within the process.'''
+                if self.__maps__ is None or time.time() - self.__maps__[0] > self.lifetime:
+                    return self.refresh()
+                _, _, result = self.__maps__
+                return result
+
+            def region(self, address):
+                '''Return the ``(start, stop, permissions, offset, path)`` of the region containing the specified ``address`` or None if it is unmapped.'''
+                regions = self.maps()
+                _, starts, _ = self.__maps__
+                index = bisect.bisect_right(starts, address) - 1
+                if index < 0:
+                    return None
+                res = regions[index]
+                start, stop, _, _, _ = res
+                return res if start <= address < stop else None
+
+            def invalidate(self, offset=None, amount=None):
+                '''Discard the cached pages that overlap with the specified range or all of them (and the regions) if one was not given.'''
+                cache, size = self.__cache__, self.pagesize
+                if offset is None:
+                    cache.clear()
+                    self.__maps__ = None
+
+                else:
+                    left, right = offset // size, (offset + max(1, amount or 0) - 1) // size
+                    [cache.pop(index) for index in range(left, right + 1) if index in cache]
+                return
+
+            def seek(self, offset):
+                '''Seek to the specified ``offset``. Returns the last offset before it was modified.'''
+                res, self.offset = self.offset, offset
+                return res
+
+            def __readv__(self, runs):
+                '''Read each ``(page, count)`` in ``runs`` using as few requests as possible and return a dictionary of the pages that were read.'''
+                result, size, pending = {}, self.pagesize, [(page, count) for page, count in runs]
+                while pending:
+                    batch = pending[:LINUX.IOV_MAX]
+                    total = sum(count for _, count in batch) * size
+                    buffer = ctypes.create_string_buffer(total)
+                    local = LINUX.iovec(ctypes.cast(buffer, ctypes.c_void_p), total)
+                    remote = (LINUX.iovec * len(batch))(*((page * size, count * size) for page, count in batch))
+
+                    res = LINUX.process_vm_readv(self._pid, ctypes.byref(local), 1, remote, len(batch), 0)
+                    if res < 0:
+                        code = ctypes.get_errno()
+                        if code != errno.EFAULT:
+                            raise OSError(code, os.strerror(code))
+                        res = 0
+
+                    # Slice out each complete page that was read, and then skip
+                    # the page that we stopped at before reading whatever is left.
+                    data, position, pending = buffer.raw, 0, pending[len(batch):]
+                    for index, (page, count) in enumerate(batch):
+                        available = min(count, (res - position) // size)
+                        for item in range(available):
+                            result[page + item] = data[position + item * size : position + (item + 1) * size]
+                        position += count * size
+                        if available < count:
+                            following = [(page + available + 1, count - available - 1)] if available + 1 < count else []
+                            pending[0:0] = following + batch[index + 1:]
+                            break
+                        continue
+                    continue
+                return result
+
+            @utils.mapexception(any=error.ProviderError, ignored=(error.ConsumeError, error.UserError))
+            def consume(self, amount):
+                '''Consume ``amount`` bytes from the provider.'''
+                offset = self.offset
+                if amount < 0:
+                    raise error.UserError(self, 'consume', message="tried to consume a negative number of bytes ({:x}:{:+x}) from {!s}".format(offset, amount, self))
+                elif amount == 0:
+                    return b''
+
+                # Figure out which pages are missing from the cache (or have
+                # expired) and which of them are actually mapped by the process.
+                cache, size, now = self.__cache__, self.pagesize, time.time()
+                first, last = offset // size, (offset + amount - 1) // size
+                missing = []
+                for index in range(first, last + 1):
+                    if index in cache and now - cache[index][0] <= self.lifetime:
+                        cache.move_to_end(index)
+                    elif self.region(index * size) is not None:
+                        missing.append(index)
+                    elif not self.fill:
+                        break
+                    continue
+
+                # Coalesce the missing pages into contiguous runs so that each
+                # one is a single element of a scatter-gather request.
+                runs = []
+                for index in missing:
+                    if runs and runs[-1][0] + runs[-1][1] == index:
+                        runs[-1] = runs[-1][0], runs[-1][1] + 1
+                    else:
+                        runs.append((index, 1))
+                    continue
+
+                for index, page in self.__readv__(runs).items():
+                    cache[index] = now, page
+                    cache.move_to_end(index)
+
+                # Now we can collect each page, stopping or zero-filling if we
+                # encounter one that was unmapped or unable to be read.
+                blocks = []
+                for index in range(first, last + 1):
+                    if index in cache and now - cache[index][0] <= self.lifetime:
+                        blocks.append(cache[index][1])
+                    elif self.fill:
+                        blocks.append(b'\0' * size)
+                    else:
+                        break
+                    continue
+
+                while len(cache) > self.limit:
+                    cache.popitem(last=False)
+
+                data = builtins.bytes().join(blocks)
+                result = data[offset - first * size : offset - first * size + amount]
+                if not result:
+                    raise error.ConsumeError(self, offset, amount, 0)
+
+                # If we were unable to read everything, then we leave the offset alone.
+                if len(result) == amount:
+                    self.offset += amount
+                return result
+
+            @utils.mapexception(any=error.ProviderError, ignored=(error.StoreError,))
+            def store(self, data):
+                '''Store ``data`` at the current offset. Returns the number of bytes successfully written.'''
+                offset = self.offset
+                buffer = ctypes.create_string_buffer(builtins.bytes(data), len(data))
+                local = LINUX.iovec(ctypes.cast(buffer, ctypes.c_void_p), len(data))
+                remote = LINUX.iovec(offset, len(data))
+                try:
+                    res = LINUX.process_vm_writev(self._pid, ctypes.byref(local), 1, ctypes.byref(remote), 1, 0)
+                finally:
+                    self.invalidate(offset, len(data))
+
+                if len(data) and res <= 0:
+                    raise error.StoreError(self, offset, len(data), 0)
+                self.offset += res
+                return res
+
+            def close(self):
+                self.invalidate()
+
+            def __repr__(self):
+                '''x.__repr__() <=> repr(x)'''
+                return "{:s} -> pid:{:#x} ({:d})".format(super(memorybase, self).__repr__(), self._pid, self._pid)
+
+    except (ImportError, AttributeError):
+        Log.info("{:s} : Unable to import the 'ctypes' module or locate the `process_vm_readv` system call. Failed to define the `LinuxProcess` provider.".format(__name__))
+
 except OSError:
-    Log.info("{:s} : Skipping defining any linux-based providers (`LinuxProcessId`) due to being on a non-linux platform ({:s}).".format(__name__, sys.platform))
+    Log.info("{:s} : Skipping defining any linux-based providers (`LinuxProcessId`, `LinuxProcess`) due to being on a non-linux platform ({:s}).".format(__name__, sys.platform))
 
 ### Windows Native APIs
 try:
@@ -2308,6 +2935,227 @@ if __name__ == '__main__':
                 raise Success
         return
 
+    @TestCase
+    def test_cached_read():
+        data = bytes(bytearray(range(0x100))) * 0x10
+        z = provider.cached(provider.bytes(data), blocksize=0x100, readahead=1)
+        z.seek(0xfe)
+        a = z.consume(4)
+        z.seek(0x210)
+        b = z.consume(0x10)
+        if a == data[0xfe : 0x102] and b == data[0x210 : 0x220] and z.misses == 1 and z.hits == 1:
+            raise Success
+
+    @TestCase
+    def test_cached_readedge():
+        data = b'A' * 0x180
+        z = provider.cached(provider.bytes(data), blocksize=0x100)
+        z.seek(0x170)
+        a = z.consume(0x20)
+        if a == b'A' * 0x10 and z.offset == 0x170:
+            raise Success
+
+    @TestCase
+    def test_cached_readoob():
+        data = b'A' * 0x180
+        z = provider.cached(provider.bytes(data), blocksize=0x100)
+        z.seek(0x180)
+        try:
+            z.consume(1)
+        except error.ConsumeError:
+            raise Success
+
+    @TestCase
+    def test_cached_evict():
+        data = b'A' * 0x1000
+        z = provider.cached(provider.bytes(data), blocksize=0x100, limit=2)
+        for offset in range(0, 0x1000, 0x100):
+            z.seek(offset)
+            z.consume(1)
+        res = z.statistics()
+        if res['resident'] == 2 and res['evictions'] == 0xe and res['misses'] == 0x10:
+            raise Success
+
+    @TestCase
+    def test_cached_writethrough():
+        data = bytearray(b'A' * 0x200)
+        z = provider.cached(provider.bytes(data), blocksize=0x100)
+        z.seek(0xf0)
+        a = z.consume(0x20)
+        z.seek(0xf8)
+        z.store(b'B' * 0x10)
+        z.seek(0xf0)
+        b = z.consume(0x20)
+        if a == b'A' * 0x20 and b == b'A' * 8 + b'B' * 0x10 + b'A' * 8 and bytes(data[0xf8 : 0x108]) == b'B' * 0x10:
+            raise Success
+
+    @TestCase
+    def test_cached_load_container():
+        class t(parray.type):
+            _object_ = pint.uint32_t
+            length = 0x40
+
+        data = b'AAAA' * 0x40
+        z = provider.cached(provider.bytes(data), blocksize=0x10)
+        res = t(source=z).l
+        if res.serialize() == data and z.misses == 1:
+            raise Success
+
+    @TestCase
+    def test_chunks_memory_page():
+        class memory(provider.memorybase):
+            def __init__(self, data):
+                self.data, self.offset, self.reads = data, 0, []
+            def seek(self, offset):
+                res, self.offset = self.offset, offset
+                return res
+            def consume(self, amount):
+                self.reads.append((self.offset, amount))
+                res = self.data[self.offset : self.offset + amount]
+                self.offset += len(res)
+                return res
+            def store(self, data):
+                raise ptypes.error.StoreError(self, self.offset, len(data))
+
+        z = memory(b'A' * 0x3000)
+        res = b''.join(provider.chunks(z, 0xf80))
+        if res == z.data[0xf80:] and all(offset // 0x1000 == (offset + amount - 1) // 0x1000 for offset, amount in z.reads):
+            raise Success
+
+    @TestCase
+    def test_chunks_bounded():
+        z = provider.bytes(b'A' * 0x3000)
+        res = [len(chunk) for chunk in provider.chunks(z, 0xf80)]
+        if sum(res) == 0x2080 and res[:3] == [0x100, 0x200, 0x400]:
+            raise Success
+
+    @TestCase
+    def test_mapped_read():
+        data = bytes(bytearray(range(0x100)))
+        z = provider.mapped(provider.bytes(data), [(0x1000, 0x20, 0x10, 0x20), (0x1020, 0x20, 0x80, 0x20)])
+        z.seek(0x1018)
+        res = z.consume(0x10)
+        if res == data[0x28 : 0x30] + data[0x80 : 0x88] and z.offset == 0x1028:
+            raise Success
+
+    @TestCase
+    def test_mapped_zerofill():
+        data = bytes(bytearray(range(0x100)))
+        z = provider.mapped(provider.bytes(data), [(0x1000, 0x20, 0x10, 0x8)])
+        z.seek(0x1004)
+        res = z.consume(0x8)
+        if res == data[0x14 : 0x18] + b'\0' * 4:
+            raise Success
+
+    @TestCase
+    def test_mapped_unmapped():
+        data = bytes(bytearray(range(0x100)))
+        z = provider.mapped(provider.bytes(data), [(0x1000, 0x10, 0, 0x10), (0x1020, 0x10, 0x20, 0x10)])
+        z.seek(0x1008)
+        res = z.consume(0x10)
+        z.seek(0x1010)
+        try:
+            z.consume(1)
+        except error.ConsumeError:
+            if res == data[0x8 : 0x10] and z.offset == 0x1010:
+                raise Success
+
+    @TestCase
+    def test_mapped_store():
+        data = bytearray(b'A' * 0x20)
+        z = provider.mapped(provider.bytes(data), [(0x1000, 0x20, 0x10, 0x8)])
+        z.seek(0x1004)
+        res = z.store(b'B' * 0x8)
+        if res == 4 and bytes(data) == b'A' * 0x14 + b'B' * 4 + b'A' * 8:
+            raise Success
+
+    @TestCase
+    def test_mapped_load_container():
+        class t(parray.type):
+            _object_ = pint.uint32_t
+            length = 4
+
+        data = b'AAAABBBB'
+        z = provider.mapped(provider.bytes(data), [(0x100, 0x8, 0, 4), (0x108, 0x8, 4, 4)])
+        res = t(source=z, offset=0x100).l
+        if res.serialize() == b'AAAA\0\0\0\0BBBB\0\0\0\0':
+            raise Success
+
+    @TestCase
+    def test_mmap_readonly():
+        data = b'A'*512
+        with temporaryname() as filename:
+            with open(filename, 'wb') as f:
+                f.write(data)
+
+            z = provider.mmap(filename, mode='r')
+            try:
+                a = z.consume(len(data))
+                assert isinstance(a, memoryview) and a == data
+                z.seek(0)
+                z.store(b'B')
+            except error.StoreError:
+                raise Success
+            finally:
+                del(a)
+                z.close()
+        raise Failure
+
+    @TestCase
+    def test_mmap_copyonwrite():
+        data = b'A'*512
+        with temporaryname() as filename:
+            with open(filename, 'wb') as f:
+                f.write(data)
+
+            z = provider.mmap(filename, mode='c')
+            z.seek(0x10)
+            z.store(b'B' * 0x10)
+            z.seek(0)
+            a = bytes(z.consume(len(data)))
+            z.close()
+
+            with open(filename, 'rb') as f:
+                original = f.read()
+            if a.count(b'B') == 0x10 and original == data:
+                raise Success
+        return
+
+    @TestCase
+    def test_mmap_readwrite():
+        data = b'A'*512
+        with temporaryname() as filename:
+            with open(filename, 'wb') as f:
+                f.write(data)
+
+            z = provider.mmap(filename, mode='rw')
+            z.seek(0x10)
+            z.store(b'B' * 0x10)
+            z.close()
+
+            with open(filename, 'rb') as f:
+                modified = f.read()
+            if modified.count(b'B') == 0x10 and len(modified) == len(data):
+                raise Success
+        return
+
+    @TestCase
+    def test_mmap_load_container():
+        class t(parray.type):
+            _object_ = pint.uint32_t
+            length = 4
+
+        with temporaryname() as filename:
+            with open(filename, 'wb') as f:
+                f.write(b'AAAABBBBCCCCDDDD')
+
+            z = provider.mmap(filename)
+            res = t(source=z).l
+            z.close()
+            if all(isinstance(item.value, bytes) for item in res) and res[2].serialize() == b'CCCC':
+                raise Success
+        return
+
     try:
         import ctypes
         @TestCase
@@ -2345,6 +3193,52 @@ if __name__ == '__main__':
             if z.consume(len(data)) == b'B'*len(data):
                 raise Success
 
+        if hasattr(provider, 'LinuxProcess'):
+            @TestCase
+            def test_linuxprocess_read():
+                data = b'A'*0x40
+                buf = ctypes.c_buffer(data)
+                ea = ctypes.addressof(buf)
+                z = provider.LinuxProcess(os.getpid())
+                z.seek(ea)
+                if z.consume(len(data)) == data:
+                    raise Success
+                raise Failure
+
+            @TestCase
+            def test_linuxprocess_unmapped():
+                z = provider.LinuxProcess(os.getpid())
+                z.seek(0)
+                try:
+                    z.consume(0x10)
+                except error.ConsumeError:
+                    raise Success
+                raise Failure
+
+            @TestCase
+            def test_linuxprocess_zerofill():
+                z = provider.LinuxProcess(os.getpid(), fill=True)
+                z.seek(0)
+                if z.consume(0x10) == b'\0'*0x10:
+                    raise Success
+                raise Failure
+
+            @TestCase
+            def test_linuxprocess_readwrite():
+                data = b'A'*0x40
+                buf = ctypes.c_buffer(data)
+                ea = ctypes.addressof(buf)
+                z = provider.LinuxProcess(os.getpid())
+                z.seek(ea)
+                if z.consume(len(data)) != data:
+                    raise Failure
+                z.seek(ea)
+                z.store(b'B'*len(data))
+                z.seek(ea)
+                if z.consume(len(data)) == b'B'*len(data) and buf.value == b'B'*len(data):
+                    raise Success
+                raise Failure
+
     except ImportError:
         Log.warning("{:s} : Skipping the `memory` provider tests.".format(__name__))
         pass
@@ -401,7 +401,7 @@ class string(ptype.type):
     def __deserialize_block__(self, block):
         if len(block) != self.blocksize():
             raise error.ConsumeError(self, self.getoffset(), self.blocksize(), amount=len(block))
-        self.value = block
+        self.value = bytes(block)
         return self
 
     def serialize(self):
@@ -489,7 +489,40 @@ class szstring(string):
 
         return self.load(offset=0, source=provider.proxy(result))
 
+    def __terminator_originalQ__(self):
+        '''Return whether the instance is terminated by the null character and can be scanned for it in bulk.'''
+        cls = self.__class__
+        if not issubclass(self._object_, _char_t):
+            return False
+        methods = ['isTerminator', '__deserialize_stream__', '__append__']
+        return all(utils.callable_eq(self, getattr(self, name), cls, getattr(cls, name)) and utils.callable_eq(cls, getattr(cls, name), szstring, getattr(szstring, name)) for name in methods)
+
+    def __terminator__(self, chunks):
+        '''Return the data up to and including the first null character aligned to a character from the iterable ``chunks``, or None if it was not found.'''
+        null, _ = self.encoding.encode('\0')
+        data, start = bytearray(), 0
+        for chunk in chunks:
+            data += chunk
+
+            # scan for the null character skipping over any that are unaligned
+            index = data.find(null, start)
+            while index >= 0 and index % len(null):
+                index = data.find(null, index + 1)
+
+            if index >= 0:
+                return bytes(data[:index + len(null)])
+            start = len(data) - len(data) % len(null)
+        return None
+
     def __deserialize_block__(self, block):
+        if self.__terminator_originalQ__():
+            view = memoryview(block)
+            iterable = (view[offset : offset + 0x1000].tobytes() for offset in range(0, len(view), 0x1000))
+            data = self.__terminator__(iterable)
+            if data is not None:
+                self.value = data
+                return self
+
         data = bytearray(block)
         stream = (bytes(data[idx : idx + 1]) for idx, _ in enumerate(data))
         return self.__deserialize_stream__(stream)
@@ -497,6 +530,17 @@ class szstring(string):
     def load(self, **attrs):
         with utils.assign(self, **attrs):
             offset = self.getoffset()
+
+            # if we're terminated by a null character, then read the source
+            # in chunks until we find it. otherwise, we fall back to reading
+            # one character at a time.
+            null, _ = self.encoding.encode('\0')
+            data = self.__terminator__(provider.chunks(self.source, offset, len(null))) if self.__terminator_originalQ__() else None
+            if data is not None:
+                self.value = data
+                self.source.seek(offset + len(data))
+                return self
+
             self.source.seek(offset)
             try:
                 producer = (self.source.consume(1) for byte in itertools.count())
@@ -998,6 +1042,36 @@ if __name__ == '__main__':
         if "{:#s}".format(self) == r'\U30B3\U30FC\U30C9'.lower():
             raise Success
 
+    @TestCase
+    def test_str_szstring_chunked():
+        data = b'A' * 0x1234 + b'\0' + b'B' * 0x10
+        x = pstr.szstring(source=provider.bytes(data)).l
+        if x.size() == 0x1235 and x.str() == 'A' * 0x1234 and x.source.offset == 0x1235:
+            raise Success
+
+    @TestCase
+    def test_str_szstring_unterminated():
+        x = pstr.szstring(source=provider.bytes(b'A' * 0x123))
+        try:
+            x.l
+        except ptypes.error.LoadError:
+            raise Success
+
+    @TestCase
+    def test_str_szwstring_unaligned():
+        data = b'\x41\x00\x00\x42\x43\x00\x00\x00\x44\x00'
+        x = pstr.szwstring(source=provider.bytes(data)).l
+        if x.size() == 8 and x.str() == u'A䈀C':
+            raise Success
+
+    @TestCase
+    def test_str_szwstring_unaligned_block():
+        data = b'\x41\x00\x00\x42\x43\x00\x00\x00\x44\x00'
+        x = pstr.szwstring().load(source=provider.bytes(data))
+        y = pstr.szwstring().__deserialize_block__(data)
+        if x.serialize() == y.serialize() == data[:8]:
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
@@ -45,8 +45,8 @@ Example usage:
     # remove an alias
     instance.unalias('alternative-name')
 """
-import functools, itertools
-from . import ptype, utils, pbinary, error
+import functools, itertools, bisect, weakref, struct as _struct
+from . import ptype, pint, parray, bitmap, utils, pbinary, error
 
 __all__ = ['type', 'make']
 
@@ -56,7 +56,93 @@ Log = config.logging.getLogger('.'.join([Config.log.name, 'pstruct']))
 
 # Setup some version-agnostic types and utilities that we can perform checks with
 __izip_longest__ = utils.izip_longest
-string_types = utils.string_types
+string_types, integer_types = utils.string_types, bitmap.integer_types
+
+# Format characters for the struct module keyed by (signed, size)
+__formats__ = {(False, 1): 'B', (True, 1): 'b', (False, 2): 'H', (True, 2): 'h', (False, 4): 'I', (True, 4): 'i', (False, 8): 'Q', (True, 8): 'q'}
+
+# The sizes of the field types that have been checked for being static
+__staticsizes__ = weakref.WeakKeyDictionary()
+
+class __layout__(object):
+    '''The layout of the fields for a structure that are decoded from a single block.'''
+    def __init__(self, types, names, offsets, sizes, format=None):
+        self.types, self.names, self.offsets, self.sizes = types, names, offsets, sizes
+        self.size = sum(sizes)
+
+        # the index for each field keyed by its lowercase name. this is the same
+        # as the fastindex that the structure would've produced when loading.
+        self.index = {}
+        for index, (_, name) in enumerate(types):
+            self.index[name.lower()] = index
+
+        # if every field is a regular integer, then we can decode all of them at once.
+        self.struct = None if format is None else _struct.Struct(format)
+        self.integral = self.struct is not None
+
+    def append(self, type, name, offset, size):
+        '''Add a field of the specified ``type`` and ``size`` to the end of the layout.'''
+        self.types.append((type, name))
+        self.names.append(name), self.offsets.append(offset), self.sizes.append(size)
+        self.size += size
+        return len(self.names) - 1
+
+    def resize(self, index, size):
+        '''Change the size of the field at ``index`` and move the fields that follow it.'''
+        delta, self.sizes[index] = size - self.sizes[index], size
+        for i in range(1 + index, len(self.offsets)):
+            self.offsets[i] += delta
+        self.size += delta
+        self.struct, self.integral = None, False
+
+    def copy(self):
+        return __layout__(self.types[:], self.names[:], self.offsets[:], self.sizes[:])
+
+class __lazy_value__(ptype.__lazy_value__):
+    '''The fields of a structure that are decoded from the block described by its layout.'''
+    def __init__(self, owner, layout, shared=True):
+        super(__lazy_value__, self).__init__(owner, len(layout.names) if shared else 0)
+        self.layout, self.shared = layout, shared
+
+        # fields that need to be loaded if they're accessed before the block is.
+        self.preload = set()
+
+    def __instance__(self, index):
+        item = super(__lazy_value__, self).__instance__(index)
+        if index in self.preload and len(self.block) <= self.__position__(index):
+            item.load()
+        return item
+
+    def rebase(self):
+        if any(slot >= self.count for slot in self.dynamic):
+            return False
+
+        # update the layout with the current size of each dynamic field, making
+        # sure that we don't modify the layout if it's shared with the class.
+        for slot in sorted(self.dynamic):
+            size = list.__getitem__(self, slot).blocksize()
+            if size != self.__length__(slot):
+                self.layout, self.shared = self.layout.copy() if self.shared else self.layout, False
+                self.layout.resize(slot, size)
+            continue
+        return True
+
+    def __stub__(self, index):
+        layout = self.layout
+        return layout.types[index][0], layout.names[index]
+    def __position__(self, index):
+        layout = self.layout
+        return layout.offsets[index] if index < self.count else layout.size
+    def __length__(self, index):
+        return self.layout.sizes[index] if index < self.count else 0
+    def __locate__(self, offset):
+        offsets, sizes = self.layout.offsets, self.layout.sizes
+        index = max(0, bisect.bisect_right(offsets, offset) - 1)
+
+        # skip backwards over any empty fields so that we land on the one with the data.
+        while index > 0 and not sizes[index]:
+            index -= 1
+        return index
 
 class __structure_interface__(ptype.container):
     def __init__(self, *args, **kwds):
@@ -300,8 +386,197 @@ class type(__structure_interface__):
             return res.load()
         return res
 
+    def __integral__(self, item):
+        '''Return the struct format and byteorder for decoding ``item`` if it is a regular integer.'''
+        cls, order = item.__class__, getattr(item, 'byteorder', None)
+        signed = isinstance(item, pint.sinteger_t)
+        getvalue = pint.sinteger_t.__getvalue__ if signed else pint.type.__getvalue__
+        if not isinstance(item, pint.type) or cls.__getvalue__ is not getvalue or cls.get is not pint.type.get:
+            return None
+        elif order not in {config.byteorder.bigendian, config.byteorder.littleendian}:
+            return None
+        res = __formats__.get((signed, item.blocksize()), None)
+        return None if res is None else (res, order)
+
+    def __static__(self, t):
+        '''Return the size and struct format of the field type ``t`` if it is always the same size, otherwise return None.'''
+        if pbinary.istype(t):
+            bits = pbinary.staticbits(t)
+            return None if bits is None else ((bits + 7) // 8, None)
+
+        elif ptype.istype(t) and issubclass(t, pbinary.partial):
+            bits = pbinary.staticbits(t._object_) if utils.callable_eq(t, t.blocksize, pbinary.partial, pbinary.partial.blocksize) else None
+            return None if bits is None else ((bits + 7) // 8, None)
+
+        elif not ptype.istype(t):
+            return None
+
+        # containers are static if their layout is.
+        item = self.new(t)
+        if isinstance(item, type):
+            layout = item.__layout__()
+            return None if layout is None else (layout.size, None)
+
+        elif isinstance(item, parray.type):
+            if not (Config.parray.lazy and item.__blocksize_originalQ__() and isinstance(getattr(t, 'length', None), integer_types)):
+                return None
+            size = item.__lazy_elementsize__(item._object_)
+            return (size * item.length, None) if size > 0 else None
+
+        elif isinstance(item, ptype.container):
+            return None
+
+        # wrappers are static if the type they wrap is.
+        elif isinstance(item, ptype.wrapper_t):
+            res = self.__static__(item._value_) if item.__blocksize_originalQ__() else None
+            return None if res is None else (res[0], None)
+
+        # anything else has to have its length defined as part of its type.
+        cls, pointer = item.__class__, ptype.pointer_t._value_
+        if not (item.__blocksize_originalQ__() or utils.callable_eq(cls, cls.blocksize, pointer, pointer.blocksize)):
+            return None
+        elif not isinstance(getattr(t, 'length', None), integer_types) or getattr(item, 'length', None) != t.length:
+            return None
+        return item.blocksize(), self.__integral__(item)
+
+    def __staticsize__(self, t):
+        '''Return the size of the field type ``t`` if it is always the same, otherwise return None.'''
+        key = Config.pstruct.compiled, Config.parray.lazy
+        try:
+            cached = __staticsizes__.get(t, None)
+        except TypeError:
+            cached = None
+
+        if cached is not None and cached[0] == key:
+            _, size = cached
+            return size
+
+        res = self.__static__(t)
+        size = None if res is None else res[0]
+        try:
+            __staticsizes__[t] = key, size
+        except TypeError:
+            pass
+        return size
+
+    def __compile__(self, fields):
+        '''Compile the specified ``fields`` into a layout if every one of them is a static size.'''
+        names, offsets, sizes, formats, seen, offset = [], [], [], [], set(), 0
+        for index, (t, name) in enumerate(fields):
+            res = self.__static__(t)
+            if res is None:
+                return None
+            size, format = res
+
+            # generate the same name for a duplicate field that loading it would.
+            lowername = name.lower()
+            if lowername in seen:
+                _, name = name, u"{:s}_{:x}".format(name, offset if Config.pstruct.use_offset_on_duplicate else index)
+                Log.warning("type.__compile__ : {:s} : Duplicate element name {!r} required using its generated name {!r}.".format(self.instance(), _, name))
+            seen.add(lowername)
+
+            names.append(name), offsets.append(offset), sizes.append(size), formats.append(format)
+            offset += size
+
+        # if every field is an integer with the same byteorder, then we can use a struct for all of them.
+        orders = {order for _, order in filter(None, formats)}
+        if formats and all(formats) and len(orders) == 1:
+            prefix = '<' if orders == {config.byteorder.littleendian} else '>'
+            return __layout__(list(fields), names, offsets, sizes, prefix + str().join(format for format, _ in formats))
+        return __layout__(list(fields), names, offsets, sizes)
+
+    def __layout__(self):
+        '''Return the compiled layout of the structure if every one of its fields is a static size.'''
+        fields = self._fields_
+        if not (Config.pstruct.compiled and fields and self.__blocksize_originalQ__()):
+            return None
+
+        # if the fields were assigned to the instance, then they need their own layout.
+        cls = self.__class__
+        try:
+            if fields is not getattr(cls, '_fields_', None):
+                return self.__compile__(fields)
+
+            # otherwise we can reuse the layout that was compiled for the class.
+            key = tuple(fields), getattr(self, 'byteorder', None), Config.pstruct.use_offset_on_duplicate, Config.parray.lazy
+            cached = cls.__dict__.get('__compiled__', None)
+            if cached is None or cached[0] != key:
+                cached = key, self.__compile__(fields)
+                setattr(cls, '__compiled__', cached)
+
+        # any field that can't be instantiated without being loaded is not static.
+        except Exception:
+            Log.debug("type.__layout__ : {:s} : Unable to compile the layout for the structure.".format(self.instance()), exc_info=True)
+            return None
+
+        _, layout = cached
+        return layout
+
+    def __deserialize_block__(self, block):
+        layout = self.__layout__() if self.value is None else None
+        if layout is not None:
+            self.value = __lazy_value__(self, layout)
+            self.__fastindex__.update(layout.index)
+        return super(type, self).__deserialize_block__(block)
+
+    def __getvalue__(self):
+        if not(self.__bulkQ__() and self.value.loadedQ()) or self.value.dynamic or not self.value.layout.integral:
+            return super(type, self).__getvalue__()
+
+        # if every field is a regular integer, then decode them all at once.
+        return self.value.layout.struct.unpack_from(self.value.serialize())
+
+    def __load_lazy(self):
+        layout = __layout__([], [], [], [])
+        self.value = value = __lazy_value__(self, layout, shared=False)
+
+        base = offset = self.getoffset()
+        try:
+            for t, name in self._fields_ or []:
+                lowername = name.lower()
+                if lowername in self.__fastindex__ and self.__fastindex__[lowername] < len(value):
+                    _, name = name, u"{:s}_{:x}".format(name, (offset - base) if Config.pstruct.use_offset_on_duplicate else len(value))
+                    Log.warning("type.load : {:s} : Duplicate element name {!r} required using its generated name {!r}.".format(self.instance(), _, name))
+
+                # resolve the field so that we can tell whether it's a static size.
+                cons = ptype.force(t, self)
+                size = self.__staticsize__(cons) if ptype.istype(cons) else None
+
+                # if it is, then we only need to reserve a slot for it.
+                if size is not None:
+                    layout.append(cons, name, offset - base, size)
+                    index = self.__fastindex__[lowername] = value.reserve()
+
+                    # if it would've been loaded, then make sure it gets loaded when accessed.
+                    if ptype.iscontainer(cons) or ptype.isresolveable(t):
+                        value.preload.add(index)
+
+                # otherwise we need to instantiate it and load it to get its size.
+                else:
+                    index = layout.append(cons, name, offset - base, 0)
+                    item = self.new(cons, __name__=name, offset=offset)
+                    self.__fastindex__[lowername] = value.reserve(item)
+                    if ptype.iscontainer(cons) or ptype.isresolveable(t):
+                        item.load()
+                    size = item.blocksize()
+                    layout.resize(index, size)
+                offset += size
+
+        except error.LoadError:
+            raise error.LoadError(self)
+        return self
+
     def load(self, **attrs):
         with utils.assign(self, **attrs):
+
+            # if every field is a static size, then decode them from a single
+            # block and only create them when they're actually accessed.
+            layout = self.__layout__()
+            if layout is not None:
+                self.value = __lazy_value__(self, layout)
+                self.__fastindex__.update(layout.index)
+                return super(type, self).load()
+
             self.value = []
 
             # check if the user implement a custom blocksize so we can keep track
@@ -310,6 +585,12 @@ class type(__structure_interface__):
 
             # XXX: it might be safer to call .blocksize() and check for InitializationError
             current = None if utils.callable_eq(self, self.blocksize, type, type.blocksize) else 0
+
+            # if there's no custom blocksize, then only the fields with a dynamic
+            # size need to be loaded. everything else can wait until it's accessed.
+            if current is None and Config.pstruct.lazy:
+                self.__load_lazy()
+                return super(type, self).load()
             if current is not None and self.blocksize() <= 0:
                 offset = self.getoffset()
 
@@ -505,7 +786,7 @@ if __name__ == '__main__':
 
 if __name__ == '__main__':
     import ptypes
-    from ptypes import ptype, pstruct, provider, pint
+    from ptypes import ptype, pstruct, provider, pint, pbinary, pstr, dynamic
 
     class uint8(ptype.type):
         length = 1
@@ -979,6 +1260,180 @@ if __name__ == '__main__':
         if x['a'].int() == 1 and x['b'].int() == 2:
             raise Success
 
+    @TestCase
+    def test_structure_compiled_load():
+        class st(pstruct.type):
+            _fields_ = [
+                (pint.uint8_t, 'a'),
+                (pint.uint16_t, 'b'),
+                (pint.sint32_t, 'c'),
+            ]
+
+        data = b'\x01\x02\x03\xff\xff\xff\xff'
+        x = st(source=provider.bytes(data)).l
+        if not x.value.bulkQ() or x.value.resident:
+            raise Failure
+
+        if x.get() == (1, 0x0302, -1) and x.serialize() == data and not x.value.resident and x['b'].int() == 0x0302 and x.value.resident == {1}:
+            raise Success
+
+    @TestCase
+    def test_structure_compiled_dynamic():
+        class st(pstruct.type):
+            _fields_ = [
+                (pint.uint8_t, 'a'),
+                (lambda self: ptype.clone(ptype.block, length=self['a'].li.int()), 'b'),
+            ]
+        x = st(source=provider.bytes(b'\x02AB')).l
+        if x.__layout__() is None and x.value.resident == {0} and x['b'].serialize() == b'AB':
+            raise Success
+
+    @TestCase
+    def test_structure_compiled_duplicate():
+        class st(pstruct.type):
+            _fields_ = [
+                (pint.uint8_t, 'a'),
+                (pint.uint16_t, 'a'),
+                (pint.uint8_t, 'b'),
+            ]
+        data = b'\x01\x02\x03\x04'
+        x = st(source=provider.bytes(data)).l
+        ptypes.config.defaults.pstruct.compiled = ptypes.config.defaults.pstruct.lazy = False
+        try:
+            y = st(source=provider.bytes(data)).l
+        finally:
+            ptypes.config.defaults.pstruct.compiled = ptypes.config.defaults.pstruct.lazy = True
+
+        if not isinstance(x.value, pstruct.__lazy_value__) or isinstance(y.value, pstruct.__lazy_value__):
+            raise Failure
+        if [item.name() for item in x.value] == [item.name() for item in y.value] and x['a'].int() == y['a'].int() == 0x0302:
+            raise Success
+
+    @TestCase
+    def test_structure_compiled_nested():
+        class flags(pbinary.flags):
+            _fields_ = [(4, 'high'), (4, 'low')]
+        class inner(pstruct.type):
+            _fields_ = [(pint.uint16_t, 'a'), (pint.uint16_t, 'b')]
+        class st(pstruct.type):
+            _fields_ = [
+                (inner, 'inner'),
+                (dynamic.array(pint.uint8_t, 3), 'array'),
+                (dynamic.clone(pstr.string, length=2), 'string'),
+                (flags, 'flags'),
+            ]
+        data = b'\x01\x00\x02\x00abcXY\x5a'
+        x = st(source=provider.bytes(data)).l
+        if not isinstance(x.value, pstruct.__lazy_value__) or x.blocksize() != len(data):
+            raise Failure
+
+        if x['inner']['b'].int() == 2 and x['array'].get() == (0x61, 0x62, 0x63) and x['string'].str() == 'XY' and x['flags']['low'] == 0xa and x.at(x.getoffset() + 6, recurse=False).name() == 'array':
+            raise Success
+
+    @TestCase
+    def test_structure_compiled_array():
+        class st(pstruct.type):
+            _fields_ = [(pint.uint16_t, 'a'), (pint.uint16_t, 'b')]
+        data = b'\x01\x00\x02\x00\x03\x00\x04\x00'
+        x = dynamic.array(st, 2)(source=provider.bytes(data)).l
+        if not x.value.bulkQ() or x.value.resident:
+            raise Failure
+        if x.get() == ((1, 2), (3, 4)) and x[1]['a'].int() == 3 and x[1].getoffset() == 4 and x.serialize() == data:
+            raise Success
+
+    @TestCase
+    def test_structure_compiled_set():
+        class st(pstruct.type):
+            _fields_ = [(pint.uint8_t, 'a'), (pint.uint32_t, 'b'), (pint.uint8_t, 'c')]
+        x = st(source=provider.bytes(b'\x01\x02\x00\x00\x00\x03')).l
+        x['b'] = pint.uint16_t().set(0x0504)
+        if x.value.dynamic == {1} and x['c'].getoffset() == 3 and x.serialize() == b'\x01\x04\x05\x03' and x.get() == (1, 0x0504, 3):
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_fields():
+        class st(pstruct.type):
+            _fields_ = [
+                (pint.uint8_t, 'length'),
+                (lambda self: dynamic.block(self['length'].li.int()), 'data'),
+                (pstr.szstring, 'string'),
+                (pint.uint16_t, 'trailer'),
+            ]
+        data = b'\x02ABcd\x00\x05\x00'
+        x = st(source=provider.bytes(data)).l
+        if x.value.resident != {0, 2} or x.blocksize() != len(data):
+            raise Failure
+        if x['trailer'].int() == 5 and x['trailer'].getoffset() == 6 and x['data'].serialize() == b'AB' and x.serialize() == data:
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_preload():
+        class inner(pstruct.type):
+            _fields_ = [(pint.uint8_t, 'length'), (lambda self: dynamic.block(self['length'].li.int()), 'data')]
+        class st(pstruct.type):
+            _fields_ = [
+                (dynamic.array(pint.uint8_t, 2), 'array'),
+                (lambda self: dynamic.block(self['array'].blocksize() + self['array'][1].int()), 'data'),
+                (inner, 'inner'),
+            ]
+        data = b'\x00\x01ABC\x01Z'
+        x = st(source=provider.bytes(data)).l
+        if x['data'].serialize() == b'ABC' and x['inner']['data'].serialize() == b'Z' and x.size() == len(data):
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_at():
+        class st(pstruct.type):
+            _fields_ = [
+                (pint.uint8_t, 'a'),
+                (pstr.szstring, 'b'),
+                (pint.uint32_t, 'c'),
+                (pint.uint8_t, 'd'),
+            ]
+        x = st(source=provider.bytes(b'\x01AB\x00\x02\x00\x00\x00\x03')).l
+        if x.at(4, recurse=False).name() == 'c' and x.at(8, recurse=False).name() == 'd' and x.value.resident == {1, 2, 3}:
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_resize():
+        class st(pstruct.type):
+            _fields_ = [
+                (pstr.szstring, 'a'),
+                (pint.uint16_t, 'b'),
+            ]
+        x = st(source=provider.bytes(b'AB\x00\x01\x02')).l
+        x['a'].set('ABCD')
+        if x['b'].getoffset() == 5 and x['b'].int() == 0x201 and x.serialize() == b'ABCD\x00\x01\x02':
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_disabled():
+        class st(pstruct.type):
+            _fields_ = [(pint.uint8_t, 'a'), (pstr.szstring, 'b')]
+        ptypes.config.defaults.pstruct.lazy = False
+        try:
+            x = st(source=provider.bytes(b'\x01AB\x00')).l
+        finally:
+            ptypes.config.defaults.pstruct.lazy = True
+        if not isinstance(x.value, pstruct.__lazy_value__) and x['b'].str() == 'AB':
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_trailing_empty():
+        class st(pstruct.type):
+            _fields_ = [(pint.uint32_t, 'a'), (pint.uint32_t, 'b'), (ptype.block, 'padding')]
+        x = st(source=provider.bytes(b'\0' * 8)).l
+        if x.initializedQ() and x['padding'].initializedQ() and x['padding'].serialize() == b'':
+            raise Success
+
+    @TestCase
+    def test_structure_lazy_trailing_dynamic():
+        class st(pstruct.type):
+            _fields_ = [(pint.uint32_t, 'a'), (lambda self: dynamic.block(self['a'].li.int()), 'b'), (dynamic.align(4), 'pad')]
+        x = st(source=provider.bytes(b'\0' * 4)).l
+        if x.initializedQ() and all(item.initializedQ() for item in x.value) and x.size() == 4:
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
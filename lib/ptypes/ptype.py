@@ -227,7 +227,7 @@ Example pointer_t usage:
         def _calculate_(self, number):
             return number + 0x100
 """
-import sys, builtins, functools, itertools, types, operator
+import sys, builtins, functools, itertools, types, operator, bisect, contextvars
 import time
 
 from . import bitmap, provider, utils, error
@@ -336,7 +336,11 @@ def force(t, self, chain=[]):
     path = str().join(map("<{:s}>".format, self.backtrace()))
     raise error.TypeError(self, "force<ptype>', message='chain={!r} : Refusing request to resolve {!r} to a type that does not inherit from ptype.type : {{{:s}}}".format(chain, t, path))
 
+# the default source is shared by every thread unless it has been overridden
+# for the current thread (or task) by assigning it to the following variable.
 source = provider.default()
+__contextsource__ = contextvars.ContextVar('source')
+
 class __interface__(object):
     # XXX: this class should implement
     #           attribute inheritance
@@ -355,7 +359,7 @@ class __interface__(object):
     def source(self):
         if self.parent is None:
             global source
-            return source if self.__source__ is None else self.__source__
+            return __contextsource__.get(source) if self.__source__ is None else self.__source__
         return self.parent.source if self.__source__ is None else self.__source__
     @source.setter
     def source(self, value):
@@ -1100,11 +1104,12 @@ class type(base):
         """Load type using the string provided by ``block``"""
         blocksize = self.blocksize()
         if len(block) < blocksize:
-            self.value = block[:blocksize]
+            self.value = bytes(block[:blocksize])
             raise StopIteration(self, len(block), blocksize)
 
-        # all is good.
-        self.value = block[:blocksize]
+        # all is good. we explicitly convert to bytes in case our block
+        # is a memoryview from a provider that avoids copying its data.
+        self.value = bytes(block[:blocksize])
         return self
 
     def serialize(self):
@@ -1238,6 +1243,216 @@ class type(base):
         except Exception: size = self.blocksize()
         return self.__summary_size__(size)
 
+class __lazy_value__(list):
+    """A list of container elements that are decoded from a single block.
+
+    Every slot in the list starts out as None and is only replaced by an
+    instance of its element when it is accessed. The layout of each slot is
+    described by the implementor with the following methods:
+
+        __stub__(index) -- return the (type, name) of the element at ``index``.
+        __position__(index) -- return the offset of ``index`` relative to the block.
+        __length__(index) -- return the size of the element at ``index``.
+        __locate__(offset) -- return the index containing the relative ``offset``.
+
+    Slots can also be reserved one at a time while a container is being loaded.
+    Elements that were instantiated or assigned are tracked as being dynamic so
+    that any change in their size is applied to the offsets of the ones after.
+
+    Any operation that shifts the slots around will instantiate every element
+    first so that the list behaves exactly like the value of a regular container.
+    """
+    def __init__(self, owner, count):
+        super(__lazy_value__, self).__init__(count * [None])
+        self.owner, self.count = owner, count
+        self.block, self.pending = b'', count
+
+        # indices of instantiated elements, and the elements that were
+        # either assigned or appended (and thus can have a different size).
+        self.resident, self.dynamic = set(), set()
+
+    def __stub__(self, index):
+        raise error.ImplementationError(self.owner, '__lazy_value__.__stub__')
+    def __position__(self, index):
+        raise error.ImplementationError(self.owner, '__lazy_value__.__position__')
+    def __length__(self, index):
+        raise error.ImplementationError(self.owner, '__lazy_value__.__length__')
+    def __locate__(self, offset):
+        raise error.ImplementationError(self.owner, '__lazy_value__.__locate__')
+
+    def bulkQ(self):
+        '''Return whether there are elements that have not been instantiated yet.'''
+        return self.pending > 0
+
+    def loadedQ(self):
+        '''Return whether the block contains the data for every element.'''
+        return len(self.block) >= self.__position__(self.count)
+
+    def __instance__(self, index):
+        object, name = self.__stub__(index)
+        item = self.owner.new(object, __name__=name, offset=self.offset(index))
+        left, block = self.__position__(index), self.block
+
+        # zero-sized elements are decoded from an empty slice so that they get initialized.
+        if left < len(block) or left == len(block) and not self.__length__(index):
+            try: item.__deserialize_block__(block[left : left + self.__length__(index)])
+            except StopIteration: pass
+        list.__setitem__(self, index, item)
+        self.resident.add(index)
+        self.pending -= 1
+        return item
+
+    def reserve(self, item=None):
+        '''Add a slot for another element that is either instantiated as ``item`` or decoded from the block.'''
+        index = len(self)
+        list.append(self, item)
+        self.count += 1
+        if item is None:
+            self.pending += 1
+        else:
+            self.resident.add(index)
+            self.dynamic.add(index)
+        return index
+
+    def displacement(self, index=None):
+        '''Return the number of bytes that the elements before ``index`` have been resized by.'''
+        stop = len(self) if index is None else index
+        return sum(list.__getitem__(self, slot).blocksize() - self.__length__(slot) for slot in self.dynamic if slot < stop)
+
+    def rebase(self):
+        '''Update the layout to match the size of each element and return whether the block can still be used.'''
+        return not self.displacement()
+
+    def offset(self, index):
+        '''Return the offset of the element at the specified ``index``.'''
+        return self.owner.getoffset() + self.__position__(index) + self.displacement(index)
+
+    def offsets(self):
+        '''Return the offset of every element without instantiating any of them.'''
+        result, offset, delta = [], self.owner.getoffset(), 0
+        for index in range(len(self)):
+            result.append(offset + self.__position__(index) + delta)
+            if index in self.dynamic:
+                delta += list.__getitem__(self, index).blocksize() - self.__length__(index)
+            continue
+        return result
+
+    def at(self, offset):
+        '''Return the element that contains the specified ``offset``.'''
+        return self[self.__locate__(offset - self.owner.getoffset())]
+
+    def materialize(self):
+        '''Instantiate all of the elements that have not been accessed yet.'''
+        for index in range(len(self)) if self.pending else ():
+            if list.__getitem__(self, index) is None:
+                self.__instance__(index)
+            continue
+        return self
+
+    def deserialize(self, block):
+        '''Replace the block that the elements are decoded from with ``block``.'''
+        expected = self.__position__(self.count)
+        self.block = bytes(block[:expected])
+        for index in self.resident:
+            item, left = list.__getitem__(self, index), self.__position__(index)
+            if index < self.count and (left < len(self.block) or left == len(self.block) and not self.__length__(index)):
+                item.__deserialize_block__(self.block[left : left + self.__length__(index)])
+            continue
+        if len(self.block) < expected:
+            raise StopIteration(self.owner, len(self.block), expected)
+        return self
+
+    def blocksize(self):
+        return self.__position__(self.count) + self.displacement()
+
+    def size(self):
+        res, items = self.__position__(self.count), ((index, list.__getitem__(self, index)) for index in self.dynamic)
+        return res + sum((item.size() if item.value is not None else 0) - self.__length__(index) for index, item in items)
+
+    def initializedQ(self):
+        return all(list.__getitem__(self, index).initializedQ() for index in self.dynamic)
+
+    def serialize(self):
+        '''Return the block with the contents of each instantiated element applied to it.'''
+        block, result, left = self.block, [], 0
+        for index in sorted(self.resident):
+            right = self.__position__(index)
+            result.append(block[left : right])
+            result.append(list.__getitem__(self, index).serialize())
+            left = right + self.__length__(index)
+        result.append(block[left : self.__position__(self.count)])
+        return bytes().join(result)
+
+    def __getitem__(self, index):
+        if builtins.isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        res = list.__getitem__(self, index)
+        if res is None:
+            return self.__instance__(index + len(self) if index < 0 else index)
+        return res
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+        return
+
+    def __reversed__(self):
+        for index in range(len(self))[::-1]:
+            yield self[index]
+        return
+
+    def __setitem__(self, index, item):
+        if builtins.isinstance(index, slice):
+            return list.__setitem__(self.materialize(), index, item)
+        idx = index + len(self) if index < 0 else index
+        if list.__getitem__(self, idx) is None:
+            self.pending -= 1
+        list.__setitem__(self, idx, item)
+        self.resident.add(idx)
+        self.dynamic.add(idx)
+
+    def append(self, item):
+        index = len(self)
+        list.append(self, item)
+        self.resident.add(index)
+        self.dynamic.add(index)
+
+    def extend(self, iterable):
+        for item in iterable:
+            self.append(item)
+        return
+
+    def __iadd__(self, iterable):
+        self.extend(iterable)
+        return self
+
+    # everything that moves elements around needs all of them to exist
+    def __delitem__(self, index):
+        return list.__delitem__(self.materialize(), index)
+    def insert(self, index, item):
+        return list.insert(self.materialize(), index, item)
+    def pop(self, *index):
+        return list.pop(self.materialize(), *index)
+    def remove(self, item):
+        return list.remove(self.materialize(), item)
+    def reverse(self):
+        return list.reverse(self.materialize())
+    def sort(self, *args, **kwds):
+        return list.sort(self.materialize(), *args, **kwds)
+    def __imul__(self, count):
+        return list.__imul__(self.materialize(), count)
+
+    # anything that copies the list should return a regular one
+    def copy(self):
+        return [item for item in self]
+    def __add__(self, other):
+        return self.copy() + other
+    def __mul__(self, count):
+        return self.copy() * count
+    __rmul__ = __mul__
+    def __reduce__(self):
+        return list, (self.copy(),)
+
 class container(base):
     '''
     This class is capable of containing other ptypes
@@ -1246,9 +1461,13 @@ class container(base):
         value:str<r>
             list of all elements that are being contained
     '''
+    __offsetindex__ = None      # (value, sorted offsets) used by .at() to locate an element
 
     def __hash__(self):
-        return super(container, self).__hash__() ^ hash(None if self.value is None else tuple(self.value))
+        # avoid instantiating any elements that are still being decoded from a block
+        value = self.value
+        res = None if value is None else tuple(list.__iter__(value)) if builtins.isinstance(value, __lazy_value__) else tuple(value)
+        return super(container, self).__hash__() ^ hash(res)
 
     def __contains__(self, instance):
         if isinstance(instance):
@@ -1272,14 +1491,22 @@ class container(base):
             return super(container, self).instance()
         return "{:s}[{:x}:{:+x}]".format(name, ofs, bs)
 
+    def __bulkQ__(self):
+        '''Return whether the container has elements that have not been instantiated from its block.'''
+        return builtins.isinstance(self.value, __lazy_value__) and self.value.bulkQ()
+
     def initializedQ(self):
         """True if the type is fully initialized"""
         if self.value is None:
             return False
+        elif self.__bulkQ__() and self.value.loadedQ():
+            return self.value.initializedQ()
         return all(item is not None and item.initializedQ() for item in self.value)
 
     def size(self):
         """Returns a sum of the number of bytes that are currently in use by all sub-elements"""
+        if self.__bulkQ__() and self.value.loadedQ():
+            return self.value.size()
         iterable = self.value or []
         return sum(item.size() for item in iterable if item.value is not None)
 
@@ -1291,6 +1518,8 @@ class container(base):
         """Returns a sum of the bytes that are expected to be read"""
         if self.value is None:
             raise error.InitializationError(self, 'container.blocksize')
+        elif self.__bulkQ__():
+            return self.value.blocksize()
         return sum(item.blocksize() for item in self.value)
 
     def getoffset(self, *field):
@@ -1351,11 +1580,13 @@ class container(base):
             raise error.ItemNotFoundError(self, 'container.at', "offset {:#x} can not be located within container.".format(offset))
 
         # if we weren't asked to recurse, then figure out which sub-element contains the offset
-        if not recurse:
-            for item in self.value:
-                if item.contains(offset):
-                    return item
-                continue
+        if not recurse and self.__bulkQ__() and not self.value.displacement():
+            return self.value.at(offset)
+
+        elif not recurse:
+            res = self.__lookup__(offset)
+            if res is not None:
+                return res
             raise error.ItemNotFoundError(self, 'container.at', "offset {:#x} not found in a child element. returning encompassing parent.".format(offset))
 
         # descend into the trie a single level
@@ -1377,6 +1608,38 @@ class container(base):
             pass
         return res
 
+    def __lookup__(self, offset, rebuild=False):
+        '''Return the first element that contains ``offset`` using an index of the offsets for each element.'''
+        value, index = self.value, None if rebuild else self.__offsetindex__
+        if value is None:
+            return None
+
+        # the index is keyed by the list it was built for, so (re)build it if the list was
+        # replaced or resized. if the offsets aren't sorted, then the index is useless.
+        fresh = index is None or index[0] is not value or len(index[1]) != len(value)
+        if fresh:
+            offsets = value.offsets() if builtins.isinstance(value, __lazy_value__) else [item.getoffset() for item in value]
+            ordered = all(left <= right for left, right in zip(offsets[:-1], offsets[1:]))
+            index = self.__offsetindex__ = value, offsets if ordered else None
+
+        # if we can't use the index, then fall back to checking every element.
+        _, offsets = index
+        if offsets is None:
+            return next((item for item in value if item.contains(offset)), None)
+
+        # find the last element starting at or before the offset, and then check every
+        # element that starts at the same place so that the first one is returned. this
+        # expects that the elements don't overlap, which is always the case after loading.
+        found = bisect.bisect_right(offsets, offset) - 1
+        for slot in range(bisect.bisect_left(offsets, offsets[found]), found + 1) if found >= 0 else ():
+            item = value[slot]
+            if item.contains(offset):
+                return item
+            continue
+
+        # if we didn't find anything, then an element was moved or resized and we need to rebuild.
+        return None if fresh else self.__lookup__(offset, rebuild=True)
+
     def field(self, *keys):
         '''Returns the field that is indexed with the specified keys.'''
         get_field = lambda object, field: object.__field__(field) if hasattr(object, '__field__') else operator.getitem(object, field)
@@ -1391,7 +1654,16 @@ class container(base):
 
     def setposition(self, offset, recurse=False):
         res = super(container, self).setposition(offset, recurse=recurse)
-        if recurse and self.value is not None:
+        self.__offsetindex__ = None
+
+        # if we're still decoding from a block, then only the instantiated elements need updating
+        if recurse and self.__bulkQ__():
+            for index in sorted(self.value.resident):
+                item = list.__getitem__(self.value, index)
+                item.setposition((self.value.offset(index),), recurse=recurse)
+            return res
+
+        elif recurse and self.value is not None:
             ofs = offset[0]
             for item in self.value:
                 item.setposition((ofs,), recurse=recurse)
@@ -1404,21 +1676,26 @@ class container(base):
         if self.value is None:
             raise error.SyntaxError(self, 'container.__deserialize_block__', message='caller is responsible for allocation of elements in self.value')
 
-        # read everything up to the blocksize
-        value, expected, total = self.value[:], self.blocksize(), 0
-        while value and total < expected:
-            res = value.pop(0)
+        # if none of our elements have been resized, then they all decode from the same block
+        elif self.__bulkQ__() and self.value.rebase():
+            self.value.deserialize(block)
+            return self
+
+        # read everything up to the blocksize by slicing each element out of the
+        # block at its offset so that we don't copy the rest of it every time.
+        value, expected, total, index = self.value[:], self.blocksize(), 0, 0
+        while index < len(value) and total < expected:
+            res, index = value[index], index + 1
             bs = res.blocksize()
-            res.__deserialize_block__(block[:bs])
-            block = block[bs:]
+            res.__deserialize_block__(block[total : total + bs])
             total += bs
 
         # ..and then fill out any zero sized elements to update any state
-        while value:
-            res = value.pop(0)
+        while index < len(value):
+            res, index = value[index], index + 1
             bs = res.blocksize()
             if bs > 0: break
-            res.__deserialize_block__(block[:bs])
+            res.__deserialize_block__(block[total : total])
 
         # log any information about deserialization errors
         if total < expected:
@@ -1440,7 +1717,10 @@ class container(base):
         if res <= 0: return b''
 
         # serialize all the elements that we currently have
-        data = b''.join(map(utils.operator.methodcaller('serialize'), iter(self.value)))
+        if self.__bulkQ__() and self.value.loadedQ():
+            data = self.value.serialize()
+        else:
+            data = b''.join(map(utils.operator.methodcaller('serialize'), iter(self.value)))
 
         try:
             parent = None if self.parent is None else self.getparent(encoded_t)
@@ -1533,8 +1813,9 @@ class container(base):
 
     def commit(self, **attrs):
         """Commit the current state of all children back to the .source attribute"""
+        iterable = (list.__getitem__(self.value, index) for index in self.value.dynamic) if self.__bulkQ__() and self.value.loadedQ() else self.value
         if not Config.ptype.noncontiguous and \
-                all(not (builtins.isinstance(item, container) or builtins.isinstance(item, undefined)) for item in self.value):
+                all(not (builtins.isinstance(item, container) or builtins.isinstance(item, undefined)) for item in iterable):
 
             try:
                 return super(container, self).commit(**attrs)
@@ -1796,7 +2077,7 @@ class undefined(block):
         with utils.assign(self, **attrs):
             source, offset, blocksize = self.source, self.getoffset(), self.blocksize()
             source.seek(offset)
-            self.value = self.source.consume(min(blocksize, source.size() - offset)) if builtins.isinstance(self.source, provider.bounded) and offset < self.source.size() else b''
+            self.value = bytes(self.source.consume(min(blocksize, source.size() - offset))) if builtins.isinstance(self.source, provider.bounded) and offset < self.source.size() else b''
             #self.value = b''
             source.seek(offset + blocksize)
         return self
@@ -2332,7 +2613,7 @@ class wrapper_t(type):
 
     def __deserialize_block__(self, block):
         assert(block is not None)
-        self.__value__ = block
+        self.__value__ = bytes(block)
         try:
             self.object.load(offset=0, source=provider.proxy(self))
 
@@ -2579,15 +2860,25 @@ class pointer_t(encoded_t):
                 return super(pointer_t._value_, self).__setvalue__(*values, **attrs)
 
             [offset] = values
-            res = bitmap.new(offset, 8 * self.blocksize())
-            res = bitmap.data(res, reversed=(getattr(self, 'byteorder', Config.integer.order) is config.byteorder.littleendian))
+            bs, order = self.blocksize(), 'little' if getattr(self, 'byteorder', Config.integer.order) is config.byteorder.littleendian else 'big'
+
+            # if the offset fits within the pointer, then we can encode it directly
+            if builtins.isinstance(offset, bitmap.integer_types) and 0 <= offset < pow(2, 8 * bs):
+                return super(pointer_t._value_, self).__setvalue__(offset.to_bytes(bs, order), **attrs)
+
+            res = bitmap.new(offset, 8 * bs)
+            res = bitmap.data(res, reversed=(order == 'little'))
             return super(pointer_t._value_, self).__setvalue__(res, **attrs)
 
         def __getvalue__(self):
             if self.value is None:
                 raise error.InitializationError(self, 'pointer_t._value_.get')
 
-            bs, value = self.blocksize(), self.value[:: -1 if getattr(self, 'byteorder', Config.integer.order) is config.byteorder.littleendian else -1]
+            bs, little = self.blocksize(), getattr(self, 'byteorder', Config.integer.order) is config.byteorder.littleendian
+            if len(self.value) == bs:
+                return builtins.int.from_bytes(self.value, 'little' if little else 'big')
+
+            value = self.value[:: -1 if little else +1]
             octets = __izip_longest__(bytearray(value), [8] * bs)
             res = functools.reduce(bitmap.push, octets, bitmap.zero)
             return bitmap.value(res)
@@ -3171,6 +3462,31 @@ if __name__ == '__main__':
         if a.getoffset((1,2)) == 6:
             raise Success
 
+    @TestCase
+    def test_container_at_index():
+        class bah(ptype.type): length=2
+        class cont(ptype.container): __getindex__ = lambda s,i: i
+
+        a = cont()
+        a.set(bah().a, bah().a, bah().a)
+        a.setoffset(a.getoffset(), recurse=True)
+        if a.at(3, recurse=False) is not a.value[1] or a.__offsetindex__ is None:
+            raise Failure
+
+        # resize the middle element, and move everything
+        a.value[1] = a.new(ptype.block, length=4).a
+        a.setoffset(8, recurse=True)
+        if a.at(13, recurse=False) is a.value[1] and a.at(14, recurse=False) is a.value[2]:
+            raise Success
+
+    @TestCase
+    def test_container_at_displaced():
+        x = parray.type(_object_=pint.uint16_t, length=4, source=provider.bytes(b'AABBCCDD')).l
+        x[1] = pint.uint32_t().set(0x42424242)
+        x.setoffset(x.getoffset(), recurse=True)
+        if x.at(5, recurse=False) is x[1] and x.at(6, recurse=False) is x[2] and x.at(8, recurse=False).serialize() == b'DD':
+            raise Success
+
     @TestCase
     def test_decompression_block():
         import zlib
@@ -4121,6 +4437,46 @@ if __name__ == '__main__':
         if x:
             raise Success
 
+    @TestCase
+    def test_context_source_thread():
+        import threading
+        class t(ptype.type):
+            length = 4
+
+        results = {}
+        def parse(data):
+            with ptypes.context(source=provider.bytes(data)):
+                barrier.wait()
+                results[data] = t().l.serialize()
+
+        barrier = threading.Barrier(2)
+        threads = [threading.Thread(target=parse, args=(data,)) for data in [b'AAAA', b'BBBB']]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+        if results == {b'AAAA': b'AAAA', b'BBBB': b'BBBB'} and ptype.source is ptypes.config.defaults.source:
+            raise Success
+
+    @TestCase
+    def test_context_byteorder_pointer():
+        data = b'\x00\x00\x00\x10\x00\x00\x00\x00'
+        with ptypes.context(byteorder=ptypes.config.byteorder.bigendian):
+            big = ptype.pointer_t(source=provider.bytes(data)).l.int()
+            if ptypes.config.defaults.integer.order is not ptypes.config.byteorder.bigendian:
+                raise Failure
+        little = ptype.pointer_t(source=provider.bytes(data)).l.int()
+        if big == 0x1000000000 and little == 0x10000000:
+            raise Success
+
+    @TestCase
+    def test_container_deserialize_block_offsets():
+        class st(pstruct.type):
+            _fields_ = [(lambda self: pint.uint16_t, 'a'), (pint.uint32_t, 'b'), (ptype.block, 'c')]
+        x = parray.type(_object_=st, length=0x100).a
+        data = bytes(bytearray(item & 0xff for item in range(6 * len(x))))
+        x.__deserialize_block__(data)
+        if all(item.initializedQ() for item in x) and x.serialize() == data and x[0x80]['b'].serialize() == data[6 * 0x80 + 2 : 6 * 0x80 + 6]:
+            raise Success
+
 if __name__ == '__main__':
     import logging
     ptypes.config.defaults.log.setLevel(logging.DEBUG)
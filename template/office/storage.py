@@ -2,7 +2,7 @@ import ptypes
 from ptypes import *
 from . import intsafe
 
-import sys, functools, operator, itertools, types, math, logging
+import sys, functools, operator, itertools, types, math, logging, bisect, struct
 ptypes.setbyteorder(ptypes.config.byteorder.littleendian)
 logger = logging.getLogger(__name__)
 
@@ -610,7 +610,7 @@ class DirectoryEntryIdentifier(pint.enum, DWORD):
 class DirectoryEntry(pstruct.type):
     def __clsid(self):
         try:
-            parent = self.getparent(File)
+            parent = self.__store()
         except ptypes.error.ItemNotFoundError:
             return CLSID
 
@@ -758,14 +758,38 @@ class DirectoryEntry(pstruct.type):
         # Otherwise it's in the fat like most things and we just need to return it.
         return F.chain(self['sectLocation'].int())
 
+    def __store(self):
+        '''Return the File that the directory entry belongs to by walking its parents directly.'''
+        parent = self.parent
+        while parent is not None and not isinstance(parent, File):
+            parent = parent.parent
+        return self.getparent(File) if parent is None else parent
+
+    def Extents(self):
+        '''Return a list of the offset and length of each contiguous part of the file that contains the sectors or minisectors of the directory entry.'''
+        F = self.__store()
+        if self.ministreamQ():
+            return F.miniextents(self['sectLocation'].int())
+        return F.extents(self['sectLocation'].int())
+
+    def Source(self, clamp=True):
+        """Return a bounded provider that reads the contents of the directory entry directly from the file.
+        The chain of sectors is only walked once in order to map each of its contiguous parts to the position of the stream that it belongs to.
+        If clamp is true, then the provider will be sized according to the directory entry instead of the number of sectors it occupies.
+        """
+        F, size = self.__store(), self['qwSize'].int() if clamp else None
+        if self.ministreamQ():
+            return F.MiniSource(self['sectLocation'].int(), size)
+        return F.Source(self['sectLocation'].int(), size)
+
     def streamQ(self):
         '''Return true if the directory entry is stored by the fat as a regular stream backed by regular sectors.'''
-        F = self.getparent(File)
+        F = self.__store()
         return self['qwSize'].int() >= F['MiniFat']['ulMiniSectorCutoff'].int() or self['Type']['Root']
 
     def ministreamQ(self):
         '''Return true if the directory entry is stored by the minifat as a stream backed by minisectors.'''
-        F = self.getparent(File)
+        F = self.__store()
         return self['qwSize'].int() < F['MiniFat']['ulMiniSectorCutoff'].int() and not self['Type']['Root']
 
     def valid(self):
@@ -1297,7 +1321,7 @@ class ContentStream(parray.type):
 class FileSectors(ContentStream):
     '''An array of sectors within the file.'''
     def _object_(self):
-        parent = self.getparent(File)
+        parent = self.parent if isinstance(self.parent, File) else self.getparent(File)
         return parent.FileSector
 
     def asTable(self, allocationTable, **attrs):
@@ -1613,6 +1637,132 @@ class File(pstruct.type, AllocationTableMixin):
         logger.warning("{:s}.minichain({:d}): The minifat chain ({:d} minisector{:s}) was truncated due to being terminated by {:s} instead of {:s} as expected.".format('.'.join([cls.__module__, cls.__name__]), sector, len(truncated), '' if len(truncated) == 1 else 's', entry.object, expected))
         return truncated
 
+    def __sector_entries__(self, sector):
+        '''Return the integers within the specified sector by decoding them directly from the file.'''
+        size, order = self._uSectorSize, self['Header'].ByteOrder()
+        self.source.seek(self._uHeaderSize + sector * size)
+        data = self.source.consume(size)
+        count = len(data) // Pointer().blocksize()
+        return struct.unpack("{:s}{:d}I".format('<' if order is ptypes.config.byteorder.littleendian else '>', count), data[:count * Pointer().blocksize()])
+
+    @staticmethod
+    def __extents__(table, index):
+        '''Return the index and count of each run of contiguous sectors in the chain starting at the given index of the list of integers in table.'''
+        result, visited = [], {index for index in []}
+
+        # Walk the chain until it is terminated, leaves the table, or cycles, and
+        # coalesce each sector that follows the previous one into the same run.
+        while 0 <= index <= MAXREGSECT.type and index not in visited:
+            visited.add(index)
+            start, count = result[-1] if result else (None, 0)
+            if result and start + count == index:
+                result[-1] = start, count + 1
+            else:
+                result.append((index, 1))
+            index = table[index] if index < len(table) else ENDOFCHAIN.type
+        return result
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __fat_entries__(self):
+        '''Return the entries of the fat as a list of integers that are decoded directly from its sectors.'''
+        count, difat = self['Fat']['csectFat'].int(), [item.int() for item in self['Table']]
+
+        # Collect the entries from each sector of the difat that follows the
+        # table in the header. The last entry links to the sector after it.
+        sector, remaining, visited = self['DiFat']['sectDifat'].int(), self['DiFat']['csectDifat'].int(), {index for index in []}
+        while len(difat) < count and remaining > 0 and 0 <= sector <= MAXREGSECT.type and sector not in visited:
+            visited.add(sector)
+            entries = self.__sector_entries__(sector)
+            difat.extend(entries[:-1])
+            sector, remaining = entries[-1] if entries else ENDOFCHAIN.type, remaining - 1
+
+        result = []
+        for sector in itertools.takewhile(lambda sector: 0 <= sector <= MAXREGSECT.type, difat[:count]):
+            result.extend(self.__sector_entries__(sector))
+        return result
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __minifat_entries__(self):
+        '''Return the entries of the minifat as a list of integers that are decoded directly from its sectors.'''
+        fat, start, count = self.__fat_entries__(), self['MiniFat']['sectMiniFat'].int(), self['MiniFat']['csectMiniFat'].int()
+        sectors = [index for sector, total in self.__extents__(fat, start) for index in range(sector, sector + total)]
+
+        result = []
+        for sector in sectors[:count]:
+            result.extend(self.__sector_entries__(sector))
+        return result
+
+    def extents(self, sector):
+        '''Return a list of the offset and length of each contiguous part of the file that contains the fat chain starting at the given sector.'''
+        size, fat = self._uSectorSize, self.__fat_entries__()
+        return [(self._uHeaderSize + index * size, count * size) for index, count in self.__extents__(fat, sector)]
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __ministream_extents__(self):
+        '''Return a list of the position, offset, and length of each contiguous part of the file that contains the ministream.'''
+        directory = self['Fat']['sectDirectory'].int()
+        if not(0 <= directory <= MAXREGSECT.type):
+            return []
+
+        # The root entry is always the first entry of the directory, so we only
+        # need to load it instead of the entire directory to find the ministream.
+        root = self.new(DirectoryEntry, offset=self._uHeaderSize + directory * self._uSectorSize).l
+        if not root['Type']['Root']:
+            return []
+
+        start, result, position = root['sectLocation'].int(), [], 0
+        for offset, length in self.extents(start):
+            result.append((position, offset, length))
+            position += length
+        return result
+
+    def miniextents(self, sector):
+        '''Return a list of the offset and length of each contiguous part of the file that contains the minifat chain starting at the given minisector.'''
+        minifat, size = self.__minifat_entries__(), self._uMiniSectorSize
+        ministream = self.__ministream_extents__()
+        positions = [position for position, _, _ in ministream]
+
+        # Translate each run of minisectors from its position in the ministream
+        # to the parts of the file that contain it, merging any that are adjacent.
+        result = []
+        for index, count in self.__extents__(minifat, sector):
+            left, right = index * size, (index + count) * size
+            while left < right:
+                item = bisect.bisect_right(positions, left) - 1
+                if item < 0:
+                    break
+                position, offset, length = ministream[item]
+                if not(position <= left < position + length):
+                    break
+                amount = min(right, position + length) - left
+                location = offset + left - position
+                if result and sum(result[-1]) == location:
+                    result[-1] = result[-1][0], result[-1][1] + amount
+                else:
+                    result.append((location, amount))
+                left += amount
+            continue
+        return result
+
+    def __mapped__(self, extents, size=None):
+        '''Return a bounded provider that maps each of the given extents of the file to the position of the stream that it belongs to.'''
+        regions, position = [], 0
+        for offset, length in extents:
+            if size is not None and position + length > size:
+                length = max(0, size - position)
+            if length:
+                regions.append((position, length, offset, length))
+            position += length
+        return ptypes.provider.mapped(self.source, regions)
+
+    def Source(self, sector, size=None):
+        '''Return a bounded provider that reads the stream starting at the specified sector directly from the file and is clamped to size if it was given.'''
+        return self.__mapped__(self.extents(sector), size)
+
+    def MiniSource(self, sector, size=None):
+        '''Return a bounded provider that reads the stream starting at the specified minisector directly from the file and is clamped to size if it was given.'''
+        return self.__mapped__(self.miniextents(sector), size)
+
     def filesectors(self, start, *stop):
         '''Use the specified index to return a `FileSector` or range of `FileSectors` from the file.'''
         integer_types = tuple(operator.add(index, sys.maxsize).__class__ for index in range(2))
@@ -1639,8 +1789,14 @@ class File(pstruct.type, AllocationTableMixin):
         source = ptypes.provider.disorderly(items, autocommit={})
         return self.new(MiniStreamSectors, _object_=type, length=len(items), source=source).l
 
-    def Directory(self):
-        '''Return the array of Directory entries for the file.'''
+    def Directory(self, extents=False):
+        """Return the array of Directory entries for the file.
+        If extents is true, then the directory will be read directly from the file using the extents of its chain instead of through each of its sectors.
+        """
+        if extents:
+            source = self.Source(self['Fat']['sectDirectory'].int())
+            return self.new(Directory, __name__='Directory', source=source, blocksize=lambda sz=source.size(): sz).l
+
         items = [sector for sector in self.directorysectors()]
         source, size = ptypes.provider.disorderly(items, autocommit={}), sum(sector.blocksize() for sector in items)
         return self.new(Directory, __name__='Directory', source=source, blocksize=lambda sz=size: sz).l
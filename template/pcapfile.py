@@ -193,11 +193,20 @@ class Packet(pstruct.type):
 class List(parray.type):
     _object_ = Packet
 
-    def within(self, start, end):
-        for item in self:
-            dt = item['header'].datetime()
-            if start <= dt < end:
-                yield item
+    def within(self, start, end, index=None):
+        """Yield each packet with a timestamp from start up to end.
+
+        If a sparse index from ``File.index`` is given, then only the packets
+        belonging to the parts of the index that overlap the range are checked.
+        """
+        ranges = [(0, len(self))] if index is None else [(number, number + count) for earliest, latest, _, number, count in index if earliest < end and start <= latest]
+        for left, right in ranges:
+            for number in range(left, min(right, len(self))):
+                item = self[number]
+                dt = item['header']['ts'].datetime()
+                if start <= dt < end:
+                    yield item
+                continue
             continue
         return
 
@@ -208,35 +217,125 @@ class ForeverList(parray.infinite, List):
     pass
 
 class File(pstruct.type):
-    def __packets(self):
-        header = self['header'].li
-        self.attributes.update(self['header'].attributes)
+    def __packet(self):
+        header = self.__header()
+        self.attributes.update(header.attributes)
 
         linktype = header['linktype']
         if osi.layer.has(linktype.int()):
-            layers_t = dyn.clone(osi.layers, protocol=osi.layer.lookup(header['linktype'].int()))
-        else:
-            layers_t = None
-
-        if isinstance(self.source, ptypes.provider.bounded) and osi.layer.has(linktype.int()):
-            size = max(0, self.source.size() - header.size())
-            layers_t = dyn.clone(osi.layers, protocol=osi.layer.lookup(header['linktype'].int()))
-            return dyn.clone(BlockList, _object_=dyn.clone(Packet, _object_=layers_t), blocksize=lambda _, sz=size: sz)
+            layers_t = dyn.clone(osi.layers, protocol=osi.layer.lookup(linktype.int()))
+            return dyn.clone(Packet, _object_=layers_t)
+        return Packet
 
-        elif isinstance(self.source, ptypes.provider.bounded):
+    def __packets(self):
+        header, packet = self['header'].li, self.__packet()
+        if isinstance(self.source, ptypes.provider.bounded):
             size = max(0, self.source.size() - header.size())
-            return dyn.clone(BlockList, blocksize=lambda _, sz=size: sz)
-
-        elif osi.layer.has(linktype.int()):
-            layers_t = dyn.clone(osi.layers, protocol=osi.layer.lookup(header['linktype'].int()))
-            return dyn.clone(ForeverList, _object_=dyn.clone(Packet, _object_=layers_t))
-        return ForeverList
+            return dyn.clone(BlockList, _object_=packet, blocksize=lambda _, sz=size: sz)
+        return dyn.clone(ForeverList, _object_=packet)
 
     _fields_ = [
         (pcap_hdr_t, 'header'),
         (__packets, 'packets'),
     ]
 
+    def __header(self):
+        '''Return the header of the file, loading only the header if the file hasn't been loaded yet.'''
+        if self.value is None:
+            return self.new(pcap_hdr_t, __name__='header', offset=self.getoffset()).li
+        return self['header'].li
+
+    def __iterate(self, type, offset, number=0, count=None, recycle=False):
+        '''Yield the number and instance of each record of the specified type starting at the given offset and number.'''
+        item, bounded = None, isinstance(self.source, ptypes.provider.bounded)
+        for number in itertools.count(number) if count is None else range(number, number + count):
+            if bounded and offset >= self.source.size():
+                break
+
+            # If we're recycling, then reload the same instance at the new offset.
+            if recycle and item is not None:
+                item.setoffset(offset)
+            else:
+                item = self.new(type, __name__=str(number), offset=offset)
+
+            try:
+                item.load()
+            except (ptypes.error.LoadError, ptypes.error.InitializationError, ptypes.error.ProviderError):
+                break
+            if not item.initializedQ():
+                break
+
+            # Only the record that we're about to yield stays in the cache.
+            ptypes.provider.release(self.source, item.getoffset())
+            offset += item.size()
+            yield number, item
+        return
+
+    def iterate(self, recycle=False):
+        """Yield each packet from the capture one at a time without keeping any of them resident.
+
+        This only reads the header of the file and then reads each packet in
+        order, so the capture can be read from a sequential provider such as
+        ``ptypes.provider.stream`` whose cache is released as it is consumed.
+        If recycle is true, then the same instance is reloaded for each packet.
+        """
+        header = self.__header()
+        type, offset = self.__packet(), header.getoffset() + header.size()
+        for _, item in self.__iterate(type, offset, recycle=recycle):
+            yield item
+        return
+
+    def index(self, step=0x400):
+        """Return a sparse index of the packets by decoding only the header of each one.
+
+        Each entry of the index is a tuple of the earliest and latest timestamp
+        for the next ``step`` packets, followed by the offset and number of the
+        first packet and the number of packets that the entry describes.
+        """
+        header = self.__header()
+        self.attributes.update(header.attributes)
+        header_t = dyn.clone(pcaprec_hdr_s, recurse=dict(byteorder=header.attributes.get('pcap_byteorder', ptypes.Config.integer.order)))
+
+        result, item, bounded = [], self.new(header_t, offset=header.getoffset() + header.size()), isinstance(self.source, ptypes.provider.bounded)
+        offset, number, entry = item.getoffset(), 0, None
+        while not(bounded) or offset < self.source.size():
+            try:
+                item.setoffset(offset)
+                item.load()
+            except (ptypes.error.LoadError, ptypes.error.InitializationError, ptypes.error.ProviderError):
+                break
+
+            # Start a new entry every step packets, and update the range of
+            # timestamps for the entry that we're currently building.
+            dt = item['ts'].datetime()
+            if number % step == 0:
+                entry = [dt, dt, offset, number, 0]
+                result.append(entry)
+            entry[0], entry[1], entry[4] = min(entry[0], dt), max(entry[1], dt), entry[4] + 1
+
+            ptypes.provider.release(self.source, offset)
+            offset, number = offset + item.size() + item['incl_len'].int(), number + 1
+        return [tuple(entry) for entry in result]
+
+    def within(self, start, end, index=None, recycle=False):
+        """Yield each packet with a timestamp from start up to end by reading the capture one packet at a time.
+
+        If a sparse index from ``File.index`` is given, then the provider is
+        seeked to the parts of the index that overlap the range and only the
+        packets that they contain are read.
+        """
+        header = self.__header()
+        type, offset = self.__packet(), header.getoffset() + header.size()
+        ranges = [(offset, 0, None)] if index is None else [(offset, number, count) for earliest, latest, offset, number, count in index if earliest < end and start <= latest]
+        for offset, number, count in ranges:
+            for _, item in self.__iterate(type, offset, number, count, recycle=recycle):
+                dt = item['header']['ts'].datetime()
+                if start <= dt < end:
+                    yield item
+                continue
+            continue
+        return
+
 if __name__ == '__main__':
     import ptypes, pcapfile, osi
     packet = osi.packet
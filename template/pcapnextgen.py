@@ -722,6 +722,68 @@ class File(pstruct.type):
         (__Blocks, 'Blocks'),
     ]
 
+    def __header(self):
+        '''Return the section header of the file, loading only the header if the file hasn't been loaded yet.'''
+        if self.value is not None:
+            return self
+        fields = [(type, name) for type, name in self._fields_ if name != 'Blocks']
+        header = self.new(dyn.clone(File, _fields_=fields), offset=self.getoffset()).li
+        self.attributes.update(header.attributes)
+        if hasattr(header, 'pcap_byteorder'):
+            self.pcap_byteorder = header.pcap_byteorder
+        return header
+
+    def iterate(self, recycle=False):
+        """Yield each block from the capture one at a time without keeping any of them resident.
+
+        Only the ``InterfaceDescription`` blocks are kept so that the body of
+        each ``EnhancedPacket`` can be decoded using the link type from its
+        interface. This allows the capture to be read from a sequential
+        provider such as ``ptypes.provider.stream`` whose cache is released as
+        it is consumed. If recycle is true, then the same instance is reloaded
+        for each block that does not describe an interface.
+        """
+        header = self.__header()
+        suffix = header['SuffixLength']
+        offset, bounded = suffix.getoffset() + suffix.size(), isinstance(self.source, ptypes.provider.bounded)
+
+        # This array is used as the parent of every block so that the packets
+        # can find their interface, but it only contains the interfaces.
+        blocks = self.new(BlockArray, __name__='Blocks', offset=offset)
+        blocks.value, blocks._interfaces_ = [], []
+
+        item = None
+        for number in itertools.count():
+            if bounded and offset >= self.source.size():
+                break
+
+            if recycle and item is not None:
+                item.setoffset(offset)
+            else:
+                item = blocks.new(Block, __name__=str(number), offset=offset)
+
+            try:
+                item.load()
+            except (ptypes.error.LoadError, ptypes.error.InitializationError, ptypes.error.ProviderError):
+                break
+            if not item.initializedQ():
+                break
+
+            # Keep each interface that we encounter and avoid recycling it.
+            if item['Type']['InterfaceDescription']:
+                blocks.value.append(item)
+                blocks._interfaces_.append(len(blocks.value))
+
+            # Only the record that we're about to yield stays in the cache.
+            ptypes.provider.release(self.source, item.getoffset())
+            offset += item.size()
+            yield item
+
+            if item['Type']['InterfaceDescription']:
+                item = None
+            continue
+        return
+
 if __name__ == '__main__':
     import ptypes, pcapnextgen
     source = ptypes.setsource(ptypes.provider.file(sys.argv[1], 'rb'))
@@ -2,7 +2,7 @@
 Multiple Stream Format
 https://github.com/microsoft/microsoft-pdb
 '''
-import builtins, ptypes, ndk.intsafe as intsafe
+import builtins, os, bisect, struct, pickle, ptypes, ndk.intsafe as intsafe
 from ptypes import *
 from ndk.intsafe import *
 
@@ -11,6 +11,9 @@ class SN(intsafe.unsigned_short): pass
 class UNSN(intsafe.unsigned_long): pass
 class OFF(intsafe.long): pass
 class ushort(intsafe.unsigned_short): pass
+class ISECT(intsafe.unsigned_short): pass
+class IMOD(intsafe.unsigned_short): pass
+class IFILE(intsafe.unsigned_short): pass
 class PN16(intsafe.unsigned___int16): pass
 class SPN16(intsafe.unsigned___int16): pass
 class PN32(intsafe.unsigned___int32): pass
@@ -428,6 +431,551 @@ class MSF(pstruct.type):
             assert(res['hdr']['pnMac'].int() == used + res['Mac'].size() / res['hdr']['cbPg'].int())
         return res
 
+    def __read__(self, offset, size):
+        '''Return the specified number of bytes at the given offset by reading them directly from the file.'''
+        self.source.seek(offset)
+        return self.source.consume(size)
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __stream_table__(self):
+        '''Return a list of the size and page numbers for each stream by decoding the stream table directly from the file.'''
+        hdr, big = self['hdr'], self['szMagic'].BigHeader()
+        cbPg, cb = hdr['cbPg'].int(), hdr['siSt']['cb'].int()
+        count = (cb + cbPg - 1) // cbPg
+
+        # The page map of a big msf contains the pages that list the pages of
+        # the stream table, whereas the page map of a small msf lists them directly.
+        mpspnpn = self['mpspnpn']
+        if big:
+            per = cbPg // UPN().a.blocksize()
+            pages = []
+            for index in range(min(len(mpspnpn), (count + per - 1) // per)):
+                data = self.__read__(mpspnpn[index].int() * cbPg, cbPg)
+                pages.extend(struct.unpack("<{:d}I".format(per), data))
+            pages = pages[:count]
+        else:
+            pages = [mpspnpn[index].int() for index in range(min(len(mpspnpn), count))]
+        data = b''.join(self.__read__(page * cbPg, cbPg) for page in pages)[:cb]
+
+        # Now we can decode the size of each stream followed by their page
+        # numbers. A size of -1 is used for a stream that has been deleted.
+        if big:
+            snMac, = struct.unpack_from('<I', data, 0)
+            sizes, position, pn = struct.unpack_from("<{:d}I".format(snMac), data, 4), 4 + 4 * snMac, 'I'
+        else:
+            snMac, _ = struct.unpack_from('<HH', data, 0)
+            sizes, position, pn = [size for size, _ in struct.iter_unpack('<II', data[4 : 4 + 8 * snMac])], 4 + 8 * snMac, 'H'
+
+        result = []
+        for size in sizes:
+            size = 0 if size == 0xffffffff else size
+            total = (size + cbPg - 1) // cbPg
+            result.append((size, struct.unpack_from("<{:d}{:s}".format(total, pn), data, position)))
+            position += total * struct.calcsize(pn)
+        return result
+
+    def StreamCount(self):
+        '''Return the number of streams within the stream table.'''
+        return len(self.__stream_table__())
+
+    def StreamSize(self, sn):
+        '''Return the size of the stream with the specified number.'''
+        size, _ = self.__stream_table__()[sn]
+        return size
+
+    def extents(self, sn):
+        '''Return a list of the offset and length of each contiguous part of the file that contains the stream with the specified number.'''
+        cbPg, (size, pages) = self['hdr']['cbPg'].int(), self.__stream_table__()[sn]
+
+        # Coalesce each page that follows the previous one into the same run
+        # and then clamp the last run to the size of the stream.
+        runs = []
+        for page in pages:
+            start, count = runs[-1] if runs else (None, 0)
+            if runs and start + count == page:
+                runs[-1] = start, count + 1
+            else:
+                runs.append((page, 1))
+            continue
+
+        result, remaining = [], size
+        for page, count in runs:
+            length = min(remaining, count * cbPg)
+            result.append((page * cbPg, length))
+            remaining -= length
+        return result
+
+    def Source(self, sn):
+        '''Return a bounded provider that reads the stream with the specified number directly from the pages of the file.'''
+        regions, position = [], 0
+        for offset, length in self.extents(sn):
+            regions.append((position, length, offset, length))
+            position += length
+        return ptypes.provider.mapped(self.source, regions)
+
+    def Stream(self, sn, type=None):
+        '''Return an instance of the specified type (or a block) that is backed by the stream with the specified number.'''
+        size = self.StreamSize(sn)
+        if type is None:
+            res = dyn.block(size)
+
+        # If the type is an array that is bounded by its size, then use the
+        # size of the stream so that it contains all of its elements.
+        elif ptypes.istype(type) and issubclass(type, parray.block):
+            res = dyn.clone(type, blocksize=lambda _, cb=size: cb)
+        else:
+            res = type
+        return self.new(res, __name__="Stream({:d})".format(sn), offset=0, source=self.Source(sn))
+
+    def Info(self):
+        '''Return the pdb information from its stream.'''
+        return self.Stream(snPDB, PDBStream70).l
+
+    def Tpi(self):
+        '''Return the type information from its stream.'''
+        return self.Stream(snTpi, TPI)
+
+    def Dbi(self):
+        '''Return the debug information from its stream.'''
+        return self.Stream(snDbi, DBI)
+
+    def __identity__(self):
+        '''Return the guid and age that are used to match this pdb with its executable.'''
+        data = self.Source(snPDB)
+        data.seek(0)
+        impv, sig, age, guid = struct.unpack('<III16s', data.consume(28))
+        return guid, age
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __dbi_header__(self):
+        '''Return a dictionary of the fields from the header of the debug information stream by decoding them directly from the file.'''
+        data = self.Source(snDbi)
+        data.seek(0)
+        values = struct.unpack('<iIIHHHHHHiiiiiIiiHHI', data.consume(NewDBIHdr().a.blocksize()))
+        return {name : value for (_, name), value in zip(NewDBIHdr._fields_, values)}
+
+    def __dbi_substream__(self, name):
+        '''Return the offset and size of the specified substream from the debug information stream.'''
+        hdr, offset = self.__dbi_header__(), NewDBIHdr().a.blocksize()
+        for field, size in DBI.__substreams__:
+            if field == name:
+                return offset, hdr[size]
+            offset += hdr[size]
+        raise KeyError(name)
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __module_streams__(self):
+        '''Return a list of the stream number for the symbols of each module by decoding the module information from the debug information stream.'''
+        offset, size = self.__dbi_substream__('gpmodi')
+        data = self.Source(snDbi)
+        data.seek(offset)
+        data = data.consume(size)
+
+        # Each module is a fixed-size structure followed by the names of the
+        # module and its object file, and is then aligned to a multiple of 4.
+        result, position = [], 0
+        while position + 0x40 <= len(data):
+            sn, = struct.unpack_from('<H', data, position + 0x22)
+            result.append(sn)
+            position = data.index(b'\0', data.index(b'\0', position + 0x40) + 1) + 1
+            position += -position % 4
+        return result
+
+    @ptypes.utils.memoize(self=lambda self: id(self.value))
+    def __sections__(self):
+        '''Return a list of the virtual address of each section from the section headers that are referenced by the debug information stream.'''
+        offset, size = self.__dbi_substream__('dbghdr')
+        data = self.Source(snDbi)
+        data.seek(offset)
+        rgsn = struct.unpack("<{:d}H".format(size // 2), data.consume(size))
+
+        sn = rgsn[DbgHdr.SectionHdr] if DbgHdr.SectionHdr < len(rgsn) else snNil
+        if sn == snNil or sn >= self.StreamCount():
+            return []
+        data = self.Source(sn)
+        data.seek(0)
+        data = data.consume(self.StreamSize(sn))
+        return [va for va, in struct.iter_unpack('<12xI24x', data[:len(data) - len(data) % 40])]
+
+    def __symbol_records__(self, sn, records, modules):
+        '''Yield the name, section, and offset for each symbol that is referenced by the hash records of the specified stream.'''
+        data, offset = self.Source(sn), PSGSIHDR().a.blocksize() if sn == self.__dbi_header__()['snPSSyms'] else 0
+        data.seek(offset)
+        _, _, cbHr, _ = struct.unpack('<IIII', data.consume(GSIHashHdr().a.blocksize()))
+        hr = data.consume(cbHr)
+
+        for off, _ in struct.iter_unpack('<iI', hr[:cbHr - cbHr % 8]):
+            if not(0 < off <= len(records) - 4):
+                continue
+            position = off - 1
+            _, rectyp = struct.unpack_from('<HH', records, position)
+
+            # Public and data symbols contain their address, but references to
+            # procedures need the symbol to be read from the module stream.
+            if rectyp in {S_PUB32, S_GDATA32, S_LDATA32, S_GTHREAD32, S_LTHREAD32}:
+                address, section = struct.unpack_from('<IH', records, position + 8)
+            elif rectyp in {S_PROCREF, S_LPROCREF} and modules:
+                ibSym, imod = struct.unpack_from('<IH', records, position + 8)
+                if not(0 < imod <= len(modules)) or modules[imod - 1] >= self.StreamCount():
+                    continue
+                module = self.Source(modules[imod - 1])
+                module.seek(ibSym)
+                _, kind, address, section = struct.unpack('<HH28xIH', module.consume(38))
+                if kind not in {S_GPROC32, S_LPROC32, S_GPROC32_ID, S_LPROC32_ID}:
+                    continue
+            else:
+                continue
+
+            end = records.index(b'\0', position + 14)
+            yield records[position + 14 : end].decode('utf-8', 'replace'), section, address
+        return
+
+    def Symbols(self):
+        '''Yield the name, section, and offset of each public and then global symbol by decoding their records directly from the file.'''
+        hdr, count = self.__dbi_header__(), self.StreamCount()
+        if hdr['snSymRecs'] >= count:
+            return
+
+        data = self.Source(hdr['snSymRecs'])
+        data.seek(0)
+        records, modules = data.consume(self.StreamSize(hdr['snSymRecs'])), self.__module_streams__()
+        for sn in [hdr['snPSSyms'], hdr['snGSSyms']]:
+            if sn < count:
+                for item in self.__symbol_records__(sn, records, modules):
+                    yield item
+                continue
+            continue
+        return
+
+    def Index(self, path=None):
+        """Return a `SymbolIndex` for the public and global symbols within the pdb.
+
+        If a path is given, then the index is loaded from it as long as it was
+        saved from a pdb with the same guid and age. Otherwise the index is
+        built by walking the symbol streams and then saved to the path.
+        """
+        identity = self.__identity__()
+        if path is not None and os.path.exists(path):
+            res = SymbolIndex.load(path)
+            if res.identity == identity:
+                return res
+
+        res = SymbolIndex(identity, self.__sections__(), self.Symbols())
+        if path is not None:
+            res.save(path)
+        return res
+
+### https://github.com/microsoft/microsoft-pdb/blob/master/PDB/include/msf.h
+snNil = 0xffff
+snPDB, snTpi, snDbi, snIpi = 1, 2, 3, 4
+
+### https://github.com/microsoft/microsoft-pdb/blob/master/include/cvinfo.h
+S_LDATA32, S_GDATA32, S_PUB32, S_LPROC32, S_GPROC32 = 0x110c, 0x110d, 0x110e, 0x110f, 0x1110
+S_LTHREAD32, S_GTHREAD32 = 0x1112, 0x1113
+S_PROCREF, S_DATAREF, S_LPROCREF = 0x1125, 0x1126, 0x1127
+S_LPROC32_ID, S_GPROC32_ID = 0x1146, 0x1147
+
+class PDBStream70(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/include/pdbcommon.h#L30'''
+    _fields_ = [
+        (unsigned_long, 'impv'),
+        (unsigned_long, 'sig'),
+        (unsigned_long, 'age'),
+        (GUID, 'sig70'),
+    ]
+
+class OffCb(pstruct.type):
+    _fields_ = [
+        (OFF, 'off'),
+        (CB, 'cb'),
+    ]
+
+class TpiHash(pstruct.type):
+    _fields_ = [
+        (SN, 'sn'),
+        (SN, 'snPad'),
+        (CB, 'cbHashKey'),
+        (long, 'cHashBuckets'),
+        (OffCb, 'offcbHashVals'),
+        (OffCb, 'offcbTiOff'),
+        (OffCb, 'offcbHashAdj'),
+    ]
+
+class HDR(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/tpi.h#L40'''
+    _fields_ = [
+        (unsigned_long, 'vers'),
+        (long, 'cbHdr'),
+        (unsigned_long, 'tiMin'),
+        (unsigned_long, 'tiMac'),
+        (unsigned_long, 'cbGprec'),
+        (TpiHash, 'tpihash'),
+    ]
+
+class TypeRecord(pstruct.type):
+    _fields_ = [
+        (unsigned_short, 'len'),
+        (unsigned_short, 'leaf'),
+        (lambda self: dyn.block(max(0, self['len'].li.int() - 2)), 'data'),
+    ]
+
+class TPI(pstruct.type):
+    def __padding(self):
+        res, fields = self['hdr'].li, ['hdr']
+        return dyn.block(max(0, res['cbHdr'].int() - sum(self[fld].li.size() for fld in fields)))
+
+    def __types(self):
+        res = self['hdr'].li
+        return dyn.clone(TypeRecords, blocksize=lambda _, cb=res['cbGprec'].int(): cb)
+
+    _fields_ = [
+        (HDR, 'hdr'),
+        (__padding, 'padding'),
+        (__types, 'types'),
+    ]
+
+class TypeRecords(parray.block):
+    _object_ = TypeRecord
+
+class SC(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/include/dbicommon.h#L19'''
+    _fields_ = [
+        (ISECT, 'isect'),
+        (unsigned_short, 'pad1'),
+        (OFF, 'off'),
+        (CB, 'size'),
+        (unsigned_long, 'dwCharacteristics'),
+        (IMOD, 'imod'),
+        (unsigned_short, 'pad2'),
+        (unsigned_long, 'dwDataCrc'),
+        (unsigned_long, 'dwRelocCrc'),
+    ]
+
+class MODI(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/dbi.h#L1120'''
+    _fields_ = [
+        (unsigned_long, 'pmod'),
+        (SC, 'sc'),
+        (unsigned_short, 'flags'),
+        (SN, 'sn'),
+        (CB, 'cbSyms'),
+        (CB, 'cbLines'),
+        (CB, 'cbC13Lines'),
+        (IFILE, 'ifileMac'),
+        (unsigned_short, 'pad'),
+        (unsigned_long, 'mpifileichFile'),
+        (unsigned_long, 'niSrcFile'),
+        (unsigned_long, 'niPdbFile'),
+        (pstr.szstring, 'szModule'),
+        (pstr.szstring, 'szObjFile'),
+        (dyn.align(4), 'align(szObjFile)'),
+    ]
+
+class ModuleInformation(parray.block):
+    _object_ = MODI
+
+class DbgHdr(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/dbi.h#L126'''
+    FPO, Exception, Fixup, OmapToSrc, OmapFromSrc, SectionHdr, TokenRidMap, Xdata, Pdata, NewFPO, SectionHdrOrig = range(11)
+    _fields_ = [
+        (SN, 'snFPO'),
+        (SN, 'snException'),
+        (SN, 'snFixup'),
+        (SN, 'snOmapToSrc'),
+        (SN, 'snOmapFromSrc'),
+        (SN, 'snSectionHdr'),
+        (SN, 'snTokenRidMap'),
+        (SN, 'snXdata'),
+        (SN, 'snPdata'),
+        (SN, 'snNewFPO'),
+        (SN, 'snSectionHdrOrig'),
+    ]
+
+class NewDBIHdr(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/dbi.h#L137'''
+    _fields_ = [
+        (long, 'verSignature'),
+        (unsigned_long, 'verHdr'),
+        (unsigned_long, 'age'),
+        (SN, 'snGSSyms'),
+        (unsigned_short, 'usVerPdbDllMajMin'),
+        (SN, 'snPSSyms'),
+        (unsigned_short, 'usVerPdbDllBuild'),
+        (SN, 'snSymRecs'),
+        (unsigned_short, 'usVerPdbDllRBld'),
+        (CB, 'cbGpModi'),
+        (CB, 'cbSC'),
+        (CB, 'cbSecMap'),
+        (CB, 'cbFileInfo'),
+        (CB, 'cbTSMap'),
+        (unsigned_long, 'iMFC'),
+        (CB, 'cbDbgHdr'),
+        (CB, 'cbECInfo'),
+        (unsigned_short, 'flags'),
+        (unsigned_short, 'wMachine'),
+        (unsigned_long, 'rgulReserved'),
+    ]
+
+class DBI(pstruct.type):
+    # the name of each substream in the order they follow the header along with the field containing its size
+    __substreams__ = [
+        ('gpmodi', 'cbGpModi'),
+        ('sc', 'cbSC'),
+        ('secmap', 'cbSecMap'),
+        ('fileinfo', 'cbFileInfo'),
+        ('tsmap', 'cbTSMap'),
+        ('ecinfo', 'cbECInfo'),
+        ('dbghdr', 'cbDbgHdr'),
+    ]
+
+    def __substream(name, size):
+        def substream(self):
+            res = self['hdr'].li
+            if name == 'gpmodi':
+                return dyn.clone(ModuleInformation, blocksize=lambda _, cb=res[size].int(): cb)
+            elif name == 'dbghdr' and res[size].int() >= DbgHdr().a.blocksize():
+                return DbgHdr
+            return dyn.block(res[size].int())
+        return substream
+
+    _fields_ = [
+        (NewDBIHdr, 'hdr'),
+        (__substream('gpmodi', 'cbGpModi'), 'gpmodi'),
+        (__substream('sc', 'cbSC'), 'sc'),
+        (__substream('secmap', 'cbSecMap'), 'secmap'),
+        (__substream('fileinfo', 'cbFileInfo'), 'fileinfo'),
+        (__substream('tsmap', 'cbTSMap'), 'tsmap'),
+        (__substream('ecinfo', 'cbECInfo'), 'ecinfo'),
+        (__substream('dbghdr', 'cbDbgHdr'), 'dbghdr'),
+    ]
+
+class GSIHashHdr(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/gsi.h#L24'''
+    _fields_ = [
+        (unsigned_long, 'verSignature'),
+        (unsigned_long, 'verHdr'),
+        (unsigned_long, 'cbHr'),
+        (unsigned_long, 'cbBuckets'),
+    ]
+
+class HRFile(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/gsi.h#L66'''
+    _fields_ = [
+        (OFF, 'off'),
+        (long, 'cRef'),
+    ]
+    def summary(self):
+        return "off={:+#x} cRef={:d}".format(self['off'].int(), self['cRef'].int())
+
+class GSI(pstruct.type):
+    def __rghr(self):
+        res = self['hdr'].li
+        return dyn.array(HRFile, res['cbHr'].int() // HRFile().a.blocksize())
+
+    _fields_ = [
+        (GSIHashHdr, 'hdr'),
+        (__rghr, 'rghr'),
+        (lambda self: dyn.block(self['hdr'].li['cbBuckets'].int()), 'buckets'),
+    ]
+
+class PSGSIHDR(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/PDB/dbi/gsi.h#L46'''
+    _fields_ = [
+        (CB, 'cbSymHash'),
+        (CB, 'cbAddrMap'),
+        (unsigned_long, 'nThunks'),
+        (CB, 'cbSizeOfThunk'),
+        (ISECT, 'isectThunkTable'),
+        (unsigned_short, 'padding'),
+        (OFF, 'offThunkTable'),
+        (unsigned_long, 'nSects'),
+    ]
+
+class PSGSI(pstruct.type):
+    def __gsi(self):
+        res = self['hdr'].li
+        return dyn.clone(GSI, blocksize=lambda _, cb=res['cbSymHash'].int(): cb)
+
+    _fields_ = [
+        (PSGSIHDR, 'hdr'),
+        (__gsi, 'gsi'),
+        (lambda self: dyn.array(OFF, self['hdr'].li['cbAddrMap'].int() // OFF().a.blocksize()), 'addrmap'),
+    ]
+
+class SymbolRecord(pstruct.type):
+    '''https://github.com/microsoft/microsoft-pdb/blob/master/include/cvinfo.h#L3022'''
+    _fields_ = [
+        (unsigned_short, 'reclen'),
+        (unsigned_short, 'rectyp'),
+        (lambda self: dyn.block(max(0, self['reclen'].li.int() - 2)), 'data'),
+    ]
+
+class SymbolRecords(parray.block):
+    _object_ = SymbolRecord
+
+class SymbolIndex(object):
+    """An index of the symbols within a pdb by their name and their address.
+
+    Each symbol is mapped from its name to its section and offset, and the
+    sections are used to map the relative virtual address of each symbol back
+    to its name. The index is identified by the guid and age of the pdb that
+    it was built from, and can be saved to and loaded from a file.
+    """
+    version = 1
+
+    def __init__(self, identity, sections, symbols):
+        self.identity, self.sections = identity, [va for va in sections]
+        self.names = {}
+        for name, section, offset in symbols:
+            self.names.setdefault(name, (section, offset))
+
+        # Sort the address of each symbol so that we can bisect them by rva.
+        addresses = sorted((self.rva(section, offset), name) for name, (section, offset) in self.names.items() if self.rva(section, offset) is not None)
+        self.__addresses__, self.__rvas__ = addresses, [rva for rva, _ in addresses]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def rva(self, section, offset):
+        '''Return the relative virtual address of the specified section and offset or None if the section is unknown.'''
+        if 0 < section <= len(self.sections):
+            return self.sections[section - 1] + offset
+        return None
+
+    def byname(self, name):
+        '''Return the section and offset of the symbol with the specified name.'''
+        return self.names[name]
+
+    def byaddress(self, rva):
+        '''Return the name of the symbol at or before the specified relative virtual address and the distance from it.'''
+        index = bisect.bisect_right(self.__rvas__, rva) - 1
+        if index < 0:
+            raise KeyError(rva)
+        address, name = self.__addresses__[index]
+        return name, rva - address
+
+    def save(self, path):
+        '''Save the index to the file at the specified path.'''
+        with open(path, 'wb') as outfile:
+            pickle.dump((self.version, self.identity, self.sections, self.names, self.__addresses__), outfile, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        '''Return the index that was saved to the file at the specified path.'''
+        with open(path, 'rb') as infile:
+            version, identity, sections, names, addresses = pickle.load(infile)
+        if version != cls.version:
+            raise ValueError("{:s}.load : Unable to load an index with an unsupported version ({:d}) from {!r}.".format(cls.__name__, version, path))
+
+        # The addresses were saved in order, so we only need to restore them.
+        res = cls(identity, sections, [])
+        res.names, res.__addresses__, res.__rvas__ = names, addresses, [rva for rva, _ in addresses]
+        return res
+
 ### trash everything below this ###
 class Relocation(pstruct.type):
     _fields_ = [
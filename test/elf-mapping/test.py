@@ -0,0 +1,48 @@
+# python test.py [filename...]
+# Checks that the provider returned by elf.File.mapping presents each loadable
+# segment at its address with the space between them unmapped, and that a
+# shared object (or position-independent executable) can be decoded again from
+# it. When no filenames are given, the executable for the interpreter is used.
+import sys
+import ptypes, elf
+
+def check(name, source, base=0x10000000):
+    res = elf.File(source=source).l
+    data, mapping = res['e_data'], res.mapping(base)
+    segments = [phdr for phdr in data['e_phoff'].d.li if phdr['p_type']['LOAD']]
+
+    source.seek(0)
+    contents = source.consume(source.size())
+    for phdr in segments:
+        address, offset, filesz, memsz = (phdr[fld].int() for fld in ['p_vaddr', 'p_offset', 'p_filesz', 'p_memsz'])
+        mapping.seek(base + address)
+        expected = contents[offset : offset + filesz] + b'\0' * (memsz - filesz)
+        assert mapping.consume(memsz) == expected, "{:s}: the segment at {:#x} was mapped incorrectly".format(name, address)
+
+    # Like the loader, anything between the pages of the segments should be unmapped.
+    pages = sorted((base + phdr['p_vaddr'].int() // 0x1000 * 0x1000, base + (phdr['p_vaddr'].int() + phdr['p_memsz'].int() + 0xfff) // 0x1000 * 0x1000) for phdr in segments)
+    for (_, stop), (start, _) in zip(pages, pages[1:]):
+        if stop >= start:
+            continue
+        mapping.seek(stop)
+        try:
+            mapping.consume(1)
+        except ptypes.error.ProviderError:
+            continue
+        raise AssertionError("{:s}: the gap at {:#x}..{:#x} was mapped".format(name, stop, start))
+
+    # An executable that isn't position-independent uses absolute addresses
+    # which the memory-backed File doesn't relocate, so we can only decode
+    # the ones that are relative to their base.
+    if data['e_type']['EXEC']:
+        print("{:s}: {:d} segments".format(name, len(segments)))
+        return
+
+    res = elf.File(source=mapping, offset=base).l
+    entries = [entry.li for entry in res['e_entries']]
+    assert len(res['e_data']['e_phoff'].d.li) == len(data['e_phoff'].d.li), "{:s}: the program headers were decoded incorrectly".format(name)
+    print("{:s}: {:d} segments, {:d} entries".format(name, len(segments), len(entries)))
+
+if __name__ == '__main__':
+    for filename in sys.argv[1:] or [sys.executable]:
+        check(filename, ptypes.provider.file(filename, 'rb'))
@@ -0,0 +1,86 @@
+# python test.py
+# Builds a compound file whose streams are fragmented in both the fat and the
+# minifat, and checks that the extents and the providers returned by Source()
+# read the same contents as the sector-based Data().
+import sys, struct
+import ptypes, office.storage as storage
+
+SECTOR, MINISECTOR = 0x200, 0x40
+FREESECT, ENDOFCHAIN, FATSECT = 0xffffffff, 0xfffffffe, 0xfffffffd
+NOSTREAM = 0xffffffff
+
+# sector 0 is the fat, 1 is the directory, 2 is the minifat, the regular
+# stream is fragmented across 9 sectors, and the ministream across 2.
+BIG, MINISTREAM = [3, 4, 7, 8, 9, 5, 6, 11, 12], [10, 13]
+SMALL = [4, 5, 1, 7, 8]
+
+def chain(table, sectors):
+    for sector, next in zip(sectors, sectors[1:] + [ENDOFCHAIN]):
+        table[sector] = next
+    return table
+
+def entry(name, type, child, location, size):
+    encoded = name.encode('utf-16-le')
+    res = encoded + b'\0' * (64 - len(encoded))
+    res += struct.pack('<HBB', len(encoded) + 2, type, 1)
+    res += struct.pack('<III', NOSTREAM, NOSTREAM, child)
+    res += b'\0' * 16 + struct.pack('<I', 0) + b'\0' * 16
+    return res + struct.pack('<IQ', location, size)
+
+def compound(big, small):
+    header = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'\0' * 16
+    header += struct.pack('<HHHHH', 0x3e, 3, 0xfffe, 9, 6) + b'\0' * 6
+    header += struct.pack('<IIII', 0, 1, 1, 0)
+    header += struct.pack('<III', 0x1000, 2, 1)
+    header += struct.pack('<II', ENDOFCHAIN, 0)
+    header += struct.pack('<109I', *([0] + [FREESECT] * 108))
+
+    fat = chain(chain([FATSECT, ENDOFCHAIN, ENDOFCHAIN] + [FREESECT] * 125, BIG), MINISTREAM)
+    minifat = chain([FREESECT] * 128, SMALL)
+
+    # the small stream is stored in the ministream, and the big one in the file.
+    ministream = bytearray(SECTOR * len(MINISTREAM))
+    for index, sector in enumerate(SMALL):
+        ministream[sector * MINISECTOR : (sector + 1) * MINISECTOR] = small[index * MINISECTOR : (index + 1) * MINISECTOR].ljust(MINISECTOR, b'\0')
+
+    directory = entry('Root Entry', 5, 1, MINISTREAM[0], len(ministream))
+    directory += entry('Big', 2, 2, BIG[0], len(big))
+    directory += entry('Small', 2, NOSTREAM, SMALL[0], len(small))
+    directory += entry('', 0, NOSTREAM, 0, 0)
+
+    sectors = [b''] * 14
+    sectors[0], sectors[1], sectors[2] = struct.pack('<128I', *fat), directory, struct.pack('<128I', *minifat)
+    for index, sector in enumerate(BIG):
+        sectors[sector] = big[index * SECTOR : (index + 1) * SECTOR]
+    for index, sector in enumerate(MINISTREAM):
+        sectors[sector] = bytes(ministream[index * SECTOR : (index + 1) * SECTOR])
+    return header + b''.join(sector.ljust(SECTOR, b'\0') for sector in sectors)
+
+if __name__ == '__main__':
+    big = bytes(bytearray(index * 7 & 0xff for index in range(0x1100)))
+    small = bytes(bytearray(0xff - index & 0xff for index in range(300)))
+    data = compound(big, small)
+
+    store = storage.File(source=ptypes.prov.bytes(data)).l
+    offset = lambda sector: SECTOR + SECTOR * sector
+    assert store.extents(BIG[0]) == [(offset(3), 2 * SECTOR), (offset(7), 3 * SECTOR), (offset(5), 2 * SECTOR), (offset(11), 2 * SECTOR)], store.extents(BIG[0])
+
+    # minisectors 4 and 5 are adjacent, 1 stands alone, and 7 and 8 straddle
+    # the two sectors of the ministream which aren't adjacent in the file.
+    miniextents = [(offset(10) + 4 * MINISECTOR, 2 * MINISECTOR), (offset(10) + MINISECTOR, MINISECTOR), (offset(10) + 7 * MINISECTOR, MINISECTOR), (offset(13), MINISECTOR)]
+    assert store.miniextents(SMALL[0]) == miniextents, store.miniextents(SMALL[0])
+
+    for extents in [False, True]:
+        directory = store.Directory(extents=extents)
+        for name, expected in [('Big', big), ('Small', small)]:
+            item = directory.byname(name)
+            source = item.Source()
+            source.seek(0)
+            assert source.size() == len(expected) and source.consume(len(expected)) == expected, "{:s}: Source() returned the wrong contents".format(name)
+            assert item.Data().serialize()[:len(expected)] == expected, "{:s}: Data() returned the wrong contents".format(name)
+
+            unclamped = item.Source(clamp=False)
+            unclamped.seek(0)
+            assert unclamped.size() % (MINISECTOR if item.ministreamQ() else SECTOR) == 0 and unclamped.consume(len(expected)) == expected
+        continue
+    print('ok')
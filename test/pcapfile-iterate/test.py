@@ -0,0 +1,58 @@
+# python test.py [count]
+# Writes a small capture and checks that File.iterate and File.within yield
+# every packet with the right timestamp when reading it from a file and from
+# a sequential stream.
+import sys, os, io, struct, tempfile, datetime
+import ptypes, pcapfile
+
+LINKTYPE_USER0 = 147
+
+def capture(count):
+    header = struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 0xffff, LINKTYPE_USER0)
+    packets = []
+    for index in range(count):
+        data = struct.pack('<I', index) * (1 + index % 4)
+        packets.append(struct.pack('<IIII', 1000 * index, 0, len(data), len(data)) + data)
+    return header + b''.join(packets)
+
+def timestamps(packets):
+    return [(packet['header']['ts'].datetime() - datetime.datetime(1970, 1, 1)).total_seconds() for packet in packets]
+
+def check(name, source, count):
+    expected = [1000. * index for index in range(count)]
+    packets = list(pcapfile.File(source=source()).iterate())
+    assert len(packets) == count, "{:s}: iterate yielded {:d} of {:d} packets".format(name, len(packets), count)
+    assert timestamps(packets) == expected, "{:s}: iterate yielded the wrong timestamps".format(name)
+
+    recycled = [dt for dt in (packet['header']['ts'].datetime() for packet in pcapfile.File(source=source()).iterate(recycle=True))]
+    assert len(recycled) == count, "{:s}: recycling iterate yielded {:d} of {:d} packets".format(name, len(recycled), count)
+
+    epoch = datetime.datetime(1970, 1, 1)
+    start, end = epoch + datetime.timedelta(seconds=1000 * (count // 4)), epoch + datetime.timedelta(seconds=1000 * (count // 2))
+    within = list(pcapfile.File(source=source()).within(start, end))
+    assert timestamps(within) == expected[count // 4 : count // 2], "{:s}: within yielded the wrong packets".format(name)
+
+    index = pcapfile.File(source=source()).index(step=16)
+    assert sum(entry[-1] for entry in index) == count, "{:s}: the index is missing packets".format(name)
+    within = list(pcapfile.File(source=source()).within(start, end, index=index))
+    assert timestamps(within) == expected[count // 4 : count // 2], "{:s}: within yielded the wrong packets when using an index".format(name)
+
+    # a stream should only be caching the packet that was last yielded.
+    res = source()
+    if isinstance(res, ptypes.provider.stream):
+        cached = max(len(res.data) for packet in pcapfile.File(source=res).iterate())
+        assert cached <= 16 + 4 * 4, "{:s}: the stream cached {:d} bytes".format(name, cached)
+    print("{:s}: {:d} packets".format(name, count))
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    data = capture(count)
+
+    fd, filename = tempfile.mkstemp(suffix='.pcap')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        check('file', lambda: ptypes.provider.file(filename, 'rb'), count)
+        check('stream', lambda: ptypes.provider.stream(io.BytesIO(data)), count)
+    finally:
+        os.unlink(filename)
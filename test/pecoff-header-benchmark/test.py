@@ -0,0 +1,83 @@
+# python test.py executable [count]
+# Times parsing the headers of a portable executable and then decoding and
+# encoding every integer within them, with and without caching the decoded
+# integers when the configuration has that option. The integers are also
+# decoded and encoded with the codec that pint used before it used struct
+# (folding the bytes and consuming a bitmap) so that both can be compared.
+import sys, time, functools
+import ptypes, pecoff
+from ptypes import pint, bitmap
+
+def integers(object):
+    if isinstance(object, pint.type):
+        yield object
+    elif isinstance(object, ptypes.pstruct.type) and object.initializedQ():
+        for item in object.values():
+            for integer in integers(item):
+                yield integer
+    elif isinstance(object, ptypes.parray.type) and object.initializedQ():
+        for item in object:
+            for integer in integers(item):
+                yield integer
+    return
+
+def headers(source):
+    mz = pecoff.Executable.File(source=source).l
+    header = mz['Next']['Header']
+    return [mz['Header'], header['FileHeader'], header['OptionalHeader'], header['DataDirectory'], header['Sections']]
+
+def littleendian(integer):
+    order = integer.byteorder
+    return order is ptypes.config.byteorder.littleendian or "{!s}".format(order).startswith('little')
+
+def decode(integer):
+    '''Decode the integer by folding its bytes together one at a time.'''
+    data = bytearray(integer.serialize())
+    ordered = data[::-1] if littleendian(integer) else data
+    return functools.reduce(lambda agg, item: agg << 8 | item, ordered, 0)
+
+def encode(integer, value):
+    '''Encode the value into the integer by consuming a bitmap 8 bits at a time.'''
+    size = integer.blocksize()
+    bc, res = bitmap.new(value & (pow(2, 8 * size) - 1), 8 * size), []
+    while bc[1] > 0:
+        bc, x = bitmap.consume(bc, 8)
+        res.append(x)
+    res = res + [0] * (size - len(res))
+    ordered = res if littleendian(integer) else res[::-1]
+    return super(pint.type, integer).__setvalue__(bytes(bytearray(ordered)))
+
+def measure(callable, count):
+    start = time.time()
+    for _ in range(count):
+        callable()
+    return time.time() - start
+
+def benchmark(filename, count):
+    source = ptypes.prov.file(filename, 'rb')
+    parsed = measure(lambda: headers(source), count)
+
+    fields = [integer for item in headers(source) for integer in integers(item)]
+    values = [integer.int() for integer in fields]
+    assert values == [decode(integer) for integer in fields]
+
+    decoded = measure(lambda: [integer.int() for integer in fields], count)
+    legacy_decoded = measure(lambda: [decode(integer) for integer in fields], count)
+    encoded = measure(lambda: [integer.set(value) for integer, value in zip(fields, values)], count)
+    legacy_encoded = measure(lambda: [encode(integer, value) for integer, value in zip(fields, values)], count)
+    assert values == [integer.int() for integer in fields]
+    return parsed, (decoded, encoded), (legacy_decoded, legacy_encoded), len(fields)
+
+if __name__ == '__main__':
+    filename, count = sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    # trees that don't have the option to cache an integer are only run once.
+    configurable = hasattr(ptypes.config.defaults.pint, 'cache')
+    for cache in [False, True] if configurable else [None]:
+        if configurable:
+            ptypes.config.defaults.pint.cache = cache
+        parsed, (decoded, encoded), (legacy_decoded, legacy_encoded), fields = benchmark(filename, count)
+        print("cache={!s}: parsed headers {:d} times in {:.3f}s".format(cache, count, parsed))
+        print("cache={!s}: pint decoded {:d} integers {:d} times in {:.3f}s and encoded them in {:.3f}s".format(cache, fields, count, decoded, encoded))
+        print("cache={!s}: reduce/bitmap decoded {:d} integers {:d} times in {:.3f}s and encoded them in {:.3f}s".format(cache, fields, count, legacy_decoded, legacy_encoded))
+    pass
@@ -0,0 +1,59 @@
+# python test.py [filename...]
+# Checks that the provider returned by IMAGE_NT_HEADERS.mapping presents the
+# image the same way that IMAGE_NT_HEADERS.map lays it out, and that the
+# mapped image can be decoded again. When no filenames are given, a small
+# image with a SectionAlignment of 0x200 and a gap between its sections is
+# used.
+import sys, os, struct, tempfile
+import ptypes, pecoff
+
+def image():
+    sections = [
+        (b'.text', 0x180, 0x200, 0x200, 0x200),
+        (b'.data', 0x300, 0x1000, 0x200, 0x400),    # gap from 0x400 to 0x1000, and 0x100 of bss
+        (b'.rsrc', 0x10, 0x1400, 0x200, 0x600),
+    ]
+    size, headers = 0x1600, 0x200
+
+    dos = struct.pack('<2sHHHHHHHHHHHHH', b'MZ', 0x90, 3, 0, 4, 0, 0xffff, 0, 0xb8, 0, 0, 0, 0x40, 0)
+    dos += b'\0' * (0x3c - len(dos)) + struct.pack('<I', 0x80)
+    dos += b'\0' * (0x80 - len(dos))
+    fileheader = struct.pack('<HHIIIHH', 0x14c, len(sections), 0, 0, 0, 0xe0, 0x0102)
+    optional = struct.pack('<HBBIIIIIIIIIHHHHHHIIIIHHIIIIII', 0x10b, 0, 0, 0x200, 0x400, 0, 0x200, 0x200, 0x1000, 0x400000, 0x200, 0x200, 4, 0, 0, 0, 4, 0, 0, size, headers, 0, 3, 0, 0x100000, 0x1000, 0x100000, 0x1000, 0, 16)
+    optional += b'\0' * 8 * 16
+    table = b''.join(struct.pack('<8sIIIIIIHHI', name, vsize, address, rawsize, offset, 0, 0, 0, 0, 0x40000040) for name, vsize, address, rawsize, offset in sections)
+
+    data = bytearray(dos + b'PE\0\0' + fileheader + optional + table)
+    data += b'\0' * (headers - len(data))
+    for index, (name, vsize, address, rawsize, offset) in enumerate(sections):
+        data[offset : offset + rawsize] = bytes(bytearray((index + 1) * 0x10 + item % 0x10 for item in range(rawsize)))
+    return bytes(data)
+
+def check(name, source):
+    res = pecoff.Executable.File(source=source).l
+    nt = res['Next']['Header']
+    base = nt['OptionalHeader']['ImageBase'].int()
+    image, mapping = nt.map(), nt.mapping()
+
+    mapping.seek(base)
+    assert mapping.consume(len(image)) == bytes(image), "{:s}: the mapping is different from the image".format(name)
+
+    res = pecoff.Executable.File(source=mapping, offset=base).l
+    nt = res['Next']['Header']
+    for section, segment in zip(nt['Sections'], res['Next']['Data']['Segments']):
+        address, size = section['VirtualAddress'].int(), section['VirtualSize'].int()
+        assert segment['Data'].getoffset() == base + address, "{:s}: section {:s} was decoded at {:#x}".format(name, section['Name'].str(), segment['Data'].getoffset())
+        assert segment['Data'].serialize()[:size] == bytes(image[address : address + size]), "{:s}: section {:s} was decoded incorrectly".format(name, section['Name'].str())
+    print("{:s}: {:d} sections".format(name, len(nt['Sections'])))
+
+if __name__ == '__main__':
+    fd, filename = tempfile.mkstemp(suffix='.exe')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(image())
+        check('image', ptypes.provider.file(filename, 'rb'))
+    finally:
+        os.unlink(filename)
+
+    for filename in sys.argv[1:]:
+        check(filename, ptypes.provider.file(filename, 'rb'))
@@ -0,0 +1,124 @@
+# python test.py
+# Builds a small image with a base relocation of each type that can be applied
+# (HIGH, LOW, HIGHLOW, ARM_MOV32, THUMB_MOV32 and DIR64) and checks the values
+# that IMAGE_NT_HEADERS.map patches when the image is mapped at another base.
+# It also checks that an image which is already mapped into memory can be
+# presented at another base by IMAGE_NT_HEADERS.mapping.
+import os, struct, tempfile
+import ptypes, pecoff
+
+IMAGEBASE, TARGET = 0x400000, 0x401234
+
+def arm(imm16, movt):
+    '''Return a MOVW (or MOVT) r0, #imm16 instruction in ARM mode.'''
+    return (0xe3400000 if movt else 0xe3000000) | (imm16 & 0xf000) * 0x10 | imm16 & 0x0fff
+
+def thumb(imm16, movt):
+    '''Return the halfwords for a MOVW (or MOVT) r0, #imm16 instruction in Thumb mode.'''
+    hw1 = (0xf2c0 if movt else 0xf240) | (imm16 & 0x0800) // 2 | (imm16 & 0xf000) // 0x1000
+    hw2 = (imm16 & 0x0700) * 0x10 | imm16 & 0x00ff
+    return hw1, hw2
+
+def contents(target):
+    '''Return the contents of the .data section with each relocated value referencing `target`.'''
+    low, high = target & 0xffff, target // 0x10000
+    data = struct.pack('<HH', high, 0) + struct.pack('<HH', low, 0) + struct.pack('<L', target) + b'\0' * 4
+    data += struct.pack('<LL', arm(low, False), arm(high, True))
+    data += struct.pack('<HHHH', *thumb(low, False) + thumb(high, True))
+    data += struct.pack('<Q', target)
+    return data
+
+RELOCATIONS = [(1, 0x00), (2, 0x04), (3, 0x08), (5, 0x10), (7, 0x18), (10, 0x20)]
+
+def image(relocations=True, stripped=False):
+    sections = [(b'.data', 0x100, 0x1000, 0x200, 0x200), (b'.reloc', 0x100, 0x2000, 0x200, 0x400)]
+    size, headers = 0x3000, 0x200
+
+    entries = [type * 0x1000 | offset for type, offset in RELOCATIONS]
+    entries += [0] * (len(entries) % 2)
+    block = struct.pack('<LL', 0x1000, 8 + 2 * len(entries)) + struct.pack("<{:d}H".format(len(entries)), *entries)
+
+    dos = struct.pack('<2sHHHHHHHHHHHHH', b'MZ', 0x90, 3, 0, 4, 0, 0xffff, 0, 0xb8, 0, 0, 0, 0x40, 0)
+    dos += b'\0' * (0x3c - len(dos)) + struct.pack('<I', 0x80)
+    dos += b'\0' * (0x80 - len(dos))
+    fileheader = struct.pack('<HHIIIHH', 0x14c, len(sections), 0, 0, 0, 0xe0, 0x0102 | (0x0001 if stripped else 0))
+    optional = struct.pack('<HBBIIIIIIIIIHHHHHHIIIIHHIIIIII', 0x10b, 0, 0, 0, 0x400, 0, 0, 0x1000, 0x1000, IMAGEBASE, 0x1000, 0x200, 4, 0, 0, 0, 4, 0, 0, size, headers, 0, 3, 0x40, 0x100000, 0x1000, 0x100000, 0x1000, 0, 16)
+    directory = [(0, 0)] * 16
+    if relocations:
+        directory[5] = (0x2000, len(block))
+    optional += b''.join(struct.pack('<LL', address, length) for address, length in directory)
+    table = b''.join(struct.pack('<8sIIIIIIHHI', name, vsize, address, rawsize, offset, 0, 0, 0, 0, 0x40000040) for name, vsize, address, rawsize, offset in sections)
+
+    data = bytearray(dos + b'PE\0\0' + fileheader + optional + table)
+    data += b'\0' * (0x600 - len(data))
+    items = contents(TARGET)
+    data[0x200 : 0x200 + len(items)] = items
+    data[0x400 : 0x400 + len(block)] = block
+    return bytes(data)
+
+def load(filename):
+    res = pecoff.Executable.File(source=ptypes.provider.file(filename, 'rb')).l
+    return res['Next']['Header']
+
+def check(filename, base):
+    nt = load(filename)
+    data = nt.map(base)
+
+    expected = bytearray(contents(TARGET + base - IMAGEBASE))
+    delta, low = base - IMAGEBASE, TARGET & 0xffff
+
+    # HIGH only adds the high half of the delta, and LOW only adds the low half.
+    expected[0x00 : 0x02] = struct.pack('<H', (TARGET // 0x10000 + delta // 0x10000) & 0xffff)
+    expected[0x04 : 0x06] = struct.pack('<H', (low + delta) & 0xffff)
+    for type, offset in RELOCATIONS:
+        size = {1: 2, 2: 2, 3: 4, 5: 8, 7: 8, 10: 8}[type]
+        assert data[0x1000 + offset : 0x1000 + offset + size] == expected[offset : offset + size], "relocation {:d} at {:#x} was not applied".format(type, offset)
+
+    res = nt['OptionalHeader']['ImageBase']
+    offset = res.getoffset()
+    assert struct.unpack_from('<L', data, offset) == (base,), "the ImageBase was not updated"
+    print("{:#x}: {:d} relocations".format(base, len(RELOCATIONS)))
+
+def remap(filename, base):
+    nt = load(filename)
+    size, mapping = nt['OptionalHeader']['SizeOfImage'].int(), nt.mapping()
+    mapping.seek(IMAGEBASE)
+    expected = mapping.consume(size)
+
+    res = pecoff.Executable.File(source=mapping, offset=IMAGEBASE).l
+    nt = res['Next']['Header']
+    assert nt.mapping() is mapping, "the mapping of an image at its own base was not the same provider"
+
+    source = nt.mapping(base)
+    source.seek(base)
+    assert source.consume(size) == expected, "the image was not mapped at {:#x}".format(base)
+    print("{:#x}: remapped {:+#x} bytes".format(base, size))
+
+def failure(filename, base):
+    nt = load(filename)
+    try:
+        nt.map(base)
+    except ptypes.error.InputError:
+        return True
+    return False
+
+if __name__ == '__main__':
+    filenames = {}
+    try:
+        for name, data in [('relocations', image()), ('missing', image(relocations=False)), ('stripped', image(stripped=True))]:
+            fd, filenames[name] = tempfile.mkstemp(suffix='.exe')
+            with os.fdopen(fd, 'wb') as out:
+                out.write(data)
+            continue
+
+        for base in [0x10000000, 0x00401000, 0x7ffe0000]:
+            check(filenames['relocations'], base)
+        remap(filenames['relocations'], 0x10000000)
+
+        assert failure(filenames['missing'], 0x10000000), "mapping an image without relocations at another base did not fail"
+        assert failure(filenames['stripped'], 0x10000000), "mapping an image with its relocations stripped at another base did not fail"
+        assert not failure(filenames['missing'], IMAGEBASE), "mapping an image without relocations at its own base failed"
+        print("ok")
+
+    finally:
+        [os.unlink(filename) for filename in filenames.values()]